@@ -6,7 +6,7 @@ from codegen.cli.api.client import RestAPI
 from codegen.cli.mcp.agent.docs_expert import create_sdk_expert_agent
 from codegen.cli.mcp.resources.system_prompt import SYSTEM_PROMPT
 from codegen.cli.mcp.resources.system_setup_instructions import SETUP_INSTRUCTIONS
-from codegen.sdk.core.codebase import Codebase
+from codegen.extensions.mcp.codebase_pool import get_codebase
 from codegen.shared.enums.programming_language import ProgrammingLanguage
 
 # Initialize FastMCP server
@@ -43,7 +43,7 @@ def get_service_config() -> dict[str, Any]:
 
 @mcp.tool()
 def ask_codegen_sdk(query: Annotated[str, "Ask a question to an exper agent for details about any aspect of the codegen sdk core set of classes and utilities"]):
-    codebase = Codebase("../../sdk/core")
+    codebase = get_codebase("../../sdk/core")
     agent = create_sdk_expert_agent(codebase=codebase)
 
     result = agent.invoke(
@@ -20,6 +20,7 @@ class CodebaseConfig(BaseConfig):
 
     debug: bool = False
     verify_graph: bool = False
+    verify_cache_invalidation: bool = False
     track_graph: bool = False
     method_usages: bool = True
     sync_enabled: bool = False
@@ -27,7 +28,11 @@ class CodebaseConfig(BaseConfig):
     ignore_process_errors: bool = True
     disable_graph: bool = False
     disable_file_parse: bool = False
+    parse_workers: int = 1
+    graph_snapshot_dir: str | None = None
+    metrics_path: str | None = None
     exp_lazy_graph: bool = False
+    max_resident_files: int | None = None
     generics: bool = True
     import_resolution_paths: list[str] = Field(default_factory=lambda: [])
     import_resolution_overrides: dict[str, str] = Field(default_factory=lambda: {})
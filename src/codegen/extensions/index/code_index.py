@@ -6,7 +6,11 @@ from typing import Optional, TypeVar
 
 import numpy as np
 
+from codegen.extensions.index.embedding_store import EmbeddingStore, load_embeddings, normalize_embeddings
 from codegen.sdk.core.codebase import Codebase
+from codegen.shared.logging.get_logger import get_logger
+
+logger = get_logger(__name__)
 
 T = TypeVar("T")  # Type of the items being indexed (e.g., File, Symbol)
 
@@ -20,7 +24,8 @@ class CodeIndex(ABC):
 
     Attributes:
         codebase (Codebase): The codebase being indexed
-        E (Optional[np.ndarray]): The embeddings matrix
+        store (Optional[EmbeddingStore]): The embeddings and item identifiers, stored in segments that absorb updates
+        E (Optional[np.ndarray]): The float32 embeddings matrix, with every row normalized to unit length
         items (Optional[np.ndarray]): Array of items corresponding to embeddings
         commit_hash (Optional[str]): Git commit hash when index was last updated
     """
@@ -34,10 +39,19 @@ class CodeIndex(ABC):
             codebase: The codebase to index
         """
         self.codebase = codebase
-        self.E: Optional[np.ndarray] = None
-        self.items: Optional[np.ndarray] = None
+        self.store: Optional[EmbeddingStore] = None
         self.commit_hash: Optional[str] = None
 
+    @property
+    def E(self) -> Optional[np.ndarray]:
+        """The embeddings matrix, compacting the store first if it has pending updates."""
+        return self.store.E if self.store is not None else None
+
+    @property
+    def items(self) -> Optional[np.ndarray]:
+        """The item identifiers, in the same order as `E`."""
+        return self.store.items if self.store is not None else None
+
     @property
     @abstractmethod
     def save_file_name(self) -> str:
@@ -74,6 +88,23 @@ class CodeIndex(ABC):
         """
         pass
 
+    @abstractmethod
+    def _get_item_filepath(self, item_id: str) -> str:
+        """Get the path of the file an indexed item identifier belongs to."""
+        pass
+
+    def _get_items_to_index_for_changed(self, changed_items: set[T]) -> list[tuple[str, str]]:
+        """Get the items to (re-)index, and their content, for the items returned by `_get_changed_items`."""
+        changed_ids = {str(item) for item in changed_items}
+        return [(item, content) for item, content in self._get_items_to_index() if str(item) in changed_ids]
+
+    def _get_changed_filepaths(self) -> set[str]:
+        """Get the paths of all files added, modified, renamed or deleted since the indexed commit."""
+        if not self.commit_hash:
+            return set()
+        diffs = self.codebase.get_diffs(self.commit_hash)
+        return {path for diff in diffs for path in (diff.a_path, diff.b_path) if path}
+
     def _get_current_commit(self) -> str:
         """Get the current git commit hash."""
         current = self.codebase.current_commit
@@ -100,8 +131,7 @@ class CodeIndex(ABC):
         # Get items and their content
         items_with_content = self._get_items_to_index()
         if not items_with_content:
-            self.E = np.array([])
-            self.items = np.array([])
+            self.store = EmbeddingStore(normalize_embeddings([]), [])
             return
 
         # Split into separate lists
@@ -111,49 +141,42 @@ class CodeIndex(ABC):
         embeddings = self._get_embeddings(contents)
 
         # Store embeddings and item identifiers
-        self.E = np.array(embeddings)
-        self.items = np.array([str(item) for item in items])  # Store string identifiers
+        self.store = EmbeddingStore(normalize_embeddings(embeddings), [str(item) for item in items])  # Store string identifiers
 
     def update(self) -> None:
-        """Update embeddings for changed items only."""
-        if self.E is None or self.items is None or self.commit_hash is None:
+        """Update embeddings for changed items only.
+
+        The items of every file that changed since the indexed commit are tombstoned, and the current items of those
+        files are embedded and appended to the store. The store is compacted once enough segments or tombstones pile up.
+        """
+        if self.store is None or self.commit_hash is None:
             msg = "No index to update. Call create() or load() first."
             raise ValueError(msg)
 
-        # Get changed items
-        changed_items = self._get_changed_items()
-        if not changed_items:
+        # Get changed files, including deleted ones
+        changed_filepaths = self._get_changed_filepaths()
+        if not changed_filepaths:
+            logger.info("No files have changed since last update")
             return
 
-        # Get content for changed items
-        items_with_content = [(item, content) for item, content in self._get_items_to_index() if item in changed_items]
+        stale_items = [item for item in self.store.item_ids if self._get_item_filepath(item) in changed_filepaths]
+        self.store.remove(stale_items)
 
-        if not items_with_content:
-            return
+        # Get content for changed items
+        items_with_content = self._get_items_to_index_for_changed(self._get_changed_items())
+        if items_with_content:
+            items, contents = zip(*items_with_content)
+            self.store.add([str(item) for item in items], normalize_embeddings(self._get_embeddings(contents)))
+        logger.info(f"Removed {len(stale_items)} stale embeddings and added {len(items_with_content)} new embeddings")
 
-        items, contents = zip(*items_with_content)
-        new_embeddings = self._get_embeddings(contents)
-
-        # Create mapping of items to their indices
-        item_to_idx = {str(item): idx for idx, item in enumerate(self.items)}
-
-        # Update embeddings
-        for item, embedding in zip(items, new_embeddings):
-            item_key = str(item)
-            if item_key in item_to_idx:
-                # Update existing embedding
-                self.E[item_to_idx[item_key]] = embedding
-            else:
-                # Add new embedding
-                self.E = np.vstack([self.E, embedding])
-                self.items = np.append(self.items, item)
+        self.store.maybe_compact()
 
         # Update commit hash
         self.commit_hash = self._get_current_commit()
 
     def save(self, save_path: Optional[str] = None) -> None:
         """Save the index to disk."""
-        if self.E is None or self.items is None:
+        if self.store is None:
             msg = "No embeddings to save. Call create() first."
             raise ValueError(msg)
 
@@ -172,6 +195,19 @@ class CodeIndex(ABC):
 
         self._load_index(load_path)
 
+    def _get_embeddings_path(self, path: Path) -> Path:
+        """Path of the binary embeddings matrix saved alongside the index file."""
+        return path.with_suffix(".npy")
+
+    def _read_embeddings(self, path: Path, data: dict) -> np.ndarray:
+        """Get the embeddings matrix for index data loaded from the given index file.
+
+        Indices saved before the binary format stored the raw matrix in the index file itself, so it is normalized here.
+        """
+        if data.get("E") is not None:
+            return normalize_embeddings(data["E"])
+        return load_embeddings(self._get_embeddings_path(path))
+
     @abstractmethod
     def _save_index(self, path: Path) -> None:
         """Save index data to disk."""
@@ -192,24 +228,28 @@ class CodeIndex(ABC):
         Returns:
             List of tuples (item_identifier, similarity_score) sorted by similarity
         """
-        if self.E is None or self.items is None:
-            msg = "No embeddings available. Call create() or load() first."
-            raise ValueError(msg)
+        return self._similarity_search_raw_batch([query], k)[0]
+
+    def _similarity_search_raw_batch(self, queries: list[str], k: int = 5) -> list[list[tuple[str, float]]]:
+        """Internal method to find the k most similar items to each of several queries.
 
-        # Get query embedding
-        query_embeddings = self._get_embeddings([query])
-        query_embedding = query_embeddings[0]
+        All queries are embedded in a single request and scored against the index with a single matrix product.
 
-        # Compute cosine similarity
-        query_norm = query_embedding / np.linalg.norm(query_embedding)
-        E_norm = self.E / np.linalg.norm(self.E, axis=1)[:, np.newaxis]
-        similarities = np.dot(E_norm, query_norm)
+        Args:
+            queries: The texts to search for
+            k: Number of results to return per query
 
-        # Get top k indices
-        top_indices = np.argsort(similarities)[-k:][::-1]
+        Returns:
+            For every query, a list of tuples (item_identifier, similarity_score) sorted by similarity
+        """
+        if self.store is None:
+            msg = "No embeddings available. Call create() or load() first."
+            raise ValueError(msg)
+        if not queries:
+            return []
 
-        # Return items and similarity scores
-        return [(str(self.items[idx]), float(similarities[idx])) for idx in top_indices]
+        query_embeddings = normalize_embeddings(self._get_embeddings(queries))
+        return self.store.search(query_embeddings, k)
 
     @abstractmethod
     def similarity_search(self, query: str, k: int = 5) -> list[tuple[T, float]]:
@@ -0,0 +1,196 @@
+"""Binary storage and top-k search for embedding matrices."""
+
+import os
+from pathlib import Path
+
+import numpy as np
+
+EMBEDDING_DTYPE = np.float32
+
+
+def normalize_embeddings(embeddings) -> np.ndarray:
+    """Convert embeddings to a 2D float32 matrix of unit-length rows.
+
+    Rows are normalized once when they enter the index, so a cosine similarity search is a single matrix product.
+    Zero vectors are left as zeros.
+    """
+    E = np.array(embeddings, dtype=EMBEDDING_DTYPE, ndmin=2)
+    if E.size == 0:
+        return E.reshape(0, E.shape[1] if E.ndim == 2 else 0)
+    norms = np.linalg.norm(E, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    E /= norms
+    return E
+
+
+def save_embeddings(path: Path, E: np.ndarray) -> None:
+    """Save an embedding matrix as a float32 .npy file, replacing any existing file atomically."""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        np.save(f, np.ascontiguousarray(E, dtype=EMBEDDING_DTYPE))
+    os.replace(tmp_path, path)
+
+
+def load_embeddings(path: Path) -> np.ndarray:
+    """Memory-map an embedding matrix saved with `save_embeddings`.
+
+    The mapping is copy-on-write: pages are only read from disk when searched, and in-place updates never touch the file.
+    """
+    return np.load(path, mmap_mode="c")
+
+
+def top_k(E: np.ndarray, queries: np.ndarray, k: int) -> list[list[tuple[int, float]]]:
+    """Find the k rows of E most similar to each query.
+
+    Args:
+        E: Normalized (n, d) embedding matrix
+        queries: Normalized (q, d) query matrix
+        k: Number of results per query
+
+    Returns:
+        For every query, a list of (row index, similarity score) sorted by descending similarity
+    """
+    if len(E) == 0:
+        return [[] for _ in range(len(queries))]
+    return _top_k_scores(queries @ E.T, k)
+
+
+def _top_k_scores(similarities: np.ndarray, k: int) -> list[list[tuple[int, float]]]:
+    """Top k columns of every row of a (q, n) similarity matrix, skipping columns scored -inf"""
+    k = min(k, similarities.shape[1])
+    if k <= 0:
+        return [[] for _ in range(len(similarities))]
+    # argpartition finds the top k of every row in linear time, and only those k get sorted
+    top = np.argpartition(similarities, -k, axis=1)[:, -k:]
+    top_scores = np.take_along_axis(similarities, top, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind="stable")
+    top = np.take_along_axis(top, order, axis=1)
+    top_scores = np.take_along_axis(top_scores, order, axis=1)
+    return [[(int(idx), float(score)) for idx, score in zip(row, scores) if score != -np.inf] for row, scores in zip(top, top_scores)]
+
+
+class EmbeddingStore:
+    """Embedding matrix and item identifiers of an index, built to absorb incremental updates.
+
+    Rows are stored in segments: a base matrix (possibly memory-mapped), followed by fixed-size chunks that new rows are
+    appended to, so adding an item never copies existing rows. Removing or replacing an item leaves a tombstone on its old
+    row, which searches skip. Once there are too many segments or tombstones, `compact` merges the live rows back into a
+    single base matrix.
+    """
+
+    # Rows per append chunk
+    CHUNK_SIZE = 4096
+    # Compact once there are more segments than this, or once tombstones make up more than this share of the rows
+    MAX_SEGMENTS = 16
+    MAX_DEAD_RATIO = 0.25
+
+    _segments: list[np.ndarray]
+    # Number of rows in use in each segment
+    _filled: list[int]
+    # Item identifier of every row, including dead ones
+    _item_ids: list[str]
+    # Row of every live item
+    _rows: dict[str, int]
+    _dead: set[int]
+    _items: np.ndarray | None
+
+    def __init__(self, E: np.ndarray, items) -> None:
+        self._segments = [E]
+        self._filled = [len(E)]
+        self._item_ids = [str(item) for item in items]
+        self._rows = {item: row for row, item in enumerate(self._item_ids)}
+        self._dead = {row for row, item in enumerate(self._item_ids) if self._rows[item] != row}
+        self._items = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, item: str) -> bool:
+        return item in self._rows
+
+    @property
+    def item_ids(self) -> list[str]:
+        """Identifiers of the live items"""
+        return list(self._rows)
+
+    @property
+    def num_segments(self) -> int:
+        return len(self._segments)
+
+    @property
+    def E(self) -> np.ndarray:
+        """The embedding matrix of the live items, compacting the store first if needed"""
+        self.compact()
+        return self._segments[0]
+
+    @property
+    def items(self) -> np.ndarray:
+        """The identifiers of the live items, in the same order as `E`"""
+        self.compact()
+        if self._items is None:
+            self._items = np.array(self._item_ids)
+        return self._items
+
+    def add(self, items: list[str], E: np.ndarray) -> None:
+        """Adds (or replaces) items with the given normalized embeddings, appending them to the chunk buffers"""
+        if len(items) == 0:
+            return
+        self.remove(items)
+        self._items = None
+        for item, embedding in zip(items, E):
+            if self._filled[-1] == len(self._segments[-1]):
+                if self._filled[-1] == 0:
+                    # Replace an empty segment (e.g. the base of an empty index, which has no dimension yet)
+                    self._segments.pop()
+                    self._filled.pop()
+                self._segments.append(np.empty((self.CHUNK_SIZE, len(embedding)), dtype=EMBEDDING_DTYPE))
+                self._filled.append(0)
+            self._segments[-1][self._filled[-1]] = embedding
+            self._filled[-1] += 1
+            self._rows[item] = len(self._item_ids)
+            self._item_ids.append(item)
+
+    def remove(self, items) -> None:
+        """Tombstones the rows of the given items, ignoring items that aren't in the store"""
+        for item in items:
+            if (row := self._rows.pop(item, None)) is not None:
+                self._dead.add(row)
+                self._items = None
+
+    def needs_compaction(self) -> bool:
+        return len(self._segments) > self.MAX_SEGMENTS or len(self._dead) > self.MAX_DEAD_RATIO * len(self._item_ids)
+
+    def maybe_compact(self) -> None:
+        if self.needs_compaction():
+            self.compact()
+
+    def compact(self) -> None:
+        """Merges the live rows of every segment into a single base matrix"""
+        if len(self._segments) == 1 and not self._dead and self._filled[0] == len(self._segments[0]):
+            return
+        live = sorted(self._rows.values())
+        filled = [segment[:n] for segment, n in zip(self._segments, self._filled) if n]
+        if filled:
+            E = np.concatenate(filled)[live] if live else np.empty((0, filled[0].shape[1]), dtype=EMBEDDING_DTYPE)
+        else:
+            E = self._segments[0][:0]
+        self._segments = [E]
+        self._filled = [len(E)]
+        self._item_ids = [self._item_ids[row] for row in live]
+        self._rows = {item: row for row, item in enumerate(self._item_ids)}
+        self._dead = set()
+        self._items = None
+
+    def search(self, queries: np.ndarray, k: int) -> list[list[tuple[str, float]]]:
+        """Find the k live items most similar to each of the normalized queries.
+
+        Returns:
+            For every query, a list of (item identifier, similarity score) sorted by descending similarity
+        """
+        filled = [segment[:n] for segment, n in zip(self._segments, self._filled) if n]
+        if not filled:
+            return [[] for _ in range(len(queries))]
+        similarities = np.concatenate([queries @ segment.T for segment in filled], axis=1)
+        if self._dead:
+            similarities[:, np.fromiter(self._dead, dtype=np.intp, count=len(self._dead))] = -np.inf
+        return [[(self._item_ids[row], score) for row, score in results] for results in _top_k_scores(similarities, k)]
@@ -11,6 +11,7 @@ from openai import OpenAI
 from tqdm import tqdm
 
 from codegen.extensions.index.code_index import CodeIndex
+from codegen.extensions.index.embedding_store import EmbeddingStore, normalize_embeddings, save_embeddings
 from codegen.sdk.core.codebase import Codebase
 from codegen.sdk.core.file import File
 from codegen.shared.logging.get_logger import get_logger
@@ -195,30 +196,31 @@ class FileIndex(CodeIndex):
 
     def _get_changed_items(self) -> set[File]:
         """Get set of files that have changed since last index."""
-        if not self.commit_hash:
-            return set()
-
-        # Get diffs between base commit and current state
-        diffs = self.codebase.get_diffs(self.commit_hash)
         changed_files = set()
-
-        for diff in diffs:
-            if diff.a_path:
-                file = self.codebase.get_file(diff.a_path)
-                if file:
-                    changed_files.add(file)
-            if diff.b_path:
-                file = self.codebase.get_file(diff.b_path)
-                if file:
-                    changed_files.add(file)
+        for filepath in self._get_changed_filepaths():
+            file = self.codebase.get_file(filepath)
+            if file:
+                changed_files.add(file)
 
         return changed_files
 
+    def _get_items_to_index_for_changed(self, changed_items: set[File]) -> list[tuple[str, str]]:
+        """Get the content chunks of the changed files."""
+        return self._get_items_to_index_for_files(list(changed_items))
+
+    def _get_item_filepath(self, item_id: str) -> str:
+        return item_id.split("#")[0]  # Remove chunk identifier if present
+
+    def _get_modal_data(self) -> dict:
+        """Index data to store in the Modal Dict, with the embeddings as a float32 array rather than lists of floats."""
+        return {"E": np.ascontiguousarray(self.E) if self.E is not None else None, "items": self.items.tolist() if self.items is not None else None, "commit_hash": self.commit_hash}
+
     def _save_index(self, path: Path) -> None:
         """Save index data to disk and optionally to Modal Dict."""
         # Save to local pickle file
         with open(path, "wb") as f:
-            pickle.dump({"E": self.E, "items": self.items, "commit_hash": self.commit_hash}, f)
+            pickle.dump({"items": self.items, "commit_hash": self.commit_hash}, f)
+        save_embeddings(self._get_embeddings_path(path), self.E)
 
         # Save to Modal Dict if enabled
         if self.USE_MODAL_DICT:
@@ -226,8 +228,7 @@ class FileIndex(CodeIndex):
                 dict_id = self.modal_dict_id
                 logger.info(f"Saving index to Modal Dict: {dict_id}")
 
-                # Convert numpy arrays to lists for JSON serialization
-                modal_data = {"E": self.E.tolist() if self.E is not None else None, "items": self.items.tolist() if self.items is not None else None, "commit_hash": self.commit_hash}
+                modal_data = self._get_modal_data()
 
                 # Create or update Modal Dict
                 # Note: from_name is lazy, so we need to explicitly set the data
@@ -253,9 +254,8 @@ class FileIndex(CodeIndex):
                     if "index_data" in modal_dict:
                         data = modal_dict["index_data"]
 
-                        # Convert lists back to numpy arrays
-                        self.E = np.array(data["E"]) if data["E"] is not None else None
-                        self.items = np.array(data["items"]) if data["items"] is not None else None
+                        # Older indices stored the raw embeddings as lists of floats, so normalize on the way in
+                        self.store = EmbeddingStore(normalize_embeddings(data["E"]), data["items"]) if data["E"] is not None else None
                         self.commit_hash = data["commit_hash"]
 
                         logger.info(f"Successfully loaded index from Modal Dict: {dict_id}")
@@ -271,8 +271,7 @@ class FileIndex(CodeIndex):
         try:
             with open(path, "rb") as f:
                 data = pickle.load(f)
-                self.E = data["E"]
-                self.items = data["items"]
+                self.store = EmbeddingStore(self._read_embeddings(path, data), data["items"])
                 self.commit_hash = data["commit_hash"]
                 logger.info(f"Loaded index from local file: {path}")
         except Exception as e:
@@ -289,8 +288,24 @@ class FileIndex(CodeIndex):
         Returns:
             List of tuples (File, similarity_score) sorted by similarity
         """
+        return self._get_files(self._similarity_search_raw(query, k))
+
+    def batch_similarity_search(self, queries: list[str], k: int = 5) -> list[list[tuple[File, float]]]:
+        """Find the k most similar files to each of several queries.
+
+        Args:
+            queries: The texts to search for
+            k: Number of results to return per query
+
+        Returns:
+            For every query, a list of tuples (File, similarity_score) sorted by similarity
+        """
+        return [self._get_files(results) for results in self._similarity_search_raw_batch(queries, k)]
+
+    def _get_files(self, raw_results: list[tuple[str, float]]) -> list[tuple[File, float]]:
+        """Map raw search results onto the files they came from."""
         results = []
-        for filepath, score in self._similarity_search_raw(query, k):
+        for filepath, score in raw_results:
             # Handle chunked files
             base_path = filepath.split("#")[0]  # Remove chunk identifier if present
             try:
@@ -303,60 +318,16 @@ class FileIndex(CodeIndex):
 
     def update(self) -> None:
         """Update embeddings for changed files only."""
-        if self.E is None or self.items is None or self.commit_hash is None:
-            msg = "No index to update. Call create() or load() first."
-            raise ValueError(msg)
-
-        # Get changed files
-        changed_files = self._get_changed_items()
-        if not changed_files:
-            logger.info("No files have changed since last update")
-            return
-
-        logger.info(f"Found {len(changed_files)} changed files to update")
-
-        # Get content for changed files only
-        items_with_content = self._get_items_to_index_for_files(list(changed_files))
-
-        if not items_with_content:
-            logger.info("No valid content found in changed files")
-            return
-
-        items, contents = zip(*items_with_content)
-        logger.info(f"Processing {len(contents)} chunks from changed files")
-        new_embeddings = self._get_embeddings(contents)
-
-        # Create mapping of items to their indices
-        item_to_idx = {str(item): idx for idx, item in enumerate(self.items)}
-
-        # Update embeddings
-        num_updated = 0
-        num_added = 0
-        for item, embedding in zip(items, new_embeddings):
-            item_key = str(item)
-            if item_key in item_to_idx:
-                # Update existing embedding
-                self.E[item_to_idx[item_key]] = embedding
-                num_updated += 1
-            else:
-                # Add new embedding
-                self.E = np.vstack([self.E, embedding])
-                self.items = np.append(self.items, item)
-                num_added += 1
-
-        logger.info(f"Updated {num_updated} existing embeddings and added {num_added} new embeddings")
-
-        # Update commit hash
-        self.commit_hash = self._get_current_commit()
+        old_commit_hash = self.commit_hash
+        super().update()
 
         # Save updated index to Modal Dict if enabled
-        if self.USE_MODAL_DICT and (num_updated > 0 or num_added > 0):
+        if self.USE_MODAL_DICT and self.commit_hash != old_commit_hash:
             try:
                 dict_id = self.modal_dict_id
                 logger.info(f"Updating index in Modal Dict: {dict_id}")
 
-                # Convert numpy arrays to lists for JSON serialization
-                modal_data = {"E": self.E.tolist() if self.E is not None else None, "items": self.items.tolist() if self.items is not None else None, "commit_hash": self.commit_hash}
+                modal_data = self._get_modal_data()
 
                 # Create or update Modal Dict
                 modal_dict = modal.Dict.from_name(dict_id, create_if_missing=True)
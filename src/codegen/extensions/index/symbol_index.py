@@ -8,6 +8,7 @@ from openai import OpenAI
 from tqdm import tqdm
 
 from codegen.extensions.index.code_index import CodeIndex
+from codegen.extensions.index.embedding_store import EmbeddingStore, save_embeddings
 from codegen.sdk.core.codebase import Codebase
 from codegen.sdk.core.symbol import Symbol
 from codegen.shared.logging.get_logger import get_logger
@@ -98,35 +99,38 @@ class SymbolIndex(CodeIndex):
 
     def _get_items_to_index(self) -> list[tuple[str, str]]:
         """Get all symbols and their content to index."""
-        items_to_index = []
         symbols_to_process = [s for s in self.codebase.symbols if s.source]
         logger.info(f"Found {len(symbols_to_process)} symbols to index")
+        return self._get_items_to_index_for_symbols(symbols_to_process)
+
+    def _get_items_to_index_for_symbols(self, symbols: list[Symbol]) -> list[tuple[str, str]]:
+        """Get items to index for specific symbols."""
+        items_to_index = []
 
         # Process each symbol - no need to pre-truncate since _batch_texts_by_tokens handles it
-        for symbol in symbols_to_process:
+        for symbol in symbols:
             symbol_id = f"{symbol.file.filepath}::{symbol.name}"
             items_to_index.append((symbol_id, symbol.source))
 
         logger.info(f"Total symbols to process: {len(items_to_index)}")
         return items_to_index
 
+    def _get_items_to_index_for_changed(self, changed_items: set[Symbol]) -> list[tuple[str, str]]:
+        """Get the changed symbols and their content."""
+        return self._get_items_to_index_for_symbols(list(changed_items))
+
+    def _get_item_filepath(self, item_id: str) -> str:
+        return item_id.split("::")[0]
+
     def _get_changed_items(self) -> set[Symbol]:
         """Get set of symbols that have changed since last index."""
-        if not self.commit_hash:
-            return set()
-
-        # Get diffs between base commit and current state
-        diffs = self.codebase.get_diffs(self.commit_hash)
         changed_symbols = set()
 
         # Get all symbols from changed files
-        for diff in diffs:
-            for path in [diff.a_path, diff.b_path]:
-                if not path:
-                    continue
-                file = self.codebase.get_file(path)
-                if file:
-                    changed_symbols.update(s for s in file.symbols if s.source)
+        for filepath in self._get_changed_filepaths():
+            file = self.codebase.get_file(filepath)
+            if file:
+                changed_symbols.update(s for s in file.symbols if s.source)
 
         logger.info(f"Found {len(changed_symbols)} changed symbols")
         return changed_symbols
@@ -134,20 +138,28 @@ class SymbolIndex(CodeIndex):
     def _save_index(self, path: Path) -> None:
         """Save index data to disk."""
         with open(path, "wb") as f:
-            pickle.dump({"E": self.E, "items": self.items, "commit_hash": self.commit_hash}, f)
+            pickle.dump({"items": self.items, "commit_hash": self.commit_hash}, f)
+        save_embeddings(self._get_embeddings_path(path), self.E)
 
     def _load_index(self, path: Path) -> None:
         """Load index data from disk."""
         with open(path, "rb") as f:
             data = pickle.load(f)
-            self.E = data["E"]
-            self.items = data["items"]
+            self.store = EmbeddingStore(self._read_embeddings(path, data), data["items"])
             self.commit_hash = data["commit_hash"]
 
     def similarity_search(self, query: str, k: int = 5) -> list[tuple[Symbol, float]]:
         """Find the k most similar symbols to a query."""
+        return self._get_symbols(self._similarity_search_raw(query, k))
+
+    def batch_similarity_search(self, queries: list[str], k: int = 5) -> list[list[tuple[Symbol, float]]]:
+        """Find the k most similar symbols to each of several queries."""
+        return [self._get_symbols(results) for results in self._similarity_search_raw_batch(queries, k)]
+
+    def _get_symbols(self, raw_results: list[tuple[str, float]]) -> list[tuple[Symbol, float]]:
+        """Map raw search results onto the symbols they came from."""
         results = []
-        for symbol_id, score in self._similarity_search_raw(query, k):
+        for symbol_id, score in raw_results:
             # Parse the symbol identifier
             filepath, symbol_name = symbol_id.split("::")
             # Get the file and find the symbol
@@ -0,0 +1,160 @@
+"""Process-wide pool of warm Codebase instances for the MCP servers."""
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from codegen.configs.models.codebase import CodebaseConfig
+from codegen.sdk.codebase.diff_lite import ChangeType, DiffLite
+from codegen.sdk.core.codebase import Codebase
+from codegen.sdk.enums import NodeType
+from codegen.shared.enums.programming_language import ProgrammingLanguage
+from codegen.shared.logging.get_logger import get_logger
+from codegen.shared.performance.memory_utils import get_memory_stats
+
+logger = get_logger(__name__)
+
+# (resolved repo path, language, serialized config)
+PoolKey = tuple[str, str | None, str | None]
+
+
+def _get_rss_bytes() -> int:
+    return int(get_memory_stats().memory_rss_gb * 1024 * 1024 * 1024)
+
+
+def _get_mtime(path: str) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+@dataclass
+class _PoolEntry:
+    codebase: Codebase
+    # Estimated memory held by the codebase, measured as the growth in RSS while it was built
+    size_bytes: int
+    # Head commit the graph was last refreshed against
+    head: str | None
+    # mtime of every source file in the graph, by absolute path
+    mtimes: dict[str, int] = field(default_factory=dict)
+
+
+class CodebasePool:
+    """LRU pool of parsed codebases, keyed by (repo path, language, config).
+
+    Building a Codebase parses every file and computes the whole graph, so tools that run many times per session reuse the
+    same instance. Before an entry is served it is brought up to date: files whose mtime changed, files reported by
+    `git status` and files changed by a move of HEAD are applied to the graph with `apply_diffs`. Entries are evicted in
+    least recently used order once their estimated memory exceeds the budget.
+    """
+
+    DEFAULT_MAX_MEMORY_BYTES = 4 * 1024 * 1024 * 1024
+
+    def __init__(self, max_memory_bytes: int = DEFAULT_MAX_MEMORY_BYTES) -> None:
+        self.max_memory_bytes = max_memory_bytes
+        self._entries: OrderedDict[PoolKey, _PoolEntry] = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def memory_bytes(self) -> int:
+        """Estimated memory held by all pooled codebases"""
+        return sum(entry.size_bytes for entry in self._entries.values())
+
+    @staticmethod
+    def get_key(repo_path: str, language: ProgrammingLanguage | str | None = None, config: CodebaseConfig | None = None) -> PoolKey:
+        language = ProgrammingLanguage(language.upper()).value if language else None
+        return str(Path(repo_path).resolve()), language, config.model_dump_json() if config is not None else None
+
+    def get(self, repo_path: str, language: ProgrammingLanguage | str | None = None, config: CodebaseConfig | None = None) -> Codebase:
+        """Returns an up to date codebase for the given repo, building it if it isn't in the pool"""
+        key = self.get_key(repo_path, language, config)
+        with self._lock:
+            if (entry := self._entries.get(key)) is not None:
+                self._entries.move_to_end(key)
+                self._refresh(entry)
+                return entry.codebase
+
+            rss_before = _get_rss_bytes()
+            codebase = Codebase(repo_path=key[0], language=language, config=config)
+            entry = _PoolEntry(codebase=codebase, size_bytes=max(_get_rss_bytes() - rss_before, 0), head=self._get_head(codebase))
+            entry.mtimes = {str(file.path): mtime for file in codebase.ctx.get_nodes(NodeType.FILE) if (mtime := _get_mtime(str(file.path))) is not None}
+            self._entries[key] = entry
+            self._evict(keep=key)
+            return codebase
+
+    def evict(self, repo_path: str, language: ProgrammingLanguage | str | None = None, config: CodebaseConfig | None = None) -> bool:
+        """Drops a codebase from the pool. Returns whether it was pooled"""
+        with self._lock:
+            return self._entries.pop(self.get_key(repo_path, language, config), None) is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _evict(self, keep: PoolKey) -> None:
+        """Evicts least recently used entries (other than `keep`) until the pool fits in the memory budget"""
+        while self.memory_bytes > self.max_memory_bytes and len(self._entries) > 1:
+            key = next(key for key in self._entries if key != keep)
+            logger.info(f"Evicting codebase {key[0]} from the pool")
+            del self._entries[key]
+
+    @staticmethod
+    def _get_head(codebase: Codebase) -> str | None:
+        try:
+            head = codebase.ctx.projects[0].repo_operator.head_commit
+        except ValueError:
+            return None
+        return head.hexsha if head is not None else None
+
+    def _get_candidates(self, entry: _PoolEntry, head: str | None) -> set[str]:
+        """Absolute paths of every source file that may have changed since the entry was last refreshed"""
+        ctx = entry.codebase.ctx
+        git = ctx.projects[0].repo_operator.git_cli.git
+        relative_paths = []
+        # Modified, added, deleted and untracked files relative to HEAD. Renames and copies are followed by the old path
+        records = iter(git.status("--porcelain", "-z", "--untracked-files=all").split("\0"))
+        for record in records:
+            if record:
+                relative_paths.append(record[3:])
+                if record[0] in "RC":
+                    relative_paths.append(next(records))
+        if head != entry.head and entry.head is not None and head is not None:
+            relative_paths.extend(git.diff(entry.head, head, "--name-only", "-z").split("\0"))
+
+        candidates = set(entry.mtimes)
+        candidates.update(os.path.join(ctx.repo_path, path) for path in relative_paths if path and any(path.endswith(e) for e in ctx.extensions))
+        return candidates
+
+    def _refresh(self, entry: _PoolEntry) -> None:
+        """Applies every change made to the repo since the entry was last refreshed to its graph"""
+        head = self._get_head(entry.codebase)
+        diffs = []
+        for path in self._get_candidates(entry, head):
+            mtime = _get_mtime(path)
+            old_mtime = entry.mtimes.get(path)
+            if mtime == old_mtime:
+                continue
+            if mtime is None:
+                del entry.mtimes[path]
+                diffs.append(DiffLite(ChangeType.Removed, Path(path)))
+            else:
+                entry.mtimes[path] = mtime
+                diffs.append(DiffLite(ChangeType.Added if old_mtime is None else ChangeType.Modified, Path(path)))
+        entry.head = head
+        if diffs:
+            logger.info(f"Refreshing pooled codebase {entry.codebase.repo_path} with {len(diffs)} changed files")
+            entry.codebase.ctx.apply_diffs(diffs)
+
+
+_pool = CodebasePool()
+
+
+def get_codebase(repo_path: str, language: ProgrammingLanguage | str | None = None, config: CodebaseConfig | None = None) -> Codebase:
+    """Returns a warm codebase for the given repo from the process-wide pool"""
+    return _pool.get(repo_path, language, config)
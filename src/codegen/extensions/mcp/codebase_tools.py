@@ -3,9 +3,9 @@ from typing import Annotated, Optional
 
 from mcp.server.fastmcp import FastMCP
 
+from codegen.extensions.mcp.codebase_pool import get_codebase
 from codegen.extensions.tools import reveal_symbol
 from codegen.extensions.tools.search import search
-from codegen.sdk.core.codebase import Codebase
 from codegen.shared.enums.programming_language import ProgrammingLanguage
 
 mcp = FastMCP(
@@ -25,7 +25,7 @@ def reveal_symbol_tool(
     collect_dependencies: Annotated[Optional[bool], "includes dependencies of symbol"],
     collect_usages: Annotated[Optional[bool], "includes usages of symbol"],
 ):
-    codebase = Codebase(repo_path=codebase_dir, language=codebase_language)
+    codebase = get_codebase(codebase_dir, codebase_language)
     result = reveal_symbol(
         codebase=codebase,
         symbol_name=symbol_name,
@@ -48,7 +48,7 @@ def search_codebase_tool(
     files_per_page: Annotated[int, "number of files to return per page"] = 10,
     use_regex: Annotated[bool, "use regex for the search query"] = False,
 ):
-    codebase = Codebase(repo_path=codebase_dir, language=codebase_language)
+    codebase = get_codebase(codebase_dir, codebase_language)
     result = search(codebase, query, target_directories=target_directories, file_extensions=file_extensions, page=page, files_per_page=files_per_page, use_regex=use_regex)
     return json.dumps(result, indent=2)
 
@@ -1,8 +1,5 @@
-import codecs
-import fnmatch
-import glob
 import os
-from collections.abc import Generator
+from collections.abc import Generator, Iterator
 from datetime import UTC, datetime
 from functools import cached_property
 from time import perf_counter
@@ -24,8 +21,9 @@ from codegen.git.schemas.enums import CheckoutResult, FetchResult, RepoVisibilit
 from codegen.git.schemas.repo_config import RepoConfig
 from codegen.git.utils.clone import clone_or_pull_repo, clone_repo, pull_repo
 from codegen.git.utils.clone_url import add_access_token_to_url, get_authenticated_clone_url_for_repo_config, get_clone_url_for_repo_config, url_to_github
-from codegen.git.utils.codeowner_utils import create_codeowners_parser_for_repo
+from codegen.git.utils.codeowner_utils import CodeOwnersIndex, create_codeowners_parser_for_repo
 from codegen.git.utils.file_utils import create_files
+from codegen.git.utils.path_matcher import compile_ignore_list, could_contain_subdirs
 from codegen.git.utils.remote_progress import CustomRemoteProgress
 from codegen.shared.logging.get_logger import get_logger
 from codegen.shared.performance.stopwatch_utils import stopwatch
@@ -44,6 +42,7 @@ class RepoOperator:
 
     # lazy attributes
     _codeowners_parser: CodeOwnersParser | None = None
+    _codeowners_index: CodeOwnersIndex | None = None
     _default_branch: str | None = None
     _remote_git_repo: GitRepoClient | None = None
     _local_git_repo: LocalGitRepo | None = None
@@ -205,6 +204,15 @@ class RepoOperator:
             self._codeowners_parser = create_codeowners_parser_for_repo(self.remote_git_repo)
         return self._codeowners_parser
 
+    @property
+    def codeowners_index(self) -> CodeOwnersIndex | None:
+        parser = self.codeowners_parser
+        if parser is None:
+            return None
+        if self._codeowners_index is None or self._codeowners_index.parser is not parser:
+            self._codeowners_index = CodeOwnersIndex(parser)
+        return self._codeowners_index
+
     ####################################################################################################################
     # SET UP
     ####################################################################################################################
@@ -593,40 +601,60 @@ class RepoOperator:
         if os.listdir(self.abspath(os.path.dirname(path))) == []:
             os.rmdir(self.abspath(os.path.dirname(path)))
 
-    def get_filepaths_for_repo(self, ignore_list):
-        # Get list of files to iterate over based on gitignore setting
+    def get_filepaths_for_repo(self, ignore_list: list[str] | None) -> list[str]:
+        return list(self.iter_filepaths(ignore_list))
+
+    def iter_filepaths(self, ignore_list: list[str] | None = None, subdirs: list[str] | None = None) -> Iterator[str]:
+        """Streams the relative paths of the files in the repo, skipping those matched by `ignore_list`.
+
+        Args:
+        ----
+            ignore_list (list[str], optional): fnmatch patterns (or path prefixes) of files to skip.
+            subdirs (list[str], optional): Only directories that can contain paths starting with one of these are listed.
+
+        """
+        matcher = compile_ignore_list(tuple(ignore_list or ()))
+        subdirs = tuple(subdirs) if subdirs else None
         if self.repo_config.respect_gitignore:
             # ls-file flags:
             # -c: show cached files
             # -o: show other / untracked files
+            # -d: show deleted files (cached files that are no longer on disk)
             # --exclude-standard: exclude standard gitignore rules
-            filepaths = self.git_cli.git.ls_files("-co", "--exclude-standard").split("\n")
-        else:
-            filepaths = glob.glob("**", root_dir=self.repo_path, recursive=True, include_hidden=True)
-            # Filter filepaths by ignore list.
-        if ignore_list:
-            filepaths = [f for f in filepaths if not any(fnmatch.fnmatch(f, pattern) or f.startswith(pattern) for pattern in ignore_list)]
-
-        # Fix bug where unicode characters are not handled correctly
-        for i, filepath in enumerate(filepaths):
-            # Check if it is one of the broken cases
-            if filepath.startswith('"'):
-                # Step 1: Strip the quotes
-                filepath = filepath.strip('"').strip("'")
-
-                # Step 2: Convert the Python string to raw ASCII bytes (so \\ stays as two 0x5C).
-                raw_filepath = filepath.encode("ascii")
-
-                # Step 3: Use escape_decode to process backslash escapes like \346 -> 0xE6
-                decoded_filepath, _ = codecs.escape_decode(raw_filepath)
-
-                # Step 4: Decode those bytes as UTF-8 to get the actual Unicode text
-                filepath = decoded_filepath.decode("utf-8")
-
-                # Step 5: Replace the original filepath with the decoded filepath
-                filepaths[i] = filepath
+            # -z: NUL separated, without quoting paths with unicode characters in them
+            # Deleted files and submodules are listed too, but are not files on disk
+            skipped = set(self.git_cli.git.ls_files("-d", "-z").split("\0"))
+            if os.path.exists(os.path.join(self.repo_path, ".gitmodules")):
+                skipped.update(submodule.path for submodule in self.git_cli.submodules)
+            for filepath in self._stream_git_ls_files("-co", "--exclude-standard"):
+                if filepath not in skipped and not matcher.ignores_file(filepath):
+                    yield filepath
+            return
 
-        return filepaths
+        for dirpath, dirnames, filenames in os.walk(self.repo_path):
+            rel_dirpath = os.path.relpath(dirpath, self.repo_path)
+            rel_dirpath = "" if rel_dirpath == "." else rel_dirpath + "/"
+            # Prune ignored directories (and ones outside of subdirs) before walking into them
+            dirnames[:] = [
+                dirname for dirname in dirnames if not matcher.ignores_dir(rel_dirpath + dirname) and (subdirs is None or could_contain_subdirs(rel_dirpath + dirname, subdirs))
+            ]
+            for filename in filenames:
+                filepath = rel_dirpath + filename
+                if not matcher.ignores_file(filepath):
+                    yield filepath
+
+    def _stream_git_ls_files(self, *args: str) -> Iterator[str]:
+        """Runs `git ls-files -z` and yields the paths as they are read, instead of buffering the whole output"""
+        proc = self.git_cli.git.ls_files(*args, "-z", as_process=True)
+        remainder = b""
+        # If the generator is not exhausted, the process is killed once it is garbage collected
+        while chunk := proc.stdout.read(1 << 16):
+            *paths, remainder = (remainder + chunk).split(b"\0")
+            for path in paths:
+                yield path.decode("utf-8")
+        proc.wait()
+        if remainder:
+            yield remainder.decode("utf-8")
 
     # TODO: unify param naming i.e. subdirectories vs subdirs probably use subdirectories since that's in the DB
     def iter_files(
@@ -649,26 +677,24 @@ class RepoOperator:
             tuple: A tuple containing the relative filepath and the content of the file.
 
         """
-        filepaths = self.get_filepaths_for_repo(ignore_list)
-        # Iterate through files and yield contents
-        for rel_filepath in filepaths:
-            rel_filepath: str
-            filepath = os.path.join(self.repo_path, rel_filepath)
-
+        # str.startswith / str.endswith with a tuple check every prefix / suffix in a single call
+        subdirs = tuple(subdirs) if subdirs else None
+        extensions = tuple(extensions) if extensions is not None else None
+        for rel_filepath in self.iter_filepaths(ignore_list, subdirs=subdirs):
             # Filter by subdirectory (includes full filenames)
-            if subdirs and not any(rel_filepath.startswith(subdir) for subdir in subdirs):
+            if subdirs and not rel_filepath.startswith(subdirs):
                 continue
 
-            if extensions is None or any(filepath.endswith(e) for e in extensions):
+            if extensions is None or rel_filepath.endswith(extensions):
+                filepath = os.path.join(self.repo_path, rel_filepath)
+                if skip_content:
+                    yield rel_filepath, ""
+                    continue
                 try:
-                    if os.path.isfile(filepath):
-                        if not skip_content:
-                            content = self.get_file(filepath)
-                            yield rel_filepath, content
-                        else:
-                            yield rel_filepath, ""
-                    else:
-                        logger.warning(f"Skipping {filepath} because it does not exist or is not a valid file.")
+                    content = self.get_file(filepath)
+                    yield rel_filepath, content
+                except (FileNotFoundError, IsADirectoryError):
+                    logger.warning(f"Skipping {filepath} because it does not exist or is not a valid file.")
                 except Exception as e:
                     logger.warning(f"Error reading file {filepath}: {e}")
 
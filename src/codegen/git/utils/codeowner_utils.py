@@ -1,4 +1,7 @@
-from codeowners import CodeOwners
+import re
+from collections import defaultdict
+
+from codeowners import MASK, CodeOwners, OwnerTuple
 from github.PullRequest import PullRequest
 
 from codegen.git.clients.git_repo_client import GitRepoClient
@@ -21,6 +24,130 @@ def is_path_owned_by_codeowner(codeowners: CodeOwners, path: str, codeowner: str
     return False
 
 
+class CodeOwnersIndex:
+    """Owners of paths in a CODEOWNERS file, resolved once per directory and once per file.
+
+    The rules are compiled into two combined regexes, listing the highest priority (last) rule first: one for rules that
+    own every file under a directory they match (ex: `/docs/` or `*.egg-info`), and one for rules matching a file path
+    itself (ex: `*.py` or `/docs/*`). A directory inherits the owners of its parent unless a higher priority rule matches
+    it, and a file inherits the owners of its directory unless a higher priority rule matches the file.
+
+    The index also keeps a map from owner to the paths registered with `add_path` (ex: the files in a codebase).
+    Any other parser than `CodeOwners` (or a rule it cannot split) is queried through `of` instead.
+    """
+
+    parser: CodeOwners
+    _compiled: bool
+    _dir_pattern: re.Pattern[str] | None
+    _file_pattern: re.Pattern[str] | None
+
+    def __init__(self, parser: CodeOwners) -> None:
+        self.parser = parser
+        self._rule_owners: list[list[OwnerTuple]] = []
+        self._dir_pattern = self._file_pattern = None
+        self._dir_rules: list[int] = []
+        self._file_rules: list[int] = []
+        self._rule_by_dir: dict[str, int | None] = {}
+        self._owners_by_path: dict[str, list[OwnerTuple]] = {}
+        self._paths_by_owner: defaultdict[str, set[str]] = defaultdict(set)
+        self._paths: set[str] = set()
+        self._compiled = isinstance(parser, CodeOwners) and self._compile(parser)
+
+    def _compile(self, parser: CodeOwners) -> bool:
+        dir_alternatives = []
+        file_alternatives = []
+        for idx, (pattern, _, owners, _, _) in enumerate(parser.paths):
+            # CodeOwners.paths is already sorted from highest to lowest priority. Each regex is searched in the path, so
+            # it is turned into one matching the full path (of a directory with its trailing slash, or of a file)
+            regex = pattern.pattern
+            if regex.startswith(r"(?:\A|/)"):
+                prefix, body = "(?:.*/)?", regex.removeprefix(r"(?:\A|/)")
+            elif regex.startswith(r"\A"):
+                prefix, body = "", regex.removeprefix(r"\A")
+            else:
+                return False
+            if body.endswith(r"(?:\Z|/)"):
+                body = prefix + body.removesuffix(r"(?:\Z|/)")
+                dir_alternatives.append(f"({body}/)")
+                self._dir_rules.append(idx)
+                file_alternatives.append(f"({body})")
+                self._file_rules.append(idx)
+            elif body.endswith(r"\Z"):
+                body = prefix + body.removesuffix(r"\Z")
+                file_alternatives.append(f"({body})")
+                self._file_rules.append(idx)
+            elif body.endswith("/"):
+                dir_alternatives.append(f"({prefix}{body})")
+                self._dir_rules.append(idx)
+            else:
+                return False
+            self._rule_owners.append(owners)
+        # With every alternative matching the full string, the first one (highest priority) that matches is reported
+        self._dir_pattern = re.compile("|".join(dir_alternatives)) if dir_alternatives else None
+        self._file_pattern = re.compile("|".join(file_alternatives)) if file_alternatives else None
+        return True
+
+    def of(self, filepath: str) -> list[OwnerTuple]:
+        """Same as `CodeOwners.of`: the owners of the highest priority rule matching the path"""
+        owners = self._owners_by_path.get(filepath)
+        if owners is None:
+            owners = self._owners_by_path[filepath] = self._match(filepath) if self._compiled else self.parser.of(filepath)
+        return owners
+
+    def owners_of(self, filepath: str) -> set[str]:
+        return {owner for _, owner in self.of(filepath)}
+
+    def files_of(self, owner: str) -> set[str]:
+        """The registered paths owned by `owner`"""
+        return self._paths_by_owner.get(owner, set())
+
+    def has_path(self, filepath: str) -> bool:
+        return filepath in self._paths
+
+    def add_path(self, filepath: str) -> None:
+        if filepath not in self._paths:
+            self._paths.add(filepath)
+            for _, owner in self.of(filepath):
+                self._paths_by_owner[owner].add(filepath)
+
+    def remove_path(self, filepath: str) -> None:
+        if filepath in self._paths:
+            self._paths.discard(filepath)
+            for _, owner in self.of(filepath):
+                self._paths_by_owner[owner].discard(filepath)
+
+    def clear_paths(self) -> None:
+        self._paths.clear()
+        self._paths_by_owner.clear()
+
+    def _match(self, filepath: str) -> list[OwnerTuple]:
+        # Spaces are masked the same way CodeOwners does (escaped spaces in patterns are masked on parse)
+        path = filepath.replace(" ", MASK)
+        directory, _, _ = path.rpartition("/")
+        rule = self._match_dir(directory) if directory else None
+        if self._file_pattern is not None and (match := self._file_pattern.fullmatch(path)):
+            file_rule = self._file_rules[match.lastindex - 1]
+            if rule is None or file_rule < rule:
+                rule = file_rule
+        return self._rule_owners[rule] if rule is not None else []
+
+    def _match_dir(self, directory: str) -> int | None:
+        """Index of the highest priority rule owning every file under `directory` (a masked path without a trailing slash)"""
+        # Walk up to the closest resolved ancestor, then resolve back down so each directory is matched once
+        unresolved = []
+        while directory and directory not in self._rule_by_dir:
+            unresolved.append(directory)
+            directory, _, _ = directory.rpartition("/")
+        rule = self._rule_by_dir.get(directory) if directory else None
+        for directory in reversed(unresolved):
+            if self._dir_pattern is not None and (match := self._dir_pattern.fullmatch(directory + "/")):
+                dir_rule = self._dir_rules[match.lastindex - 1]
+                if rule is None or dir_rule < rule:
+                    rule = dir_rule
+            self._rule_by_dir[directory] = rule
+        return rule
+
+
 def create_codeowners_parser_for_repo(py_github_repo: GitRepoClient) -> CodeOwners | None:
     for codeowners_filepath in CODEOWNERS_FILEPATHS:
         try:
@@ -0,0 +1,35 @@
+import fnmatch
+import re
+from functools import cache
+
+
+class IgnoreMatcher:
+    """An ignore list compiled into a single regex.
+
+    A path is ignored if it matches one of the patterns with `fnmatch`, or starts with one of them. A directory can be
+    pruned (without listing anything in it) if every path inside of it is ignored: that is the case if it starts with
+    one of the patterns, or matches a pattern ending in `*` (which then matches anything after the directory as well).
+    """
+
+    def __init__(self, ignore_list: tuple[str, ...]) -> None:
+        prefixes = [re.escape(pattern) for pattern in ignore_list]
+        self._file_pattern = re.compile("|".join([fnmatch.translate(pattern) for pattern in ignore_list] + prefixes)) if ignore_list else None
+        self._dir_pattern = re.compile("|".join([fnmatch.translate(pattern) for pattern in ignore_list if pattern.endswith("*")] + prefixes)) if ignore_list else None
+
+    def ignores_file(self, path: str) -> bool:
+        return self._file_pattern is not None and self._file_pattern.match(path) is not None
+
+    def ignores_dir(self, path: str) -> bool:
+        """Whether every file in the directory at `path` (relative, without a trailing slash) is ignored"""
+        return self._dir_pattern is not None and self._dir_pattern.match(path + "/") is not None
+
+
+@cache
+def compile_ignore_list(ignore_list: tuple[str, ...]) -> IgnoreMatcher:
+    return IgnoreMatcher(ignore_list)
+
+
+def could_contain_subdirs(path: str, subdirs: tuple[str, ...]) -> bool:
+    """Whether any file in the directory at `path` can start with one of `subdirs` (which are plain string prefixes)"""
+    path += "/"
+    return any(subdir.startswith(path) or path.startswith(subdir) for subdir in subdirs)
@@ -18,6 +18,10 @@ class GroupingConfig(BaseModel):
     subdirectories: list[str] | None = None
     group_by: GroupBy | None = None
     max_prs: int | None = None
+    # Number of groups to run at once, each in its own git worktree
+    max_parallel_groups: int = 1
+    # Stop (and skip pushing) the remaining groups once a group fails
+    stop_on_error: bool = True
 
 
 class BranchConfig(BaseModel):
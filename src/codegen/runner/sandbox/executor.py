@@ -1,15 +1,22 @@
+import asyncio
+import multiprocessing
+import os
+import tempfile
 from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import UTC, datetime
 
 from github.PullRequest import PullRequest
 
 from codegen.git.models.pr_options import PROptions
+from codegen.git.repo_operator.repo_operator import RepoOperator
 from codegen.runner.diff.get_raw_diff import get_raw_diff
 from codegen.runner.models.codemod import BranchConfig, CodemodRunResult, CreatedBranch, GroupingConfig
 from codegen.runner.sandbox.repo import SandboxRepo
 from codegen.runner.utils.branch_name import get_head_branch_name
 from codegen.runner.utils.exception_utils import update_observation_meta
-from codegen.sdk.codebase.config import SessionOptions
+from codegen.sdk.codebase.config import ProjectConfig, SessionOptions
 from codegen.sdk.codebase.factory.codebase_factory import CodebaseType
 from codegen.sdk.codebase.flagging.code_flag import CodeFlag
 from codegen.sdk.codebase.flagging.group import Group
@@ -22,6 +29,52 @@ from codegen.visualizations.viz_utils import get_graph_json
 logger = get_logger(__name__)
 
 
+@dataclass
+class _WorktreeRun:
+    """State of a parallel execute_flag_groups run, shared with its worker processes"""
+
+    codebase: CodebaseType
+    execute_func: Callable
+    commit_msg: str
+    flag_groups: list[Group | None]
+    head_branches: list[str]
+    base_branch: str
+    worktrees_dir: str
+    snapshot_dir: str
+
+
+# Set before the worker processes are forked, so they inherit the codebase and execute_func instead of unpickling them
+_worktree_run: _WorktreeRun | None = None
+
+
+def _get_worktree_path(run: _WorktreeRun, idx: int) -> str:
+    return os.path.join(run.worktrees_dir, f"group-{idx}")
+
+
+def _run_group_in_worktree(idx: int) -> tuple[CodemodRunResult, bool]:
+    """Runs a single flag group in a worktree of its own (in a worker process).
+
+    The codebase of the worktree is restored from the graph snapshot of the base branch. Returns the run result and whether
+    the codemod committed any changes to the head branch.
+    """
+    from codegen.sdk.core.codebase import Codebase
+
+    run = _worktree_run
+    path = _get_worktree_path(run, idx)
+    SandboxRepo(run.codebase).add_worktree(path, run.base_branch)
+    repo_config = run.codebase.op.repo_config.model_copy(update={"base_dir": run.worktrees_dir, "name": os.path.basename(path)})
+    op = RepoOperator(repo_config=repo_config, access_token=run.codebase.op.access_token, bot_commit=run.codebase.op.bot_commit)
+    project = run.codebase.ctx.projects[0]
+    projects = [ProjectConfig(repo_operator=op, programming_language=project.programming_language, base_path=project.base_path, subdirectories=project.subdirectories)]
+    config = run.codebase.ctx.config.model_copy(update={"graph_snapshot_dir": run.snapshot_dir})
+    codebase = Codebase(projects=projects, config=config, secrets=run.codebase.ctx.secrets)
+
+    # The base branch is checked out in the main worktree, so the head branch is created from the detached HEAD instead
+    codebase.checkout(branch=run.head_branches[idx], create_if_missing=True)
+    run_result = asyncio.run(SandboxExecutor(codebase).execute(run.execute_func, group=run.flag_groups[idx]))
+    return run_result, codebase.git_commit(f"[Codegen] {run.commit_msg}") is not None
+
+
 class SandboxExecutor:
     """Responsible for executing the user defined codemod in the sandbox."""
 
@@ -54,11 +107,31 @@ class SandboxExecutor:
         logger.info(f"> Created {len(groups)} groups")
         return groups
 
-    async def execute_flag_groups(self, commit_msg: str, execute_func: Callable, flag_groups: list[Group], branch_config: BranchConfig) -> tuple[list[CodemodRunResult], list[CreatedBranch]]:
+    async def execute_flag_groups(
+        self,
+        commit_msg: str,
+        execute_func: Callable,
+        flag_groups: list[Group],
+        branch_config: BranchConfig,
+        max_parallel_groups: int = 1,
+        stop_on_error: bool = True,
+    ) -> tuple[list[CodemodRunResult], list[CreatedBranch]]:
+        """Runs the codemod once per flag group, each on its own head branch, and pushes the branches.
+
+        With `max_parallel_groups > 1`, up to that many groups run at once in separate git worktrees (see
+        _execute_flag_groups_in_worktrees). Results and branches are returned in the order of `flag_groups` either way.
+        """
+        if max_parallel_groups > 1 and len(flag_groups) > 1:
+            head_branches = [branch_config.custom_head_branch or get_head_branch_name(branch_config.branch_name, group) for group in flag_groups]
+            # A branch can only be checked out in one worktree at a time
+            if len(set(head_branches)) == len(head_branches):
+                return await self._execute_flag_groups_in_worktrees(commit_msg, execute_func, flag_groups, head_branches, branch_config, max_parallel_groups, stop_on_error)
+            logger.info("Running groups serially because they share a head branch")
+
         run_results = []
         head_branches = []
         for idx, group in enumerate(flag_groups):
-            if idx > 0 and run_results[-1].error:
+            if idx > 0 and stop_on_error and run_results[-1].error:
                 logger.info("Skipping remaining groups because of error in previous group")
                 break
             if group:
@@ -80,6 +153,74 @@ class SandboxExecutor:
         self.codebase.ctx.flags._flags.clear()
         return run_results, head_branches
 
+    async def _execute_flag_groups_in_worktrees(
+        self,
+        commit_msg: str,
+        execute_func: Callable,
+        flag_groups: list[Group],
+        head_branches: list[str],
+        branch_config: BranchConfig,
+        max_parallel_groups: int,
+        stop_on_error: bool,
+    ) -> tuple[list[CodemodRunResult], list[CreatedBranch]]:
+        """Runs the flag groups concurrently, each in a forked worker process with a git worktree of its own.
+
+        Workers only execute and commit. The branches are pushed from here, in group order, once the previous groups are
+        done, so with `stop_on_error` the results and pushes are the same as those of a serial run.
+        """
+        global _worktree_run
+
+        base_branch = branch_config.custom_base_branch
+        with tempfile.TemporaryDirectory(prefix="codegen-worktrees-") as worktrees_dir:
+            run = _WorktreeRun(
+                codebase=self.codebase,
+                execute_func=execute_func,
+                commit_msg=commit_msg,
+                flag_groups=flag_groups,
+                head_branches=head_branches,
+                base_branch=base_branch,
+                worktrees_dir=worktrees_dir,
+                snapshot_dir=self.codebase.ctx.config.graph_snapshot_dir or os.path.join(worktrees_dir, "snapshots"),
+            )
+            # Workers restore the graph from this snapshot instead of parsing the repo again (unless it can't be written)
+            self.codebase.ctx.save_graph_snapshot(snapshot_dir=run.snapshot_dir)
+            _worktree_run = run
+            run_results = []
+            created_branches = []
+            loop = asyncio.get_running_loop()
+            logger.info(f"Running {len(flag_groups)} groups with up to {max_parallel_groups} worktrees at once...")
+            try:
+                with ProcessPoolExecutor(max_workers=max_parallel_groups, mp_context=multiprocessing.get_context("fork")) as pool:
+                    futures = [loop.run_in_executor(pool, _run_group_in_worktree, idx) for idx in range(len(flag_groups))]
+                    for idx, future in enumerate(futures):
+                        if idx > 0 and stop_on_error and run_results[-1].error:
+                            # Groups that are already running finish, but their branches are not pushed
+                            logger.info("Skipping remaining groups because of error in previous group")
+                            for pending in futures[idx:]:
+                                pending.cancel()
+                            break
+                        head_branch = run.head_branches[idx]
+                        try:
+                            run_result, committed = await future
+                        except Exception as e:
+                            logger.exception(e)
+                            run_result, committed = CodemodRunResult(error=str(e), completed_at=datetime.now(tz=UTC)), False
+                        created_branch = CreatedBranch(base_branch=base_branch, head_ref=None)
+                        if committed and self.remote_repo.push_branch(head_branch, branch_config.force_push_head_branch):
+                            created_branch.head_ref = head_branch
+                        elif not committed:
+                            logger.info(f"Skipping opening pull request for group {idx + 1} b/c the codemod produced no changes")
+                        run_results.append(run_result)
+                        created_branches.append(created_branch)
+            finally:
+                _worktree_run = None
+                for idx in range(len(flag_groups)):
+                    if os.path.exists(path := _get_worktree_path(run, idx)):
+                        self.remote_repo.remove_worktree(path)
+
+        self.codebase.ctx.flags._flags.clear()
+        return run_results, created_branches
+
     async def execute(self, execute_func: Callable, group: Group | None = None, session_options: SessionOptions = SessionOptions()) -> CodemodRunResult:
         """Runs the execute_func in edit_mode and returns the saved the result"""
         self.codebase.set_find_mode(False)
@@ -1,3 +1,5 @@
+from git import GitCommandError
+
 from codegen.sdk.codebase.factory.codebase_factory import CodebaseType
 from codegen.shared.logging.get_logger import get_logger
 
@@ -60,11 +62,24 @@ class SandboxRepo:
         if not has_staged_commit:
             logger.info("Skipping opening pull request for cm_run b/c the codemod produced no changes")
             return False
+        return self.push_branch(head_branch, force_push)
 
-        # =====[ Push changes highside ]=====
+    def push_branch(self, head_branch: str, force_push: bool) -> bool:
+        """Pushes an already committed head branch (which may have been committed in another worktree)"""
         highside_remote = self.codebase.op.git_cli.remote(name="origin")
         highside_res = self.codebase.op.push_changes(remote=highside_remote, refspec=f"{head_branch}:{head_branch}", force=force_push)
         return not any(push_info.flags & push_info.ERROR for push_info in highside_res)
 
+    def add_worktree(self, path: str, ref: str) -> None:
+        """Checks out `ref` (detached) into a new worktree at `path`, sharing this repo's objects and branches"""
+        logger.info(f"Adding worktree for {ref} at {path} ...")
+        self.codebase.op.git_cli.git.worktree("add", "--detach", path, ref)
+
+    def remove_worktree(self, path: str) -> None:
+        try:
+            self.codebase.op.git_cli.git.worktree("remove", "--force", path)
+        except GitCommandError as e:
+            logger.warning(f"Failed to remove worktree at {path}: {e}")
+
     # TODO: move bunch of codebase git operations into this class.
     # The goal is to make the codebase class ONLY allow RepoOperator.
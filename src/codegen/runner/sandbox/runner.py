@@ -79,7 +79,14 @@ class SandboxRunner:
             logger.info(f"Max PRs limit reached: {max_prs}. Skipping remaining groups.")
             flag_groups = flag_groups[:max_prs]
 
-        run_results, branches = await self.executor.execute_flag_groups(request.commit_msg, code_to_exec, flag_groups, branch_config)
+        run_results, branches = await self.executor.execute_flag_groups(
+            request.commit_msg,
+            code_to_exec,
+            flag_groups,
+            branch_config,
+            max_parallel_groups=request.grouping_config.max_parallel_groups,
+            stop_on_error=request.grouping_config.stop_on_error,
+        )
         response.results = run_results
         response.branches = branches
 
@@ -1,5 +1,5 @@
 import logging
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, nullcontext
 
 from fastapi import FastAPI
 
@@ -53,6 +53,8 @@ async def lifespan(server: FastAPI):
         codebase_config = DefaultCodebaseConfig.model_copy(update={"sync_enabled": True})
         await runner.warmup(codebase_config=codebase_config)
         server_info.synced_commit = runner.op.head_commit.hexsha
+        # Keep the graph in sync with the working tree between runs
+        runner.codebase.ctx.start_file_watcher()
         server_info.warmup_state = WarmupState.COMPLETED
 
     except Exception:
@@ -62,6 +64,8 @@ async def lifespan(server: FastAPI):
     logger.info("Local daemon is ready to accept requests!")
     yield
     logger.info("Shutting down local daemon server")
+    if server_info.warmup_state == WarmupState.COMPLETED:
+        runner.codebase.ctx.stop_file_watcher()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -74,21 +78,30 @@ def health() -> ServerInfo:
 
 @app.post(RUN_FUNCTION_ENDPOINT)
 async def run(request: RunFunctionRequest) -> CodemodRunResult:
-    _save_uncommitted_changes_and_sync()
-    diff_req = GetDiffRequest(codemod=Codemod(user_code=request.codemod_source))
-    diff_response = await runner.get_diff(request=diff_req)
-    if request.commit:
-        if commit_sha := runner.codebase.git_commit(f"[Codegen] {request.function_name}", exclude_paths=[".codegen/*"]):
-            logger.info(f"Committed changes to {commit_sha.hexsha}")
+    watcher = runner.codebase.ctx.file_watcher
+    # Hold the watcher's lock so file system changes are only applied to the graph between runs
+    with watcher.lock if watcher is not None else nullcontext():
+        _save_uncommitted_changes_and_sync()
+        diff_req = GetDiffRequest(codemod=Codemod(user_code=request.codemod_source))
+        diff_response = await runner.get_diff(request=diff_req)
+        if request.commit:
+            if commit_sha := runner.codebase.git_commit(f"[Codegen] {request.function_name}", exclude_paths=[".codegen/*"]):
+                logger.info(f"Committed changes to {commit_sha.hexsha}")
     return diff_response.result
 
 
 def _save_uncommitted_changes_and_sync() -> None:
+    # The commit keeps the user's uncommitted changes out of the diff of the run
     if commit := runner.codebase.git_commit("[Codegen] Save uncommitted changes", exclude_paths=[".codegen/*"]):
         logger.info(f"Saved uncommitted changes to {commit.hexsha}")
 
     cur_commit = runner.op.head_commit
-    if cur_commit != runner.codebase.ctx.synced_commit:
+    if (watcher := runner.codebase.ctx.file_watcher) is not None:
+        # The watcher has already applied every change in the working tree to the graph
+        watcher.flush()
+        if cur_commit != runner.codebase.ctx.synced_commit:
+            runner.codebase.ctx.save_commit(cur_commit)
+    elif cur_commit != runner.codebase.ctx.synced_commit:
         logger.info(f"Syncing codebase to head commit: {cur_commit.hexsha}")
         runner.codebase.sync_to_commit(target_commit=cur_commit)
     else:
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import os
+import re
 from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from enum import IntEnum, auto, unique
 from functools import lru_cache
@@ -16,31 +18,39 @@ from codegen.configs.models.secrets import SecretsConfig
 from codegen.sdk.codebase.config import ProjectConfig, SessionOptions
 from codegen.sdk.codebase.config_parser import ConfigParser, get_config_parser_for_language
 from codegen.sdk.codebase.diff_lite import ChangeType, DiffLite
+from codegen.sdk.codebase.file_watcher import DEFAULT_DEBOUNCE_MS, FileWatcher
 from codegen.sdk.codebase.flagging.flags import Flags
+from codegen.sdk.codebase.graph_snapshot import GraphSnapshot, SnapshotMismatchError, find_snapshot, get_snapshot_path
 from codegen.sdk.codebase.io.file_io import FileIO
+from codegen.sdk.codebase.metrics import MetricsCollector
 from codegen.sdk.codebase.progress.stub_progress import StubProgress
+from codegen.sdk.codebase.residency import FileResidency
 from codegen.sdk.codebase.transaction_manager import TransactionManager
-from codegen.sdk.codebase.validation import get_edges, post_reset_validation
+from codegen.sdk.codebase.validation import get_edges, log_or_throw, post_reset_validation
 from codegen.sdk.core.autocommit import AutoCommit, commiter
 from codegen.sdk.core.directory import Directory
 from codegen.sdk.core.external.dependency_manager import DependencyManager, get_dependency_manager
 from codegen.sdk.core.external.language_engine import LanguageEngine, get_language_engine
-from codegen.sdk.enums import Edge, EdgeType, NodeType
+from codegen.sdk.enums import Edge, EdgeType, NodeType, SymbolType
 from codegen.sdk.extensions.sort import sort_editables
-from codegen.sdk.extensions.utils import uncache_all
+from codegen.sdk.extensions.utils import evict_files, set_cache_listener, uncache_all, uncache_files, verify_uncache
+from codegen.sdk.tree_sitter_parser import parse_tree
 from codegen.sdk.typescript.external.ts_declassify.ts_declassify import TSDeclassify
+from codegen.sdk.utils import is_minified_js
 from codegen.shared.enums.programming_language import ProgrammingLanguage
 from codegen.shared.exceptions.control_flow import StopCodemodException
 from codegen.shared.logging.get_logger import get_logger
 from codegen.shared.performance.stopwatch_utils import stopwatch
 
 if TYPE_CHECKING:
-    from collections.abc import Generator, Mapping, Sequence
+    from collections.abc import Generator, Iterable, Iterator, Mapping, Sequence
 
     from codeowners import CodeOwners as CodeOwnersParser
     from git import Commit as GitCommit
+    from tree_sitter import Tree as TSTree
 
     from codegen.git.repo_operator.repo_operator import RepoOperator
+    from codegen.git.utils.codeowner_utils import CodeOwnersIndex
     from codegen.sdk.codebase.io.io import IO
     from codegen.sdk.codebase.node_classes.node_classes import NodeClasses
     from codegen.sdk.codebase.progress.progress import Progress
@@ -51,6 +61,7 @@ if TYPE_CHECKING:
     from codegen.sdk.core.interfaces.importable import Importable
     from codegen.sdk.core.node_id_factory import NodeId
     from codegen.sdk.core.parser import Parser
+    from codegen.sdk.core.symbol import Symbol
 
 logger = get_logger(__name__)
 
@@ -103,6 +114,8 @@ class CodebaseContext:
     repo_path: str
     repo_name: str
     codeowners_parser: CodeOwnersParser | None
+    # Owners by path, and paths of the files in the graph by owner
+    codeowners_index: CodeOwnersIndex | None
     config: CodebaseConfig
     secrets: SecretsConfig
 
@@ -121,13 +134,36 @@ class CodebaseContext:
     dependency_manager: DependencyManager | None
     language_engine: LanguageEngine | None
     _computing = False
+    _syncing = False
+    # Contents of the files read while the codebase is read only, see File.content_bytes
+    read_only_contents: dict[Path, bytes]
     _graph: PyDiGraph[Importable, Edge]
     filepath_idx: dict[str, NodeId]
+    # Listed source files that have not been parsed yet (exp_lazy_graph), by relative path
+    lazy_files: dict[str, Path]
+    # Listed files looked up while syncing, which are parsed along with the files being synced
+    _lazy_requests: set[str]
+    # Resolved module paths, see TSImport._resolve_module_filepath. Cleared whenever a file is added or removed
+    module_resolution_cache: dict[tuple, str | None]
     _ext_module_idx: dict[str, NodeId]
+    # Top-level symbols by name and symbol type, plus the reverse mapping so removing a node is O(1)
+    _symbol_idx: dict[str, dict[SymbolType, set[NodeId]]]
+    _symbol_idx_keys: dict[NodeId, tuple[str, SymbolType]]
+    # Node ids bucketed by node type, and the sorted views of those buckets (dropped whenever a bucket changes)
+    _node_type_idx: dict[NodeType, set[NodeId]]
+    _node_type_views: dict[NodeType, list[NodeId]]
+    # Memoized neighbour lists and closures of dependency / usage queries, valid for a single graph generation
+    _closure_cache: dict[tuple, list[tuple[NodeId, int]]]
+    _closure_cache_generation: int
     flags: Flags
     session_options: SessionOptions = SessionOptions()
     projects: list[ProjectConfig]
     unapplied_diffs: list[DiffLite]
+    file_watcher: FileWatcher | None = None
+    # Wall time, CPU time, memory and graph size of every build, sync and commit phase
+    metrics: MetricsCollector
+    # Files whose cached state is kept in memory (max_resident_files), None if unbounded
+    residency: FileResidency | None
     io: IO
     progress: Progress
 
@@ -146,7 +182,16 @@ class CodebaseContext:
         self.__graph = PyDiGraph()
         self.__graph_ready = False
         self.filepath_idx = {}
+        self.lazy_files = {}
+        self._lazy_requests = set()
+        self.module_resolution_cache = {}
         self._ext_module_idx = {}
+        self._symbol_idx = {}
+        self._symbol_idx_keys = {}
+        self._node_type_idx = {node_type: set() for node_type in NodeType}
+        self._node_type_views = {}
+        self._closure_cache = {}
+        self._closure_cache_generation = 0
         self.generation = 0
 
         # NOTE: The differences between base_path, repo_name, and repo_path
@@ -167,6 +212,7 @@ class CodebaseContext:
         self.repo_path = str(Path(context.repo_operator.repo_path).resolve())
         self.full_path = os.path.join(self.repo_path, context.base_path) if context.base_path else self.repo_path
         self.codeowners_parser = context.repo_operator.codeowners_parser
+        self.codeowners_index = context.repo_operator.codeowners_index
         self.base_url = context.repo_operator.base_url
         if not self.config.allow_external:
             # TODO: Fix this to be more robust with multiple projects
@@ -174,7 +220,11 @@ class CodebaseContext:
         else:
             self.io = io or FileIO()
         # =====[ computed attributes ]=====
-        self.transaction_manager = TransactionManager()
+        self.metrics = MetricsCollector(graph_size=lambda: (self.__graph.num_nodes(), self.__graph.num_edges()))
+        self.transaction_manager = TransactionManager(metrics=self.metrics)
+        self.read_only_contents = {}
+        self.residency = FileResidency(self.config.max_resident_files, self._evict_file) if self.config.max_resident_files is not None else None
+        set_cache_listener(self.residency.touch if self.residency is not None else None)
         self._autocommit = AutoCommit(self)
         self.init_nodes = None
         self.init_edges = None
@@ -200,7 +250,7 @@ class CodebaseContext:
                 raise ValueError(msg)
 
         # Build the graph
-        if not self.config.exp_lazy_graph and self.config.use_pink != PinkMode.ALL_FILES:
+        if self.config.use_pink != PinkMode.ALL_FILES:
             self.build_graph(context.repo_operator)
         try:
             self.synced_commit = context.repo_operator.head_commit
@@ -226,27 +276,174 @@ class CodebaseContext:
     def _graph(self, value: PyDiGraph[Importable, Edge]) -> None:
         self.__graph = value
 
+    def _clear_graph(self) -> None:
+        """Removes every node and edge from the graph, along with the indices kept alongside it"""
+        self._graph.clear()
+        self._symbol_idx.clear()
+        self._symbol_idx_keys.clear()
+        for node_ids in self._node_type_idx.values():
+            node_ids.clear()
+        self._node_type_views.clear()
+        self._closure_cache.clear()
+        if self.residency is not None:
+            self.residency.clear()
+
+    def get_closure_cache(self) -> dict[tuple, list[tuple[NodeId, int]]]:
+        """Cache for transitive dependency / usage queries, emptied whenever the graph moves on to a new generation"""
+        if self._closure_cache_generation != self.generation:
+            self._closure_cache.clear()
+            self._closure_cache_generation = self.generation
+        return self._closure_cache
+
     @stopwatch
     @commiter
     def build_graph(self, repo_operator: RepoOperator) -> None:
         """Builds a codebase graph based on the current file state of the given repo operator"""
         self.__graph_ready = True
-        self._graph.clear()
+        self._clear_graph()
+        self.lazy_files.clear()
 
-        # =====[ Add all files to the graph in parallel ]=====
-        syncs = defaultdict(lambda: [])
-        if self.config.disable_file_parse:
-            logger.warning("WARNING: File parsing is disabled!")
-        else:
-            for filepath, _ in repo_operator.iter_files(subdirs=self.projects[0].subdirectories, extensions=self.extensions, ignore_list=GLOBAL_FILE_IGNORE_LIST):
-                syncs[SyncType.ADD].append(self.to_absolute(filepath))
-        logger.info(f"> Parsing {len(syncs[SyncType.ADD])} files in {self.projects[0].subdirectories or 'ALL'} subdirectories with {self.extensions} extensions")
-        self._process_diff_files(syncs, incremental=False)
+        if self.config.exp_lazy_graph and not self.config.disable_file_parse:
+            self._build_lazy_graph(repo_operator)
+            return
+
+        # =====[ Restore from a snapshot of this (or an earlier) commit if possible ]=====
+        if self.config.graph_snapshot_dir is not None and not self.config.disable_file_parse and self._restore_graph_snapshot(repo_operator):
+            logger.info(f"> Found {len(self.nodes)} nodes and {len(self.edges)} edges")
+            if self.config.track_graph:
+                self.old_graph = self._graph.copy()
+            return
+
+        with self.metrics.phase("build_graph"):
+            # =====[ Add all files to the graph in parallel ]=====
+            # The repo is listed once (without reading any content) for both parsing and the directory tree. Each source
+            # file is then read exactly once, when it is parsed.
+            filepaths = [filepath for filepath, _ in repo_operator.iter_files(subdirs=self.projects[0].subdirectories, ignore_list=GLOBAL_FILE_IGNORE_LIST, skip_content=True)]
+            syncs = defaultdict(lambda: [])
+            if self.config.disable_file_parse:
+                logger.warning("WARNING: File parsing is disabled!")
+            else:
+                syncs[SyncType.ADD] = [self.to_absolute(filepath) for filepath in filepaths if any(filepath.endswith(e) for e in self.extensions)]
+            logger.info(f"> Parsing {len(syncs[SyncType.ADD])} files in {self.projects[0].subdirectories or 'ALL'} subdirectories with {self.extensions} extensions")
+            self._process_diff_files(syncs, incremental=False, filepaths=filepaths)
+        self._write_metrics()
         files: list[SourceFile] = self.get_nodes(NodeType.FILE)
         logger.info(f"> Found {len(files)} files")
         logger.info(f"> Found {len(self.nodes)} nodes and {len(self.edges)} edges")
         if self.config.track_graph:
             self.old_graph = self._graph.copy()
+        if self.config.graph_snapshot_dir is not None and not self.config.disable_file_parse:
+            self.save_graph_snapshot(repo_operator)
+
+    def _build_lazy_graph(self, repo_operator: RepoOperator) -> None:
+        """Lists the files of the repo without parsing any of them (exp_lazy_graph).
+
+        A file is parsed the first time it, or a symbol in it, is requested. See load_lazy_files.
+        """
+        with self.metrics.phase("build_graph"):
+            self.module_resolution_cache.clear()
+            filepaths = [filepath for filepath, _ in repo_operator.iter_files(subdirs=self.projects[0].subdirectories, ignore_list=GLOBAL_FILE_IGNORE_LIST, skip_content=True)]
+            for filepath in filepaths:
+                if any(filepath.endswith(e) for e in self.extensions):
+                    self.lazy_files[str(self.to_relative(filepath))] = self.to_absolute(filepath)
+            with self.metrics.phase("directory_tree"):
+                self.build_directory_tree(filepaths)
+        self._write_metrics()
+        logger.info(f"> Listed {len(self.lazy_files)} files, parsing them on demand")
+
+    @stopwatch
+    @commiter
+    def load_lazy_files(self, filepaths: Iterable[str]) -> None:
+        """Parses the given listed files (exp_lazy_graph), along with every file their imports resolve to.
+
+        Args:
+            filepaths: Relative paths of the files to parse. Files that are already parsed are skipped.
+        """
+        to_load = [self.lazy_files.pop(filepath) for filepath in dict.fromkeys(filepaths) if filepath in self.lazy_files]
+        if not to_load:
+            return
+        logger.info(f"Lazily parsing {len(to_load)} files")
+        syncs = defaultdict(lambda: [])
+        syncs[SyncType.ADD] = to_load
+        self.generation += 1
+        with self.metrics.phase("lazy_load"):
+            self._process_diff_files(syncs, lazy_load=True)
+        self._write_metrics()
+
+    def load_lazy_files_referencing(self, name: str | None) -> None:
+        """Parses the listed files whose text mentions `name` (exp_lazy_graph), so that their usages of it are in the graph.
+
+        Every listed file is parsed if name is None.
+        """
+        if not self.lazy_files or self._syncing:
+            return
+        if name is None:
+            self.load_lazy_files(list(self.lazy_files))
+            return
+        pattern = re.compile(rf"(?<![\w$]){re.escape(name)}(?![\w$])")
+        self.load_lazy_files([filepath for filepath, path in self.lazy_files.items() if self._lazy_file_matches(path, pattern)])
+
+    def _lazy_file_matches(self, path: Path, pattern: re.Pattern[str]) -> bool:
+        try:
+            return pattern.search(self.io.read_text(path)) is not None
+        except UnicodeDecodeError:
+            return False
+
+    def _load_all_lazy_files(self) -> None:
+        """Parses every listed file before a query over the whole graph (exp_lazy_graph)"""
+        if self.lazy_files and not self._syncing:
+            self.load_lazy_files(list(self.lazy_files))
+
+    def _restore_graph_snapshot(self, repo_operator: RepoOperator) -> bool:
+        """Restores the graph from the snapshot of the closest ancestor commit, then applies the changes made since.
+
+        Returns False (leaving the graph empty) if there is no usable snapshot.
+        """
+        path = find_snapshot(self, repo_operator)
+        if path is None or (snapshot := GraphSnapshot.load(path)) is None:
+            return False
+        logger.info(f"> Restoring graph from snapshot {path}")
+        self._start_language_services()
+        try:
+            snapshot.restore(self)
+        except SnapshotMismatchError as e:
+            logger.warning(f"Failed to restore graph from snapshot {path}, rebuilding from scratch: {e}")
+            self._clear_graph()
+            self.filepath_idx.clear()
+            self.module_resolution_cache.clear()
+            if self.codeowners_index is not None:
+                self.codeowners_index.clear_paths()
+            self._ext_module_idx.clear()
+            self.directories = dict()
+            return False
+        if diffs := snapshot.get_diffs(self, repo_operator):
+            logger.info(f"> Applying {len(diffs)} changes made since snapshot commit {snapshot.commit}")
+            self.apply_diffs(diffs)
+            self.save_graph_snapshot(repo_operator)
+        return True
+
+    def save_graph_snapshot(self, repo_operator: RepoOperator | None = None, snapshot_dir: str | PathLike | None = None) -> Path | None:
+        """Writes the parsed state of the graph to `snapshot_dir` (`config.graph_snapshot_dir` by default), keyed by the
+        HEAD commit and the config.
+
+        Returns the path of the snapshot, or None if it could not be written.
+        """
+        repo_operator = repo_operator or self.projects[0].repo_operator
+        snapshot_dir = snapshot_dir or self.config.graph_snapshot_dir
+        if snapshot_dir is None or repo_operator.head_commit is None:
+            return None
+        if self.lazy_files:
+            logger.warning("Not saving a graph snapshot while some files have not been parsed yet")
+            return None
+        try:
+            snapshot = GraphSnapshot.from_context(self, repo_operator)
+            path = get_snapshot_path(snapshot_dir, snapshot.commit, snapshot.key)
+            snapshot.save(path)
+        except (SnapshotMismatchError, OSError) as e:
+            logger.warning(f"Failed to save graph snapshot: {e}")
+            return None
+        logger.info(f"> Saved graph snapshot to {path}")
+        return path
 
     @stopwatch
     @commiter
@@ -283,6 +480,14 @@ class CodebaseContext:
             logger.warning("WARNING: File parsing is disabled!")
         else:
             for filepath, sync_type in files_to_sync.items():
+                if (relative_path := str(self.to_relative(filepath))) in self.lazy_files:
+                    if sync_type is not SyncType.ADD:
+                        # Not parsed yet, the file is read from disk (if it still exists) when first requested
+                        if sync_type is SyncType.DELETE:
+                            del self.lazy_files[relative_path]
+                            self.module_resolution_cache.clear()
+                        continue
+                    del self.lazy_files[relative_path]
                 if self.get_file(filepath) is None:
                     if sync_type is SyncType.DELETE:
                         # SourceFile is already deleted, nothing to do here
@@ -296,7 +501,17 @@ class CodebaseContext:
 
                 by_sync_type[sync_type].append(filepath)
         self.generation += 1
-        self._process_diff_files(by_sync_type)
+        with self.metrics.phase("apply_diffs"):
+            self._process_diff_files(by_sync_type)
+        self._write_metrics()
+
+    def _write_metrics(self) -> None:
+        """Writes the collected metrics to `metrics_path`, if configured"""
+        if self.config.metrics_path is not None:
+            try:
+                self.metrics.write(self.config.metrics_path)
+            except OSError as e:
+                logger.warning(f"Failed to write metrics to {self.config.metrics_path}: {e}")
 
     def _reset_files(self, syncs: list[DiffLite]) -> None:
         files_to_write = []
@@ -330,6 +545,18 @@ class CodebaseContext:
         self.io.save_files(to_save)
 
     @stopwatch
+    def start_file_watcher(self, debounce_ms: int = DEFAULT_DEBOUNCE_MS) -> FileWatcher:
+        """Starts applying file system changes to the graph in the background. See FileWatcher"""
+        if self.file_watcher is None:
+            self.file_watcher = FileWatcher(self, debounce_ms=debounce_ms)
+        self.file_watcher.start()
+        return self.file_watcher
+
+    def stop_file_watcher(self) -> None:
+        if self.file_watcher is not None:
+            self.file_watcher.stop()
+            self.file_watcher = None
+
     def reset_codebase(self) -> None:
         self._reset_files(self.all_syncs + self.pending_syncs + self.unapplied_diffs)
         self.unapplied_diffs.clear()
@@ -369,22 +596,33 @@ class CodebaseContext:
     @stopwatch
     def prune_graph(self) -> None:
         # ====== [ Remove orphaned external modules ] ======
-        external_modules = self.get_nodes(NodeType.EXTERNAL)
+        # Only looks at parsed files, so a lazy graph stays lazy
+        external_modules = [self.get_node(node_id) for node_id in self._get_node_type_view(NodeType.EXTERNAL)]
         for module in external_modules:
             if not any(self.predecessors(module.node_id)):
                 self.remove_node(module.node_id)
                 self._ext_module_idx.pop(module._idx_key, None)
 
-    def build_directory_tree(self) -> None:
-        """Builds the directory tree for the codebase"""
+    def build_directory_tree(self, filepaths: Iterable[str] | None = None) -> None:
+        """Builds the directory tree for the codebase
+
+        Args:
+            filepaths: Relative paths of every file in the codebase, if they were already listed. Otherwise the repo is
+                listed again.
+        """
         # Reset and rebuild the directory tree
         self.directories = dict()
 
-        for file_path, _ in self.projects[0].repo_operator.iter_files(
-            subdirs=self.projects[0].subdirectories,
-            ignore_list=GLOBAL_FILE_IGNORE_LIST,
-            skip_content=True,
-        ):
+        if filepaths is None:
+            filepaths = (
+                file_path
+                for file_path, _ in self.projects[0].repo_operator.iter_files(
+                    subdirs=self.projects[0].subdirectories,
+                    ignore_list=GLOBAL_FILE_IGNORE_LIST,
+                    skip_content=True,
+                )
+            )
+        for file_path in filepaths:
             file_path = Path(file_path)
             directory = self.get_directory(file_path.parent, create_on_missing=True)
             directory._add_file(file_path.name)
@@ -430,12 +668,7 @@ class CodebaseContext:
             return directory
         return None
 
-    def _process_diff_files(self, files_to_sync: Mapping[SyncType, list[Path]], incremental: bool = True) -> None:
-        # If all the files are empty, don't uncache
-        assert self._computing is False
-        skip_uncache = incremental and ((len(files_to_sync[SyncType.DELETE]) + len(files_to_sync[SyncType.REPARSE])) == 0)
-        if not skip_uncache:
-            uncache_all()
+    def _start_language_services(self) -> None:
         # Step 0: Start the dependency manager and language engine if they exist
         # Start the dependency manager. This may or may not run asynchronously, depending on the implementation
         if self.dependency_manager is not None:
@@ -461,6 +694,31 @@ class CodebaseContext:
         if self.language_engine is not None:
             self.language_engine.wait_until_ready(ignore_error=self.config.ignore_process_errors)
 
+    def _process_diff_files(self, files_to_sync: Mapping[SyncType, list[Path]], incremental: bool = True, filepaths: list[str] | None = None, lazy_load: bool = False) -> None:
+        # Listed files are not parsed on lookup while syncing (exp_lazy_graph), see _parse_lazy_imports
+        self._syncing = True
+        try:
+            self._sync_files(files_to_sync, incremental, filepaths, lazy_load)
+        finally:
+            self._syncing = False
+            self._lazy_requests.clear()
+
+    def _sync_files(self, files_to_sync: Mapping[SyncType, list[Path]], incremental: bool, filepaths: list[str] | None, lazy_load: bool) -> None:
+        # If all the files are empty, don't uncache
+        assert self._computing is False
+        skip_uncache = incremental and ((len(files_to_sync[SyncType.DELETE]) + len(files_to_sync[SyncType.REPARSE])) == 0)
+        # On incremental syncs, only cached values of the synced files and the files that import from them are dropped
+        uncache_scope: set[NodeId] | None = None
+        if not skip_uncache:
+            if incremental:
+                changed_files = [file for file_path in files_to_sync[SyncType.DELETE] + files_to_sync[SyncType.REPARSE] if (file := self.get_file(file_path)) is not None]
+                uncache_scope = self._get_uncache_scope(changed_files)
+                uncache_files(uncache_scope)
+            else:
+                uncache_all()
+        # Step 0 & 1: Start the dependency manager and language engine and wait for them before graph construction
+        self._start_language_services()
+
         # ====== [ Refresh the graph] ========
         # Step 2: For any files that no longer exist, remove them during the sync
         add_to_remove = []
@@ -482,44 +740,34 @@ class CodebaseContext:
                 else:
                     logger.warning(f"SYNC: SourceFile {file_path} does not exist and also not found on graph!")
 
-        # Step 3: Remove files to delete from graph
-        to_resolve = []
-        for file_path in files_to_sync[SyncType.DELETE]:
-            file = self.get_file(file_path)
-            file.remove_internal_edges()
-            to_resolve.extend(file.unparse())
-        to_resolve = list(filter(lambda node: self.has_node(node.node_id) and node is not None, to_resolve))
-        for file_path in files_to_sync[SyncType.REPARSE]:
-            file = self.get_file(file_path)
-            file.remove_internal_edges()
-
-        task = self.progress.begin("Reparsing updated files", count=len(files_to_sync[SyncType.REPARSE]))
-        files_to_resolve = []
-        # Step 4: Reparse updated files
-        for idx, file_path in enumerate(files_to_sync[SyncType.REPARSE]):
-            task.update(f"Reparsing {self.to_relative(file_path)}", count=idx)
-            file = self.get_file(file_path)
-            to_resolve.extend(file.unparse(reparse=True))
+        with self.metrics.phase("parse"):
+            # Step 3: Remove files to delete from graph
+            to_resolve = []
+            for file_path in files_to_sync[SyncType.DELETE]:
+                file = self.get_file(file_path)
+                file.remove_internal_edges()
+                to_resolve.extend(file.unparse())
             to_resolve = list(filter(lambda node: self.has_node(node.node_id) and node is not None, to_resolve))
-            file.sync_with_file_content()
-            files_to_resolve.append(file)
-        task.end()
-        # Step 5: Add new files as nodes to graph (does not yet add edges)
-        task = self.progress.begin("Adding new files", count=len(files_to_sync[SyncType.ADD]))
-        for idx, filepath in enumerate(files_to_sync[SyncType.ADD]):
-            task.update(f"Adding {self.to_relative(filepath)}", count=idx)
-            try:
-                content = self.io.read_text(filepath)
-            except UnicodeDecodeError as e:
-                logger.warning(f"Can't read file at:{filepath} since it contains non-unicode characters. File will be ignored!")
-                continue
-            # TODO: this is wrong with context changes
-            if filepath.suffix in self.extensions:
-                file_cls = self.node_classes.file_cls
-                new_file = file_cls.from_content(filepath, content, self, sync=False, verify_syntax=False)
-                if new_file is not None:
-                    files_to_resolve.append(new_file)
-        task.end()
+            for file_path in files_to_sync[SyncType.REPARSE]:
+                file = self.get_file(file_path)
+                file.remove_internal_edges()
+
+            task = self.progress.begin("Reparsing updated files", count=len(files_to_sync[SyncType.REPARSE]))
+            files_to_resolve = []
+            # Step 4: Reparse updated files
+            for idx, file_path in enumerate(files_to_sync[SyncType.REPARSE]):
+                task.update(f"Reparsing {self.to_relative(file_path)}", count=idx)
+                file = self.get_file(file_path)
+                to_resolve.extend(file.unparse(reparse=True))
+                to_resolve = list(filter(lambda node: self.has_node(node.node_id) and node is not None, to_resolve))
+                file.sync_with_file_content()
+                files_to_resolve.append(file)
+            task.end()
+            # Step 5: Add new files as nodes to graph (does not yet add edges)
+            files_to_resolve.extend(self._add_files(files_to_sync[SyncType.ADD]))
+            # Step 5.5: Parse the not yet parsed files that the imports of the synced files point at (exp_lazy_graph)
+            if self.lazy_files:
+                files_to_resolve.extend(self._parse_lazy_imports(files_to_resolve))
         for file in files_to_resolve:
             to_resolve.append(file)
             to_resolve.extend(file.get_nodes())
@@ -527,16 +775,22 @@ class CodebaseContext:
         to_resolve = list(filter(lambda node: self.has_node(node.node_id) and node is not None, to_resolve))
         counter = Counter(node.node_type for node in to_resolve)
 
-        # Step 6: Build directory tree
-        logger.info("> Building directory tree")
-        self.build_directory_tree()
+        # Step 6: Build directory tree. Lazily parsed files were already in the tree when they were listed
+        if not lazy_load:
+            with self.metrics.phase("directory_tree"):
+                logger.info("> Building directory tree")
+                self.build_directory_tree(filepaths)
 
         # Step 7: Build configs
-        if self.config_parser is not None:
-            self.config_parser.parse_configs()
+        with self.metrics.phase("config_parse"):
+            if self.config_parser is not None:
+                self.config_parser.parse_configs()
 
         # Step 8: Add internal import resolution edges for new and updated files
-        if not skip_uncache:
+        if uncache_scope is not None:
+            uncache_scope.update(file.node_id for file in files_to_resolve)
+            uncache_files(uncache_scope)
+        elif not skip_uncache:
             uncache_all()
 
         if self.config.disable_graph:
@@ -545,41 +799,146 @@ class CodebaseContext:
         else:
             self._computing = True
             try:
-                logger.info(f"> Computing import resolution edges for {counter[NodeType.IMPORT]} imports")
-                task = self.progress.begin("Resolving imports", count=counter[NodeType.IMPORT])
-                for node in to_resolve:
-                    if node.node_type == NodeType.IMPORT:
-                        task.update(f"Resolving imports in {node.filepath}", count=idx)
-                        node._remove_internal_edges(EdgeType.IMPORT_SYMBOL_RESOLUTION)
-                        node.add_symbol_resolution_edge()
-                        to_resolve.extend(node.symbol_usages)
-                task.end()
-                if counter[NodeType.EXPORT] > 0:
-                    logger.info(f"> Computing export dependencies for {counter[NodeType.EXPORT]} exports")
-                    task = self.progress.begin("Computing export dependencies", count=counter[NodeType.EXPORT])
-                    for node in to_resolve:
-                        if node.node_type == NodeType.EXPORT:
-                            task.update(f"Computing export dependencies for {node.filepath}", count=idx)
-                            node._remove_internal_edges(EdgeType.EXPORT)
-                            node.compute_export_dependencies()
+                with self.metrics.phase("import_resolution"):
+                    logger.info(f"> Computing import resolution edges for {counter[NodeType.IMPORT]} imports")
+                    task = self.progress.begin("Resolving imports", count=counter[NodeType.IMPORT])
+                    for idx, node in enumerate(to_resolve):
+                        if node.node_type == NodeType.IMPORT:
+                            task.update(f"Resolving imports in {node.filepath}", count=idx)
+                            node._remove_internal_edges(EdgeType.IMPORT_SYMBOL_RESOLUTION)
+                            node.add_symbol_resolution_edge()
                             to_resolve.extend(node.symbol_usages)
                     task.end()
+                if counter[NodeType.EXPORT] > 0:
+                    with self.metrics.phase("export_dependencies"):
+                        logger.info(f"> Computing export dependencies for {counter[NodeType.EXPORT]} exports")
+                        task = self.progress.begin("Computing export dependencies", count=counter[NodeType.EXPORT])
+                        for idx, node in enumerate(to_resolve):
+                            if node.node_type == NodeType.EXPORT:
+                                task.update(f"Computing export dependencies for {node.filepath}", count=idx)
+                                node._remove_internal_edges(EdgeType.EXPORT)
+                                node.compute_export_dependencies()
+                                to_resolve.extend(node.symbol_usages)
+                        task.end()
                 if counter[NodeType.SYMBOL] > 0:
                     from codegen.sdk.core.interfaces.inherits import Inherits
 
-                    logger.info("> Computing superclass dependencies")
-                    task = self.progress.begin("Computing superclass dependencies", count=counter[NodeType.SYMBOL])
-                    for symbol in to_resolve:
-                        if isinstance(symbol, Inherits):
-                            task.update(f"Computing superclass dependencies for {symbol.filepath}", count=idx)
-                            symbol._remove_internal_edges(EdgeType.SUBCLASS)
-                            symbol.compute_superclass_dependencies()
-                    task.end()
-                if not skip_uncache:
+                    with self.metrics.phase("superclass_dependencies"):
+                        logger.info("> Computing superclass dependencies")
+                        task = self.progress.begin("Computing superclass dependencies", count=counter[NodeType.SYMBOL])
+                        for idx, symbol in enumerate(to_resolve):
+                            if isinstance(symbol, Inherits):
+                                task.update(f"Computing superclass dependencies for {symbol.filepath}", count=idx)
+                                symbol._remove_internal_edges(EdgeType.SUBCLASS)
+                                symbol.compute_superclass_dependencies()
+                        task.end()
+                if uncache_scope is not None:
+                    # Dependencies are recomputed for every node in to_resolve, which now includes usages in other files
+                    uncache_scope.update(node.file_node_id for node in to_resolve)
+                    uncache_files(uncache_scope)
+                elif not skip_uncache:
                     uncache_all()
-                self._compute_dependencies(to_resolve, incremental)
+                with self.metrics.phase("compute_dependencies"):
+                    self._compute_dependencies(to_resolve, incremental)
             finally:
                 self._computing = False
+        if uncache_scope is not None and self.config.verify_cache_invalidation:
+            self._verify_cache_invalidation()
+
+    def _add_files(self, filepaths: list[Path]) -> list[SourceFile]:
+        """Adds the given files as nodes to the graph, without any of their edges"""
+        new_files = []
+        task = self.progress.begin("Adding new files", count=len(filepaths))
+        for idx, (filepath, content, ts_tree) in enumerate(self._read_and_parse_files(filepaths)):
+            task.update(f"Adding {self.to_relative(filepath)}", count=idx)
+            if content is None:
+                continue
+            # TODO: this is wrong with context changes
+            if filepath.suffix in self.extensions:
+                file_cls = self.node_classes.file_cls
+                new_file = file_cls.from_content(filepath, content, self, sync=False, verify_syntax=False, ts_tree=ts_tree)
+                if new_file is not None:
+                    new_files.append(new_file)
+        task.end()
+        return new_files
+
+    def _parse_lazy_imports(self, files: list[SourceFile]) -> list[SourceFile]:
+        """Parses the listed files that the imports of `files` point at, then the files their imports point at, and so on.
+
+        The imports are resolved once up front to find out which files they point at (get_file records the listed files
+        looked up while syncing), and then for real along with the rest of the sync. This keeps the set of parsed files
+        closed under imports, so files that were parsed earlier never need to be re-resolved.
+        """
+        probed = set()
+        parsed = []
+        while files:
+            if self.config_parser is not None:
+                self.config_parser.parse_configs()
+            self._lazy_requests.clear()
+            for file in files:
+                probed.add(file.node_id)
+                for imp in file.imports:
+                    imp.resolve_import()
+            files = self._add_files([self.lazy_files.pop(filepath) for filepath in sorted(self._lazy_requests) if filepath in self.lazy_files])
+            parsed.extend(files)
+        self._lazy_requests.clear()
+        # Drop anything cached while probing, as it may have been computed before the files it depends on were parsed
+        uncache_files(probed)
+        if parsed:
+            logger.info(f"> Parsed {len(parsed)} files imported by the synced files")
+        return parsed
+
+    def _get_uncache_scope(self, files: Iterable[SourceFile]) -> set[NodeId]:
+        """Node ids of the given files and of every file that imports from them, directly or through re-exports"""
+        scope = set()
+        stack = []
+        for file in files:
+            scope.add(file.node_id)
+            stack.append(file.node_id)
+            stack.extend(node.node_id for node in file.get_nodes(sort=False))
+        seen = set(stack)
+        while stack:
+            for importer_id, _, edge in self._graph.in_edges(stack.pop()):
+                if edge.type in (EdgeType.IMPORT_SYMBOL_RESOLUTION, EdgeType.EXPORT) and importer_id not in seen:
+                    seen.add(importer_id)
+                    stack.append(importer_id)
+                    scope.add(self.get_node(importer_id).file_node_id)
+        return scope
+
+    def _verify_cache_invalidation(self) -> None:
+        """Checks that the scoped cache invalidation of the last sync left no stale values behind (verify_cache_invalidation)"""
+        if stale := verify_uncache():
+            details = "\n".join(f"{type(instance).__name__}.{name} in {getattr(instance, 'filepath', None)}" for instance, name in stale[:50])
+            log_or_throw(f"Scoped cache invalidation left {len(stale)} stale cached values behind", details)
+
+    def _read_and_parse_files(self, filepaths: list[Path]) -> Iterator[tuple[Path, str | None, TSTree | None]]:
+        """Reads (and with `parse_workers > 1`, tree-sitter parses) the given files.
+
+        Results are always yielded in the order of `filepaths`, so files are added to the graph (and get their node ids)
+        in the same order regardless of how the workers are scheduled. Content is None for files that could not be
+        decoded, the tree is None when the file is parsed on the main thread instead.
+        """
+
+        def read(filepath: Path) -> tuple[Path, str | None, TSTree | None]:
+            try:
+                return filepath, self.io.read_text(filepath), None
+            except UnicodeDecodeError:
+                logger.warning(f"Can't read file at:{filepath} since it contains non-unicode characters. File will be ignored!")
+                return filepath, None, None
+
+        def read_and_parse(filepath: Path) -> tuple[Path, str | None, TSTree | None]:
+            filepath, content, _ = read(filepath)
+            if content is None or filepath.suffix not in self.extensions or is_minified_js(content):
+                return filepath, content, None
+            return filepath, content, parse_tree(filepath, content, thread_local=True)
+
+        if self.config.parse_workers <= 1 or len(filepaths) <= 1:
+            yield from map(read, filepaths)
+            return
+        # Editable wrappers hold references to the context and the graph, so only reading and tree-sitter parsing
+        # happen on the workers. Symbol extraction and node creation stay on this thread.
+        with ThreadPoolExecutor(max_workers=self.config.parse_workers) as executor:
+            yield from executor.map(read_and_parse, filepaths)
 
     def _compute_dependencies(self, to_update: list[Importable], incremental: bool):
         seen = set()
@@ -614,15 +973,60 @@ class CodebaseContext:
         if node_type is not None and exclude_type is not None:
             msg = "node_type and exclude_type cannot both be specified"
             raise ValueError(msg)
+        self._load_all_lazy_files()
         if node_type is not None:
-            return [self.get_node(node_id) for node_id in self._graph.filter_nodes(lambda node: node.node_type == node_type)]
+            graph = self._graph  # Builds the graph first if it is computed lazily
+            return [graph.get_node_data(node_id) for node_id in self._get_node_type_view(node_type)]
         if exclude_type is not None:
-            return [self.get_node(node_id) for node_id in self._graph.filter_nodes(lambda node: node.node_type != node_type)]
+            graph = self._graph
+            node_ids = sorted(node_id for node_type, node_ids in self._node_type_idx.items() if node_type != exclude_type for node_id in node_ids)
+            return [graph.get_node_data(node_id) for node_id in node_ids]
         return self._graph.nodes()
 
+    def _get_node_type_view(self, node_type: NodeType) -> list[NodeId]:
+        """Node ids of the given type in ascending order (the order filter_nodes used to return them in)"""
+        if (view := self._node_type_views.get(node_type)) is None:
+            view = self._node_type_views[node_type] = sorted(self._node_type_idx[node_type])
+        return view
+
+    def _index_node_type(self, node_id: NodeId, node_type: NodeType) -> None:
+        self._node_type_idx[node_type].add(node_id)
+        self._node_type_views.pop(node_type, None)
+
     def get_edges(self) -> list[tuple[NodeId, NodeId, EdgeType, Usage | None]]:
+        self._load_all_lazy_files()
         return [(x[0], x[1], x[2].type, x[2].usage) for x in self._graph.weighted_edge_list()]
 
+    def index_filepath(self, filepath: str, node_id: NodeId) -> None:
+        if filepath not in self.filepath_idx:
+            self.module_resolution_cache.clear()
+            if self.codeowners_index is not None:
+                self.codeowners_index.add_path(filepath)
+        self.filepath_idx[filepath] = node_id
+
+    def unindex_filepath(self, filepath: str) -> None:
+        if (node_id := self.filepath_idx.pop(filepath, None)) is not None:
+            self.module_resolution_cache.clear()
+            if self.residency is not None:
+                self.residency.discard(node_id)
+            if self.codeowners_index is not None:
+                self.codeowners_index.remove_path(filepath)
+
+    def _evict_file(self, file_node_id: NodeId) -> int:
+        """Drops the cached state of a file that has not been used recently (max_resident_files).
+
+        The cached properties of everything in the file and the derived views of its range index are recomputed on the
+        next use. Its nodes and edges stay in the graph.
+        """
+        released = evict_files([file_node_id])
+        if self.has_node(file_node_id):
+            self.get_node(file_node_id)._range_index.uncache()
+        return released
+
+    def has_filepath(self, filepath: str) -> bool:
+        """Whether there is a (parsed or lazily loaded) source file at the relative path, without touching the disk"""
+        return filepath in self.filepath_idx or filepath in self.lazy_files
+
     def get_file(self, file_path: os.PathLike, ignore_case: bool = False) -> SourceFile | None:
         # If not part of repo path, return None
         absolute_path = self.to_absolute(file_path)
@@ -630,8 +1034,18 @@ class CodebaseContext:
             assert False, f"File {file_path} is not part of the repository path"
 
         # Check if file exists in graph
-        node_id = self.filepath_idx.get(str(self.to_relative(file_path)), None)
+        relative_path = str(self.to_relative(file_path))
+        node_id = self.filepath_idx.get(relative_path, None)
+        if node_id is None and relative_path in self.lazy_files:
+            if self._syncing:
+                # Parsed along with the files being synced instead, see _parse_lazy_imports
+                self._lazy_requests.add(relative_path)
+                return None
+            self.load_lazy_files([relative_path])
+            node_id = self.filepath_idx.get(relative_path, None)
         if node_id is not None:
+            if self.residency is not None:
+                self.residency.touch(node_id)
             return self.get_node(node_id)
         if ignore_case:
             # Using `get_directory` so that the case insensitive lookup works
@@ -661,7 +1075,9 @@ class CodebaseContext:
                 raise Exception(msg)
         if self.config.debug and self._computing and node.node_type != NodeType.EXTERNAL:
             assert False, f"Adding node during compute dependencies: {node!r}"
-        return self._graph.add_node(node)
+        node_id = self._graph.add_node(node)
+        self._index_node_type(node_id, node.node_type)
+        return node_id
 
     def add_child(self, parent: NodeId, node: Importable, type: EdgeType, usage: Usage | None = None) -> int:
         if self.config.debug:
@@ -670,7 +1086,9 @@ class CodebaseContext:
                 raise Exception(msg)
         if self.config.debug and self._computing and node.node_type != NodeType.EXTERNAL:
             assert False, f"Adding node during compute dependencies: {node!r}"
-        return self._graph.add_child(parent, node, Edge(type, usage))
+        node_id = self._graph.add_child(parent, node, Edge(type, usage))
+        self._index_node_type(node_id, node.node_type)
+        return node_id
 
     def has_node(self, node_id: NodeId):
         return isinstance(node_id, int) and self._graph.has_node(node_id)
@@ -696,10 +1114,12 @@ class CodebaseContext:
 
     @property
     def nodes(self):
+        self._load_all_lazy_files()
         return self._graph.nodes()
 
     @property
     def edges(self) -> WeightedEdgeList[Edge]:
+        self._load_all_lazy_files()
         return self._graph.weighted_edge_list()
 
     def predecessor(self, n: NodeId, *, edge_type: EdgeType | None) -> Importable:
@@ -729,8 +1149,36 @@ class CodebaseContext:
         return self._graph.out_edges(n)
 
     def remove_node(self, n: NodeId):
+        if (key := self._symbol_idx_keys.pop(n, None)) is not None:
+            name, symbol_type = key
+            by_type = self._symbol_idx[name]
+            by_type[symbol_type].discard(n)
+            if not by_type[symbol_type]:
+                del by_type[symbol_type]
+                if not by_type:
+                    del self._symbol_idx[name]
+        if self._graph.has_node(n):
+            node_type = self._graph.get_node_data(n).node_type
+            self._node_type_idx[node_type].discard(n)
+            self._node_type_views.pop(node_type, None)
         return self._graph.remove_node(n)
 
+    def index_symbol(self, symbol: Symbol) -> None:
+        """Adds a top-level symbol to the name index. Called once the symbol's name has been parsed."""
+        self._symbol_idx.setdefault(symbol.name, {}).setdefault(symbol.symbol_type, set()).add(symbol.node_id)
+        self._symbol_idx_keys[symbol.node_id] = (symbol.name, symbol.symbol_type)
+
+    def get_symbols_by_name(self, name: str, symbol_type: SymbolType | None = None) -> list[Symbol]:
+        """Returns the top-level symbols with the given name (and symbol type, if given), unsorted"""
+        graph = self._graph  # Builds the graph first if it is computed lazily
+        self.load_lazy_files_referencing(name)
+        by_type = self._symbol_idx.get(name)
+        if not by_type:
+            return []
+        if symbol_type is not None:
+            return [graph.get_node_data(node_id) for node_id in by_type.get(symbol_type, ())]
+        return [graph.get_node_data(node_id) for node_ids in by_type.values() for node_id in node_ids]
+
     def remove_edge(self, u: NodeId, v: NodeId, *, edge_type: EdgeType | None = None):
         for edge in self._graph.edge_indices_from_endpoints(u, v):
             if edge_type is not None:
@@ -793,6 +1241,16 @@ class CodebaseContext:
         self.apply_diffs([sync])
         self.transaction_manager.check_limits()
 
+    @property
+    def read_only(self) -> bool:
+        return self.transaction_manager.read_only
+
+    @read_only.setter
+    def read_only(self, read_only: bool) -> None:
+        self.transaction_manager.read_only = read_only
+        if not read_only:
+            self.read_only_contents.clear()
+
     @contextmanager
     def session(self, sync_graph: bool = True, commit: bool = True, session_options: SessionOptions = SessionOptions()) -> Generator[None, None, None]:
         self.session_options = session_options
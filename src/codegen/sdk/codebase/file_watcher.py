@@ -0,0 +1,93 @@
+import os
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from watchfiles import Change, DefaultFilter, watch
+
+from codegen.sdk.codebase.diff_lite import ChangeType, DiffLite
+from codegen.shared.logging.get_logger import get_logger
+
+if TYPE_CHECKING:
+    from codegen.sdk.codebase.codebase_context import CodebaseContext
+
+logger = get_logger(__name__)
+
+# How long the file system has to stay quiet before a batch of changes is applied
+DEFAULT_DEBOUNCE_MS = 200
+
+
+class FileWatcher:
+    """Background thread that keeps the graph of a CodebaseContext in sync with the file system.
+
+    File system events are batched and debounced by `watchfiles`, converted to DiffLites and applied with `apply_diffs`.
+    Anything that reads the graph while the watcher is running should hold `lock`, which the watcher holds while it
+    applies changes, so changes are only ever applied between uses of the graph.
+    """
+
+    ctx: "CodebaseContext"
+    debounce_ms: int
+    lock: threading.RLock
+
+    def __init__(self, ctx: "CodebaseContext", debounce_ms: int = DEFAULT_DEBOUNCE_MS) -> None:
+        self.ctx = ctx
+        self.debounce_ms = debounce_ms
+        self.lock = threading.RLock()
+        self._pending: dict[str, DiffLite] = {}
+        self._pending_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._default_filter = DefaultFilter()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="codebase-file-watcher", daemon=True)
+        self._thread.start()
+        logger.info(f"Watching {self.ctx.repo_path} for changes")
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _filter(self, change: Change, path: str) -> bool:
+        return any(path.endswith(e) for e in self.ctx.extensions) and self._default_filter(change, path)
+
+    def _run(self) -> None:
+        for changes in watch(self.ctx.repo_path, watch_filter=self._filter, debounce=self.debounce_ms, stop_event=self._stop_event):
+            self.add_changes(changes)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Failed to apply file system changes to the graph")
+
+    def add_changes(self, changes: set[tuple[Change, str]]) -> None:
+        """Queues a batch of file system events, keeping a single diff per file"""
+        with self._pending_lock:
+            for change, path in changes:
+                diff = DiffLite.from_watch_change(change, path)
+                # Events within a batch are unordered (e.g. an editor deleting and re-creating a file on save), so trust
+                # the file system for whether the file still exists. apply_diffs turns modifications of files that
+                # aren't in the graph into additions.
+                if not os.path.exists(path):
+                    diff = DiffLite(ChangeType.Removed, Path(path))
+                elif diff.change_type == ChangeType.Removed or (path in self._pending and diff.change_type == ChangeType.Added):
+                    diff = DiffLite(ChangeType.Modified, Path(path))
+                self._pending[path] = diff
+
+    def flush(self) -> None:
+        """Applies every queued change to the graph"""
+        with self.lock:
+            with self._pending_lock:
+                diffs = list(self._pending.values())
+                self._pending.clear()
+            if diffs:
+                logger.info(f"Applying {len(diffs)} file system changes to the graph")
+                self.ctx.apply_diffs(diffs)
@@ -21,8 +21,10 @@ class CodeownerGrouper(BaseGrouper):
     def create_all_groups(flags: list[CodeFlag], repo_operator: RepoOperator | None = None) -> list[Group]:
         owner_to_group: dict[str, Group] = {}
         no_owner_group = Group(group_by=GroupBy.CODEOWNER, segment="@no-owner", flags=[])
+        # Resolves each directory and file once, no matter how many flags are in it
+        codeowners_index = repo_operator.codeowners_index  # TODO: handle codeowners_index could be null
         for idx, flag in enumerate(flags):
-            flag_owners = repo_operator.codeowners_parser.of(flag.filepath)  # TODO: handle codeowners_parser could be null
+            flag_owners = codeowners_index.of(flag.filepath)
             if not flag_owners:
                 no_owner_group.flags.append(flag)
                 continue
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+from dataclasses import dataclass, field
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from codegen.sdk.codebase.diff_lite import ChangeType, DiffLite
+from codegen.sdk.enums import Edge, EdgeType, NodeType
+from codegen.sdk.tree_sitter_parser import parse_tree
+from codegen.shared.logging.get_logger import get_logger
+from codegen.shared.performance.stopwatch_utils import stopwatch
+
+if TYPE_CHECKING:
+    from codegen.git.repo_operator.repo_operator import RepoOperator
+    from codegen.sdk.codebase.codebase_context import CodebaseContext
+    from codegen.sdk.core.dataclasses.usage import Usage
+    from codegen.sdk.core.interfaces.editable import Editable
+    from codegen.sdk.core.node_id_factory import NodeId
+
+logger = get_logger(__name__)
+
+# Bump whenever the layout of the snapshot or the way the graph is built changes
+SNAPSHOT_VERSION = 1
+# How many commits to walk back from HEAD when looking for a snapshot to restore from
+SNAPSHOT_MAX_DEPTH = 50
+
+# (filepath, class name, start byte, end byte)
+NodeKey = tuple[str, str, int, int]
+# ((file node id, start byte, end byte, kind id), usage symbol id, imported by id, usage type, usage kind)
+UsageRecord = tuple[tuple[int, int, int, int], int, int | None, int | None, int]
+
+
+class SnapshotMismatchError(Exception):
+    """Raised when the graph rebuilt from a snapshot does not line up with the snapshot"""
+
+
+def _codegen_version() -> str:
+    try:
+        return version("codegen")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def get_snapshot_key(ctx: CodebaseContext) -> str:
+    """Hash of everything (other than the commit) that affects the shape of the graph"""
+    project = ctx.projects[0]
+    config = ctx.config.model_dump_json(exclude={"graph_snapshot_dir"})
+    key = f"{SNAPSHOT_VERSION}:{_codegen_version()}:{ctx.programming_language}:{project.base_path}:{project.subdirectories}:{config}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+
+def get_snapshot_path(snapshot_dir: str | os.PathLike, commit: str, key: str) -> Path:
+    return Path(snapshot_dir) / f"{commit}-{key}.pickle"
+
+
+def find_snapshot(ctx: CodebaseContext, repo_operator: RepoOperator) -> Path | None:
+    """Finds the snapshot of the closest ancestor of HEAD (including HEAD itself) built with the same config"""
+    head = repo_operator.head_commit
+    if head is None:
+        return None
+    key = get_snapshot_key(ctx)
+    for commit in repo_operator.git_cli.iter_commits(head.hexsha, max_count=SNAPSHOT_MAX_DEPTH):
+        path = get_snapshot_path(ctx.config.graph_snapshot_dir, commit.hexsha, key)
+        if path.exists():
+            return path
+    return None
+
+
+def _node_key(node: Editable) -> NodeKey:
+    return node.filepath, type(node).__name__, node.ts_node.start_byte, node.ts_node.end_byte
+
+
+def _get_dirty_files(repo_operator: RepoOperator, commit: str) -> list[str]:
+    """Files whose working tree content differs from the given commit, including untracked ones"""
+    git = repo_operator.git_cli.git
+    changed = git.diff(commit, "--name-only", "-z").split("\0")
+    untracked = git.ls_files("-o", "--exclude-standard", "-z").split("\0")
+    return [path for path in changed + untracked if path]
+
+
+@dataclass
+class GraphSnapshot:
+    """Versioned on-disk copy of the parsed state of a CodebaseContext.
+
+    tree-sitter trees can't be serialized, so the snapshot stores the source the graph was built from. Restoring re-parses
+    that source (which recreates the same nodes), and then re-adds the external modules and every edge (with its Usage)
+    directly from the snapshot, skipping import resolution and dependency computation entirely.
+    """
+
+    commit: str
+    key: str
+    dirty_files: list[str] = field(default_factory=list)
+    # Source of every parsed file, in the order the files were added to the graph
+    files: list[tuple[str, bytes]] = field(default_factory=list)
+    directory_files: list[str] = field(default_factory=list)
+    nodes: list[tuple[NodeId, NodeKey]] = field(default_factory=list)
+    # (external module node id, node id of the import it was created from)
+    external_modules: list[tuple[NodeId, NodeId]] = field(default_factory=list)
+    edges: list[tuple[NodeId, NodeId, EdgeType, UsageRecord | None]] = field(default_factory=list)
+    version: int = SNAPSHOT_VERSION
+
+    @classmethod
+    @stopwatch
+    def from_context(cls, ctx: CodebaseContext, repo_operator: RepoOperator) -> GraphSnapshot:
+        commit = repo_operator.head_commit.hexsha
+        snapshot = cls(commit=commit, key=get_snapshot_key(ctx), dirty_files=_get_dirty_files(repo_operator, commit))
+        for node_id in sorted(ctx._graph.node_indices()):
+            node = ctx.get_node(node_id)
+            if node.node_type == NodeType.EXTERNAL:
+                imp = node._import
+                if imp is None or not ctx.has_node(imp.node_id):
+                    imp = next((pred for pred in ctx.predecessors(node_id) if pred.node_type == NodeType.IMPORT), None)
+                if imp is None:
+                    msg = f"Can't find the import external module {node!r} was created from"
+                    raise SnapshotMismatchError(msg)
+                snapshot.external_modules.append((node_id, imp.node_id))
+                continue
+            if node.node_type == NodeType.FILE:
+                snapshot.files.append((node.file_path, node.content_bytes))
+            snapshot.nodes.append((node_id, _node_key(node)))
+        for directory in ctx.directories.values():
+            snapshot.directory_files.extend(os.path.join(directory.dirpath, name) for name in directory.file_names)
+        for u, v, edge in ctx._graph.weighted_edge_list():
+            snapshot.edges.append((u, v, edge.type, None if edge.usage is None else cls._dump_usage(edge.usage)))
+        return snapshot
+
+    @staticmethod
+    def _dump_usage(usage: Usage) -> UsageRecord:
+        match = usage.match.ts_node
+        return (
+            (usage.match.file_node_id, match.start_byte, match.end_byte, match.kind_id),
+            usage.usage_symbol.node_id,
+            usage.imported_by.node_id if usage.imported_by is not None else None,
+            None if usage.usage_type is None else int(usage.usage_type),
+            int(usage.kind),
+        )
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> GraphSnapshot | None:
+        try:
+            with open(path, "rb") as f:
+                snapshot = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Failed to load graph snapshot {path}: {e}")
+            return None
+        if not isinstance(snapshot, cls) or snapshot.version != SNAPSHOT_VERSION:
+            logger.warning(f"Ignoring graph snapshot {path} with an incompatible version")
+            return None
+        return snapshot
+
+    @stopwatch
+    def restore(self, ctx: CodebaseContext) -> None:
+        """Rebuilds the graph of an empty context from the snapshot.
+
+        Raises SnapshotMismatchError if the rebuilt nodes don't line up with the snapshot, in which case the graph is left
+        partially built and must be cleared by the caller.
+        """
+        from codegen.sdk.core.external_module import ExternalModule
+
+        file_cls = ctx.node_classes.file_cls
+        for filepath, content in self.files:
+            path = ctx.to_absolute(filepath)
+            # Bypass from_content, which would write files that were since deleted back to disk
+            ts_tree = parse_tree(path, content)
+            file_cls(ts_tree.root_node, path, ctx, ts_tree=ts_tree)
+
+        for filepath in self.directory_files:
+            file_path = Path(filepath)
+            ctx.get_directory(file_path.parent, create_on_missing=True)._add_file(file_path.name)
+
+        if ctx.config_parser is not None:
+            ctx.config_parser.parse_configs()
+
+        # =====[ Map snapshot node ids onto the rebuilt nodes ]=====
+        by_key: dict[NodeKey, list[NodeId]] = {}
+        for node_id in sorted(ctx._graph.node_indices(), reverse=True):
+            by_key.setdefault(_node_key(ctx.get_node(node_id)), []).append(node_id)
+        node_map: dict[NodeId, NodeId] = {}
+        for old_id, key in self.nodes:
+            if not (candidates := by_key.get(key)):
+                msg = f"Node {key} from the snapshot was not rebuilt"
+                raise SnapshotMismatchError(msg)
+            node_map[old_id] = candidates.pop()
+        if len(node_map) != len(ctx._graph):
+            msg = f"Rebuilt {len(ctx._graph)} nodes but the snapshot has {len(node_map)}"
+            raise SnapshotMismatchError(msg)
+
+        for old_id, import_id in self.external_modules:
+            node_map[old_id] = ExternalModule.from_import(ctx.get_node(node_map[import_id])).node_id
+
+        # =====[ Re-add the edges ]=====
+        matches: dict[tuple[int, int, int, int], Editable] = {}
+        edges = []
+        for u, v, edge_type, usage in self.edges:
+            edges.append((node_map[u], node_map[v], Edge(edge_type, None if usage is None else self._load_usage(ctx, usage, node_map, matches))))
+        ctx.add_edges(edges)
+
+    @staticmethod
+    def _load_usage(ctx: CodebaseContext, record: UsageRecord, node_map: dict[NodeId, NodeId], matches: dict[tuple[int, int, int, int], Editable]) -> Usage:
+        from codegen.sdk.core.dataclasses.usage import Usage, UsageKind, UsageType
+        from codegen.sdk.core.expressions import Name
+
+        match_record, usage_symbol_id, imported_by_id, usage_type, kind = record
+        usage_symbol = ctx.get_node(node_map[usage_symbol_id])
+        if (match := matches.get(match_record)) is None:
+            file_node_id, start_byte, end_byte, kind_id = match_record
+            ts_node = ctx.get_node(node_map[file_node_id]).ts_node.descendant_for_byte_range(start_byte, end_byte)
+            while ts_node is not None and (ts_node.kind_id != kind_id or ts_node.start_byte != start_byte or ts_node.end_byte != end_byte):
+                ts_node = ts_node.parent
+            if ts_node is None:
+                msg = f"Can't find usage {match_record} in the rebuilt tree"
+                raise SnapshotMismatchError(msg)
+            # NOTE: the match is re-wrapped as a child of the usage symbol rather than of its original parent expression
+            match = matches[match_record] = usage_symbol._parse_expression(ts_node, default=Name)
+        return Usage(
+            match=match,
+            usage_symbol=usage_symbol,
+            imported_by=None if imported_by_id is None else ctx.get_node(node_map[imported_by_id]),
+            usage_type=None if usage_type is None else UsageType(usage_type),
+            kind=UsageKind(kind),
+        )
+
+    def get_diffs(self, ctx: CodebaseContext, repo_operator: RepoOperator) -> list[DiffLite]:
+        """Diffs needed to bring the restored graph in line with the working tree"""
+        git = repo_operator.git_cli.git
+        snapshot_files = {filepath for filepath, _ in self.files}
+        changes: dict[str, ChangeType] = {}
+        diff = git.diff(self.commit, "--name-status", "--no-renames", "-z").split("\0")
+        for status, filepath in zip(diff[::2], diff[1::2]):
+            changes[filepath] = ChangeType.Removed if status == "D" else ChangeType.Added if status == "A" else ChangeType.Modified
+        for filepath in git.ls_files("-o", "--exclude-standard", "-z").split("\0"):
+            if filepath:
+                changes[filepath] = ChangeType.Added
+        # Files that were dirty when the snapshot was taken may since have been reverted to the commit's content
+        for filepath in self.dirty_files:
+            changes.setdefault(filepath, ChangeType.Modified)
+
+        subdirs = ctx.projects[0].subdirectories
+        diffs = []
+        for filepath, change_type in changes.items():
+            if subdirs and not any(filepath.startswith(subdir) for subdir in subdirs):
+                continue
+            if change_type == ChangeType.Added and filepath in snapshot_files:
+                change_type = ChangeType.Modified
+            diffs.append(DiffLite(change_type, ctx.to_absolute(filepath)))
+        return diffs
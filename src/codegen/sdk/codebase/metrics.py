@@ -0,0 +1,175 @@
+"""Per-phase metrics of graph builds, syncs and transaction commits."""
+
+import json
+import os
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import psutil
+
+# Prefix of every metric in the OpenMetrics output
+METRIC_PREFIX = "codegen_codebase"
+
+
+@dataclass(frozen=True)
+class PhaseMetrics:
+    """Measurements of a single run of a phase"""
+
+    name: str
+    # Name of the phase this run was nested in (e.g. build_graph for parse), if any
+    parent: str | None
+    # Unix time the phase started at
+    started_at: float
+    wall_seconds: float
+    cpu_seconds: float
+    rss_delta_bytes: int
+    # Size of the graph once the phase finished, and how much it grew during the phase
+    nodes: int
+    edges: int
+    nodes_delta: int
+    edges_delta: int
+
+
+@dataclass(frozen=True)
+class PhaseSummary:
+    """Aggregate of every recorded run of a phase"""
+
+    name: str
+    count: int
+    wall_seconds: float
+    cpu_seconds: float
+    rss_delta_bytes: int
+    max_wall_seconds: float
+    # Graph size after the latest run
+    nodes: int
+    edges: int
+
+
+class MetricsCollector:
+    """Records wall time, CPU time, RSS growth and graph size for every phase of the codebase lifecycle.
+
+    Phases are measured with `phase`, which can be nested. The most recent `max_records` runs are kept and can be
+    queried with `get` and `summary`, or exported as JSON or OpenMetrics text (e.g. for a Prometheus textfile collector).
+    """
+
+    DEFAULT_MAX_RECORDS = 10_000
+
+    records: deque[PhaseMetrics]
+
+    def __init__(self, graph_size: Callable[[], tuple[int, int]] | None = None, max_records: int = DEFAULT_MAX_RECORDS) -> None:
+        self._graph_size = graph_size or (lambda: (0, 0))
+        self.records = deque(maxlen=max_records)
+        self._stack: list[str] = []
+        self._process = psutil.Process(os.getpid())
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Measures the enclosed block as a run of the given phase. The run is recorded even if the block raises"""
+        parent = self._stack[-1] if self._stack else None
+        self._stack.append(name)
+        nodes_before, edges_before = self._graph_size()
+        rss_before = self._process.memory_info().rss
+        started_at = time.time()
+        wall_before = time.perf_counter()
+        cpu_before = time.process_time()
+        try:
+            yield
+        finally:
+            wall_seconds = time.perf_counter() - wall_before
+            cpu_seconds = time.process_time() - cpu_before
+            rss_delta = self._process.memory_info().rss - rss_before
+            nodes, edges = self._graph_size()
+            self._stack.pop()
+            self.records.append(
+                PhaseMetrics(
+                    name=name,
+                    parent=parent,
+                    started_at=started_at,
+                    wall_seconds=wall_seconds,
+                    cpu_seconds=cpu_seconds,
+                    rss_delta_bytes=rss_delta,
+                    nodes=nodes,
+                    edges=edges,
+                    nodes_delta=nodes - nodes_before,
+                    edges_delta=edges - edges_before,
+                )
+            )
+
+    def get(self, name: str | None = None, parent: str | None = None) -> list[PhaseMetrics]:
+        """Recorded runs, oldest first, optionally filtered by phase and by enclosing phase"""
+        return [record for record in self.records if (name is None or record.name == name) and (parent is None or record.parent == parent)]
+
+    def last(self, name: str) -> PhaseMetrics | None:
+        """The most recent run of the given phase"""
+        return next((record for record in reversed(self.records) if record.name == name), None)
+
+    def summary(self) -> dict[str, PhaseSummary]:
+        """Totals of every phase, in the order the phases first ran"""
+        summaries: dict[str, PhaseSummary] = {}
+        for record in self.records:
+            if (prev := summaries.get(record.name)) is None:
+                summaries[record.name] = PhaseSummary(record.name, 1, record.wall_seconds, record.cpu_seconds, record.rss_delta_bytes, record.wall_seconds, record.nodes, record.edges)
+            else:
+                summaries[record.name] = PhaseSummary(
+                    record.name,
+                    prev.count + 1,
+                    prev.wall_seconds + record.wall_seconds,
+                    prev.cpu_seconds + record.cpu_seconds,
+                    prev.rss_delta_bytes + record.rss_delta_bytes,
+                    max(prev.max_wall_seconds, record.wall_seconds),
+                    record.nodes,
+                    record.edges,
+                )
+        return summaries
+
+    def clear(self) -> None:
+        self.records.clear()
+
+    def to_dict(self) -> dict:
+        return {
+            "summary": [asdict(summary) for summary in self.summary().values()],
+            "records": [asdict(record) for record in self.records],
+        }
+
+    def to_json(self, indent: int | None = None) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_openmetrics(self) -> str:
+        """Phase totals in the OpenMetrics text format"""
+        summaries = self.summary().values()
+        families = [
+            ("phase_runs", "counter", "Number of runs of the phase", lambda s: s.count),
+            ("phase_wall_seconds", "counter", "Wall time spent in the phase", lambda s: s.wall_seconds),
+            ("phase_cpu_seconds", "counter", "CPU time spent in the phase", lambda s: s.cpu_seconds),
+            ("phase_rss_delta_bytes", "gauge", "Total growth in resident memory during the phase", lambda s: s.rss_delta_bytes),
+            ("phase_max_wall_seconds", "gauge", "Longest single run of the phase", lambda s: s.max_wall_seconds),
+            ("phase_graph_nodes", "gauge", "Number of graph nodes after the latest run of the phase", lambda s: s.nodes),
+            ("phase_graph_edges", "gauge", "Number of graph edges after the latest run of the phase", lambda s: s.edges),
+        ]
+        lines = []
+        for metric, metric_type, help_text, value in families:
+            name = f"{METRIC_PREFIX}_{metric}"
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.append(f"# HELP {name} {help_text}")
+            # Counter samples carry the _total suffix
+            sample = f"{name}_total" if metric_type == "counter" else name
+            for summary in summaries:
+                lines.append(f'{sample}{{phase="{summary.name}"}} {value(summary)}')
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str | Path) -> None:
+        """Writes the metrics to a file: JSON for .json paths, OpenMetrics text otherwise"""
+        path = Path(path)
+        content = self.to_json(indent=2) if path.suffix == ".json" else self.to_openmetrics()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(content)
+        os.replace(tmp_path, path)
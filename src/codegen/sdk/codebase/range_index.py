@@ -32,6 +32,9 @@ class RangeIndex:
     def clear(self):
         self._ranges.clear()
         self._canonical_range.clear()
+        self.uncache()
+
+    def uncache(self):
         self.__dict__.pop("children", None)
         self.__dict__.pop("nodes", None)
 
@@ -0,0 +1,66 @@
+"""LRU of the files whose derived state is kept in memory (max_resident_files)."""
+
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from codegen.sdk.core.node_id_factory import NodeId
+
+
+@dataclass
+class ResidencyStats:
+    """Counters of a FileResidency"""
+
+    # Files evicted since the codebase was built
+    evictions: int = 0
+    # Evicted files that were used again (and had their caches recomputed)
+    reloads: int = 0
+    # Cached values dropped by evictions
+    released: int = 0
+
+
+class FileResidency:
+    """Keeps the derived state of at most `capacity` files, evicting the least recently used file beyond that.
+
+    A file is used whenever it is looked up, or a cached property of anything in it is computed. Evicting a file calls
+    `evict` with its node id, which drops whatever can be recomputed on the next use and returns how many values it dropped.
+    """
+
+    capacity: int
+    stats: ResidencyStats
+
+    def __init__(self, capacity: int, evict: Callable[[NodeId], int]) -> None:
+        self.capacity = capacity
+        self.stats = ResidencyStats()
+        self._evict = evict
+        self._resident: OrderedDict[NodeId, None] = OrderedDict()
+        self._evicted: set[NodeId] = set()
+
+    def __len__(self) -> int:
+        return len(self._resident)
+
+    def __contains__(self, file_node_id: NodeId) -> bool:
+        return file_node_id in self._resident
+
+    def touch(self, file_node_id: NodeId) -> None:
+        if file_node_id in self._resident:
+            self._resident.move_to_end(file_node_id)
+            return
+        if file_node_id in self._evicted:
+            self._evicted.discard(file_node_id)
+            self.stats.reloads += 1
+        self._resident[file_node_id] = None
+        while len(self._resident) > self.capacity:
+            evicted, _ = self._resident.popitem(last=False)
+            self._evicted.add(evicted)
+            self.stats.evictions += 1
+            self.stats.released += self._evict(evicted)
+
+    def discard(self, file_node_id: NodeId) -> None:
+        """Stops tracking a file that was removed from the graph"""
+        self._resident.pop(file_node_id, None)
+        self._evicted.discard(file_node_id)
+
+    def clear(self) -> None:
+        self._resident.clear()
+        self._evicted.clear()
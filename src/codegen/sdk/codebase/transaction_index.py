@@ -0,0 +1,74 @@
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterator
+
+from codegen.sdk.codebase.transactions import Transaction
+
+
+class TransactionIndex:
+    """Interval index over the queued transactions of a single file.
+
+    Transactions are bucketed by the bit length of their byte length, so every transaction in bucket `k` is shorter than
+    `2 ** k` bytes. Each bucket keeps its transactions sorted by start byte, which means an overlap or containment query
+    only has to look at a narrow window of starts in every bucket: O(log n) per bucket plus the size of the result.
+    """
+
+    # bucket -> (sorted start bytes, transactions in the same order)
+    _buckets: dict[int, tuple[list[int], list[Transaction]]]
+
+    def __init__(self) -> None:
+        self._buckets = {}
+
+    def __len__(self) -> int:
+        return sum(len(transactions) for _, transactions in self._buckets.values())
+
+    def __contains__(self, transaction: Transaction) -> bool:
+        """Whether an equal transaction (see `Transaction.__eq__`) is in the index"""
+        if (bucket := self._buckets.get(transaction.length.bit_length())) is None:
+            return False
+        starts, transactions = bucket
+        lo = bisect_left(starts, transaction.start_byte)
+        hi = bisect_right(starts, transaction.start_byte, lo)
+        return any(t == transaction for t in transactions[lo:hi])
+
+    def add(self, transaction: Transaction) -> None:
+        starts, transactions = self._buckets.setdefault(transaction.length.bit_length(), ([], []))
+        idx = bisect_right(starts, transaction.start_byte)
+        starts.insert(idx, transaction.start_byte)
+        transactions.insert(idx, transaction)
+
+    def remove(self, transaction: Transaction) -> None:
+        """Removes this exact transaction object from the index"""
+        starts, transactions = self._buckets[transaction.length.bit_length()]
+        lo = bisect_left(starts, transaction.start_byte)
+        hi = bisect_right(starts, transaction.start_byte, lo)
+        for idx in range(lo, hi):
+            if transactions[idx] is transaction:
+                del starts[idx]
+                del transactions[idx]
+                return
+        msg = f"{transaction!r} is not in the index"
+        raise ValueError(msg)
+
+    def _window(self, min_start: int, max_start: int) -> Iterator[Transaction]:
+        """Yields the transactions of every bucket whose start byte lies in (min_start - 2 ** k, max_start]"""
+        for k, (starts, transactions) in self._buckets.items():
+            lo = bisect_right(starts, min_start - (1 << k))
+            hi = bisect_right(starts, max_start, lo)
+            yield from transactions[lo:hi]
+
+    def overlapping(self, start_byte: int, end_byte: int) -> list[Transaction]:
+        """Transactions that overlap with [start_byte, end_byte), using the same test as the transaction manager"""
+        return [t for t in self._window(start_byte, end_byte - 1) if start_byte < t.end_byte and end_byte > t.start_byte]
+
+    def containing(self, start_byte: int, end_byte: int) -> list[Transaction]:
+        """Transactions that completely cover [start_byte, end_byte]"""
+        return [t for t in self._window(start_byte, start_byte) if t.start_byte <= start_byte and t.end_byte >= end_byte]
+
+    def starting_at(self, start_byte: int) -> list[Transaction]:
+        """Transactions that start at the given byte"""
+        ret = []
+        for starts, transactions in self._buckets.values():
+            lo = bisect_left(starts, start_byte)
+            hi = bisect_right(starts, start_byte, lo)
+            ret.extend(transactions[lo:hi])
+        return ret
@@ -1,9 +1,11 @@
 import time
 from collections.abc import Callable
+from contextlib import nullcontext
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 from codegen.sdk.codebase.diff_lite import ChangeType, DiffLite
+from codegen.sdk.codebase.transaction_index import TransactionIndex
 from codegen.sdk.codebase.transactions import (
     EditTransaction,
     FileAddTransaction,
@@ -13,10 +15,12 @@ from codegen.sdk.codebase.transactions import (
     Transaction,
     TransactionPriority,
 )
+from codegen.sdk.core.autocommit.constants import IllegalWriteError
 from codegen.shared.exceptions.control_flow import MaxPreviewTimeExceeded, MaxTransactionsExceeded
 from codegen.shared.logging.get_logger import get_logger
 
 if TYPE_CHECKING:
+    from codegen.sdk.codebase.metrics import MetricsCollector
     from codegen.sdk.core.file import File
 
 
@@ -34,17 +38,26 @@ class TransactionManager:
     """
 
     # Unsorted list of transactions, grouped by file
-    # TODO: consider using SortedList for better performance
     queued_transactions: dict[Path, list[Transaction]]
+    # Interval index over each file's queue, used for dedupe and conflict detection
+    _indices: dict[Path, TransactionIndex]
+    # Running total of queued transactions across all files
+    _num_transactions: int = 0
     pending_undos: set[Callable[[], None]]
     _commiting: bool = False
+    # Set by Codebase.read_only, rejects every transaction while set
+    read_only: bool = False
     max_transactions: int | None = None  # None = no limit
     stopwatch_start = None
     stopwatch_max_seconds: int | None = None  # None = no limit
+    # Records the duration of every commit, if set
+    metrics: "MetricsCollector | None"
 
-    def __init__(self) -> None:
+    def __init__(self, metrics: "MetricsCollector | None" = None) -> None:
         self.queued_transactions = dict()
+        self._indices = dict()
         self.pending_undos = set()
+        self.metrics = metrics
 
     def sort_transactions(self) -> None:
         for file_path, file_transactions in self.queued_transactions.items():
@@ -55,6 +68,8 @@ class TransactionManager:
         if len(self.queued_transactions) > 0:
             logger.warning("Not all transactions have been committed")
             self.queued_transactions.clear()
+        self._indices.clear()
+        self._num_transactions = 0
         for undo in self.pending_undos:
             undo()
         self.pending_undos.clear()
@@ -74,7 +89,7 @@ class TransactionManager:
 
     def get_num_transactions(self) -> int:
         """Returns total number of transactions created to date"""
-        return sum([len(transactions) for transactions in self.queued_transactions.values()])
+        return self._num_transactions
 
     def set_max_transactions(self, max_transactions: int | None = None) -> None:
         self.max_transactions = max_transactions
@@ -116,24 +131,49 @@ class TransactionManager:
         t = FileRemoveTransaction(file)
         self.add_transaction(t)
 
+    def check_writable(self) -> None:
+        if self.read_only:
+            msg = "Cannot change a read only codebase. Make the change outside of Codebase.read_only()"
+            raise IllegalWriteError(msg)
+
     def add_transaction(self, transaction: Transaction, dedupe: bool = True, solve_conflicts: bool = True) -> bool:
+        self.check_writable()
         # Get the list of transactions for the file
         file_path = transaction.file_path
         if file_path not in self.queued_transactions:
             self.queued_transactions[file_path] = []
+            self._indices[file_path] = TransactionIndex()
         file_queue = self.queued_transactions[file_path]
 
         # Dedupe transactions
-        if dedupe and transaction in file_queue:
+        if dedupe and transaction in self._indices[file_path]:
             logger.debug(f"Transaction already exists in queue: {transaction}")
             return False
         # Solve conflicts
         if new_transaction := self._resolve_conflicts(transaction, file_queue, solve_conflicts=solve_conflicts):
-            file_queue.append(new_transaction)
+            self._enqueue(new_transaction, file_queue)
 
         self.check_limits()
         return True
 
+    def _enqueue(self, transaction: Transaction, file_queue: list[Transaction], idx: int | None = None) -> None:
+        if idx is None:
+            file_queue.append(transaction)
+        else:
+            file_queue.insert(idx, transaction)
+        self._indices[transaction.file_path].add(transaction)
+        self._num_transactions += 1
+
+    def _dequeue(self, transactions: list[Transaction], file_queue: list[Transaction]) -> None:
+        if not transactions:
+            return
+        index = self._indices[transactions[0].file_path]
+        for transaction in transactions:
+            index.remove(transaction)
+        to_remove = {id(transaction) for transaction in transactions}
+        file_queue[:] = [transaction for transaction in file_queue if id(transaction) not in to_remove]
+        self._num_transactions -= len(transactions)
+
     def check_limits(self):
         self.check_max_transactions()
         self.check_max_preview_time()
@@ -178,29 +218,54 @@ class TransactionManager:
             if not self.queued_transactions or len(self.queued_transactions) == 0:
                 return diffs
 
-            self.sort_transactions()
-
-            # TODO: raise error if two transactions byte ranges overlap with each other
-            if len(files) > 3:
-                num_transactions = sum([len(self.queued_transactions[file_path]) for file_path in files])
-                logger.info(f"Committing {num_transactions} transactions for {len(files)} files")
-            else:
-                for file in files:
-                    logger.info(f"Committing {len(self.queued_transactions[file])} transactions for {file}")
-            for file_path in files:
-                file_transactions = self.queued_transactions.pop(file_path, [])
-                modified = False
-                for transaction in file_transactions:
-                    # Add diff IF the file is a source file
-                    diff = transaction.get_diff()
-                    if diff.change_type == ChangeType.Modified:
-                        if not modified:
-                            modified = True
-                            diffs.append(diff)
-                    else:
-                        diffs.append(diff)
-                    transaction.execute()
-            return diffs
+            with self.metrics.phase("commit") if self.metrics is not None else nullcontext():
+                self.sort_transactions()
+
+                # TODO: raise error if two transactions byte ranges overlap with each other
+                if len(files) > 3:
+                    num_transactions = sum([len(self.queued_transactions[file_path]) for file_path in files])
+                    logger.info(f"Committing {num_transactions} transactions for {len(files)} files")
+                else:
+                    for file in files:
+                        logger.info(f"Committing {len(self.queued_transactions[file])} transactions for {file}")
+                for file_path in files:
+                    file_transactions = self.queued_transactions.pop(file_path, [])
+                    self._indices.pop(file_path, None)
+                    self._num_transactions -= len(file_transactions)
+                    modified = False
+                    # Content edits are batched up and written in one pass, as long as each one ends before the start of
+                    # the previous one (transactions are sorted back to front, so they then don't affect each other)
+                    edits: list[tuple[int, int, bytes]] = []
+                    edits_file: File | None = None
+                    for transaction in file_transactions:
+                        edit = transaction.get_edit()
+                        # Add diff IF the file is a source file. Only the first content edit's diff is kept, so the rest
+                        # aren't computed.
+                        if edit is None or not modified:
+                            diff = transaction.get_diff()
+                            if diff.change_type == ChangeType.Modified:
+                                if not modified:
+                                    modified = True
+                                    diffs.append(diff)
+                            else:
+                                diffs.append(diff)
+                        if edit is not None:
+                            if edits and edit[1] > edits[-1][0]:
+                                edits_file.write_edits(edits)
+                                edits = []
+                            if not edits:
+                                edits_file = transaction.file
+                            edits.append(edit)
+                            if transaction.exec_func:
+                                transaction.exec_func()
+                        else:
+                            if edits:
+                                edits_file.write_edits(edits)
+                                edits = []
+                            transaction.execute()
+                    if edits:
+                        edits_file.write_edits(edits)
+                return diffs
         finally:
             self._commiting = False
 
@@ -213,12 +278,12 @@ class TransactionManager:
             if new_transactions := to_break.break_down():
                 try:
                     insert_idx = file_queue.index(to_break)
-                    file_queue.pop(insert_idx)
+                    self._dequeue([file_queue[insert_idx]], file_queue)
                 except ValueError:
                     insert_idx = len(file_queue)
                 for new_transaction in new_transactions:
                     if broken_down := self._resolve_conflicts(new_transaction, file_queue, solve_conflicts=solve_conflicts):
-                        file_queue.insert(insert_idx, broken_down)
+                        self._enqueue(broken_down, file_queue, insert_idx)
                 return True
             return False
 
@@ -240,8 +305,7 @@ class TransactionManager:
                 else:
                     # If current transaction is deleted, remove all conflicting transactions
                     if isinstance(transaction, RemoveTransaction):
-                        for t in conflicts:
-                            file_queue.remove(t)
+                        self._dequeue(conflicts, file_queue)
                     # If current transaction is edit, raise an error
                     elif isinstance(transaction, EditTransaction):
                         if break_down(transaction):
@@ -278,7 +342,7 @@ class TransactionManager:
         if file_path not in self.queued_transactions:
             return matching_transactions
 
-        for t in self.queued_transactions[file_path]:
+        for t in self._in_queue_order(self._indices[file_path].starting_at(start_byte), file_path):
             if t.start_byte == start_byte:
                 if t.end_byte == end_byte:
                     if transaction_order is None or t.transaction_order == transaction_order:
@@ -289,18 +353,17 @@ class TransactionManager:
 
         return matching_transactions
 
+    def _in_queue_order(self, transactions: list[Transaction], file_path: Path) -> list[Transaction]:
+        """Orders transactions returned by the index the way they appear in the file's queue"""
+        if len(transactions) > 1:
+            transactions.sort(key=self.queued_transactions[file_path].index)
+        return transactions
+
     def _get_conflicts(self, transaction: Transaction) -> list[Transaction]:
         """Returns all transactions that overlap with the given transaction"""
-        overlapping_transactions = []
-        queued_transactions = list(self.queued_transactions[transaction.file_path])
-        for t in queued_transactions:
-            if transaction.start_byte < t.end_byte and transaction.end_byte > t.start_byte:
-                overlapping_transactions.append(t)
-        return overlapping_transactions
+        return self._indices[transaction.file_path].overlapping(transaction.start_byte, transaction.end_byte)
 
     def _get_overlapping_conflicts(self, transaction: Transaction) -> Transaction | None:
         """Returns the transaction that completely overlaps with the given transaction"""
-        for t in self.queued_transactions[transaction.file_path]:
-            if transaction.start_byte >= t.start_byte and transaction.end_byte <= t.end_byte:
-                return t
-        return None
+        containing = self._indices[transaction.file_path].containing(transaction.start_byte, transaction.end_byte)
+        return next(iter(self._in_queue_order(containing, transaction.file_path)), None)
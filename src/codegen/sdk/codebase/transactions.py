@@ -35,6 +35,7 @@ class Transaction:
     priority: int | tuple
     transaction_order: TransactionPriority
     transaction_counter: int = 0
+    exec_func: Callable[[], None] | None = None
 
     def __init__(
         self,
@@ -81,6 +82,14 @@ class Transaction:
         msg = "Transaction.execute() must be implemented by subclasses"
         raise NotImplementedError(msg)
 
+    def get_edit(self) -> tuple[int, int, bytes] | None:
+        """The (start_byte, end_byte, new bytes) edit this transaction makes to its file's content.
+
+        None for transactions that don't edit file content. Transactions with an edit can be applied in bulk with
+        `File.write_edits` (followed by `exec_func`) instead of `execute`.
+        """
+        return None
+
     def get_diff(self) -> DiffLite:
         """Gets the diff produced by this transaction"""
         msg = "Transaction.get_diff() must be implemented by subclasses"
@@ -109,8 +118,6 @@ class Transaction:
 class RemoveTransaction(Transaction):
     transaction_order = TransactionPriority.Remove
 
-    exec_func: Callable[[], None] | None = None
-
     def __init__(self, start_byte: int, end_byte: int, file: "File", priority: int = 0, exec_func: Callable[[], None] | None = None) -> None:
         super().__init__(start_byte, end_byte, file.path, priority=priority)
         self.file = file
@@ -123,10 +130,13 @@ class RemoveTransaction(Transaction):
 
     def execute(self) -> None:
         """Removes the content between start_byte and end_byte"""
-        self.file.write_bytes(self._generate_new_content_bytes())
+        self.file.write_edits([self.get_edit()])
         if self.exec_func:
             self.exec_func()
 
+    def get_edit(self) -> tuple[int, int, bytes]:
+        return self.start_byte, self.end_byte, b""
+
     def get_diff(self) -> DiffLite:
         """Gets the diff produced by this transaction"""
         return DiffLite(ChangeType.Modified, self.file_path, old_content=self.file.content_bytes)
@@ -140,8 +150,6 @@ class RemoveTransaction(Transaction):
 class InsertTransaction(Transaction):
     transaction_order = TransactionPriority.Insert
 
-    exec_func: Callable[[], None] | None = None
-
     def __init__(
         self,
         insert_byte: int,
@@ -166,10 +174,13 @@ class InsertTransaction(Transaction):
 
     def execute(self) -> None:
         """Inserts new_src at the specified byte_index"""
-        self.file.write_bytes(self._generate_new_content_bytes())
+        self.file.write_edits([self.get_edit()])
         if self.exec_func:
             self.exec_func()
 
+    def get_edit(self) -> tuple[int, int, bytes]:
+        return self.insert_byte, self.insert_byte, bytes(self.new_content, encoding="utf-8")
+
     def get_diff(self) -> DiffLite:
         """Gets the diff produced by this transaction"""
         return DiffLite(ChangeType.Modified, self.file_path, old_content=self.file.content_bytes)
@@ -203,7 +214,10 @@ class EditTransaction(Transaction):
 
     def execute(self) -> None:
         """Edits the entirety of this node's source to new_src"""
-        self.file.write_bytes(self._generate_new_content_bytes())
+        self.file.write_edits([self.get_edit()])
+
+    def get_edit(self) -> tuple[int, int, bytes]:
+        return self.start_byte, self.end_byte, bytes(self.new_content, "utf-8")
 
     def get_diff(self) -> DiffLite:
         """Gets the diff produced by this transaction"""
@@ -108,7 +108,11 @@ class AutoCommit:
             new_node = self.ctx.get_node(
                 new_id if new_id is not None else symbol.file_node_id
             )
+            from codegen.sdk.core.interfaces.editable import Editable
+
             old_node.__dict__ = new_node.__dict__
+            for name in Editable.__slots__:
+                setattr(old_node, name, getattr(new_node, name))
             if not lock:
                 self._files[symbol.file_node_id] = new_id
 
@@ -231,6 +235,7 @@ class AutoCommit:
         self, node: AutoCommitSymbol, *, commit: bool = True, move: bool = False
     ) -> Iterator[None]:
         """Enter a write state."""
+        self.ctx.transaction_manager.check_writable()
         if self.state not in (AutoCommitState.Write, None):
             # Can't write in a read or commit
             logger.error(IllegalWriteError())
@@ -303,7 +303,7 @@ class Codebase(
         """
         if self.ctx.config.use_pink == PinkMode.ALL_FILES:
             return self._pink_codebase.files
-        if extensions is None and len(self.ctx.get_nodes(NodeType.FILE)) > 0:
+        if extensions is None and (self.ctx.lazy_files or len(self.ctx.get_nodes(NodeType.FILE)) > 0):
             # If extensions is None AND there is at least one file in the codebase (This checks for unsupported languages or parse-off repos),
             # Return all source files
             files = self.ctx.get_nodes(NodeType.FILE)
@@ -333,6 +333,7 @@ class Codebase(
         return CodeOwner.from_parser(
             self.ctx.codeowners_parser,
             lambda *args, **kwargs: self.files(*args, **kwargs),
+            index=self.ctx.codeowners_index,
         )
 
     @property
@@ -487,6 +488,7 @@ class Codebase(
         Raises:
             ValueError: If the provided content cannot be parsed according to the file extension.
         """
+        self.ctx.transaction_manager.check_writable()
         # Check if file already exists
         # NOTE: This check is also important to ensure the filepath is valid within the repo!
         if self.has_file(filepath):
@@ -519,6 +521,7 @@ class Codebase(
         Raises:
             FileExistsError: If the directory already exists and exist_ok is False.
         """
+        self.ctx.transaction_manager.check_writable()
         # Check if directory already exists
         # NOTE: This check is also important to ensure the filepath is valid within the repo!
         if self.has_directory(dir_path):
@@ -639,7 +642,7 @@ class Codebase(
         Returns:
             bool: True if a symbol with the given name exists in the codebase, False otherwise.
         """
-        return any([x.name == symbol_name for x in self.symbols])
+        return len(self.ctx.get_symbols_by_name(symbol_name)) > 0
 
     def get_symbol(self, symbol_name: str, optional: bool = False) -> TSymbol | None:
         """Returns a Symbol by name from the codebase.
@@ -682,7 +685,7 @@ class Codebase(
         Note:
             When a unique symbol is required, use get_symbol() instead. It will raise ValueError if multiple symbols are found.
         """
-        return sort_editables(x for x in self.symbols if x.name == symbol_name)
+        return sort_editables(self.ctx.get_symbols_by_name(symbol_name))
 
     def get_class(self, class_name: str, optional: bool = False) -> TClass | None:
         """Returns a class that matches the given name.
@@ -697,7 +700,7 @@ class Codebase(
         Raises:
             ValueError: If the class is not found and optional=False, or if multiple classes with the same name exist.
         """
-        matches = [c for c in self.classes if c.name == class_name]
+        matches = sort_editables(self.ctx.get_symbols_by_name(class_name, SymbolType.Class), dedupe=False)
         if len(matches) == 0:
             if not optional:
                 msg = f"Class {class_name} not found in codebase. Use optional=True to return None instead."
@@ -726,7 +729,7 @@ class Codebase(
         Raises:
             ValueError: If function is not found and optional=False, or if multiple matching functions exist.
         """
-        matches = [f for f in self.functions if f.name == function_name]
+        matches = sort_editables(self.ctx.get_symbols_by_name(function_name, SymbolType.Function), dedupe=False)
         if len(matches) == 0:
             if not optional:
                 msg = f"Function {function_name} not found in codebase. Use optional=True to return None instead."
@@ -814,6 +817,26 @@ class Codebase(
         """
         self.ctx.commit_transactions(sync_graph=sync_graph and self.ctx.config.sync_enabled)
 
+    @contextmanager
+    def read_only(self) -> Generator[None, None, None]:
+        """Runs the enclosed block with the codebase frozen, for analyses that never change it.
+
+        Pending changes are committed on entry. Inside the block, any change to the codebase (editing a node, creating a
+        file or directory, etc.) raises an IllegalWriteError right away, and each file is read from disk at most once.
+
+        Example:
+            with codebase.read_only():
+                dead_code = [function for function in codebase.functions if not function.usages]
+        """
+        if self.ctx.transaction_manager.queued_transactions:
+            self.commit()
+        was_read_only = self.ctx.read_only
+        self.ctx.read_only = True
+        try:
+            yield None
+        finally:
+            self.ctx.read_only = was_read_only
+
     @noapidoc
     def git_push(self, *args, **kwargs) -> PushInfoList:
         """Git push."""
@@ -3,6 +3,7 @@ from typing import Callable, Generic, Literal
 
 from codeowners import CodeOwners as CodeOwnersParser
 
+from codegen.git.utils.codeowner_utils import CodeOwnersIndex
 from codegen.sdk._proxy import proxy_property
 from codegen.sdk.core.interfaces.has_symbols import (
     FilesParam,
@@ -35,34 +36,40 @@ class CodeOwner(
         owner_type: The type of the owner (USERNAME, TEAM, EMAIL).
         owner_value: The value of the owner.
         files_source: A callable that returns an iterable of all files in the codebase.
+        index: The ownership index of the codebase, used to look up the files of the owner (if any).
     """
 
     _instance_iterator: Iterator[TFile]
     owner_type: Literal["USERNAME", "TEAM", "EMAIL"]
     owner_value: str
     files_source: Callable[FilesParam, Iterable[TFile]]
+    index: CodeOwnersIndex | None
 
     def __init__(
         self,
         files_source: Callable[FilesParam, Iterable[TFile]],
         owner_type: Literal["USERNAME", "TEAM", "EMAIL"],
         owner_value: str,
+        index: CodeOwnersIndex | None = None,
     ):
         self.owner_type = owner_type
         self.owner_value = owner_value
         self.files_source = files_source
+        self.index = index
 
     @classmethod
     def from_parser(
         cls,
         parser: CodeOwnersParser,
         file_source: Callable[FilesParam, Iterable[TFile]],
+        index: CodeOwnersIndex | None = None,
     ) -> list["CodeOwner"]:
         """Create a list of CodeOwner objects from a CodeOwnersParser.
 
         Args:
             parser (CodeOwnersParser): The CodeOwnersParser to use.
             file_source (Callable[FilesParam, Iterable[TFile]]): A callable that returns an iterable of all files in the codebase.
+            index (CodeOwnersIndex | None): The ownership index of the codebase, shared by the CodeOwner objects.
 
         Returns:
             list[CodeOwner]: A list of CodeOwner objects.
@@ -70,12 +77,20 @@ class CodeOwner(
         codeowners = []
         for _, _, owners, _, _ in parser.paths:
             for owner_label, owner_value in owners:
-                codeowners.append(CodeOwner(file_source, owner_label, owner_value))
+                codeowners.append(CodeOwner(file_source, owner_label, owner_value, index=index))
         return codeowners
 
     @cached_generator(maxsize=16)
     @noapidoc
     def files_generator(self, *args: FilesParam.args, **kwargs: FilesParam.kwargs) -> Iterable[TFile]:
+        if self.index is not None:
+            # Filter files by the paths owned by the owner value. Files the index does not track (ex: non source files) are
+            # looked up one by one
+            owned_filepaths = self.index.files_of(self.owner_value)
+            for source_file in self.files_source(*args, **kwargs):
+                if source_file.file_path in owned_filepaths or (not self.index.has_path(source_file.file_path) and self.owner_value in source_file.owners):
+                    yield source_file
+            return
         for source_file in self.files_source(*args, **kwargs):
             # Filter files by owner value
             if self.owner_value in source_file.owners:
@@ -20,7 +20,7 @@ if TYPE_CHECKING:
 
 @apidoc
 @dataclass_json
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Usage:
     """A reference to an exportable object in a file.
 
@@ -135,7 +135,7 @@ class Directory(
             list[TSourceFile]: A sorted list of source files in the codebase.
         """
         # If there are no source files, return ALL files
-        if len(self.ctx.get_nodes(NodeType.FILE)) == 0:
+        if not self.ctx.lazy_files and len(self.ctx.get_nodes(NodeType.FILE)) == 0:
             extensions = "*"
         # If extensions is not set, use the extensions from the codebase
         elif extensions is None:
@@ -10,6 +10,7 @@ from pathlib import Path
 from typing import TYPE_CHECKING, Generic, Literal, Self, TypeVar, override
 
 from tree_sitter import Node as TSNode
+from tree_sitter import Tree as TSTree
 from typing_extensions import deprecated
 
 from codegen.sdk._proxy import proxy_property
@@ -30,8 +31,9 @@ from codegen.sdk.core.statements.import_statement import ImportStatement
 from codegen.sdk.core.symbol import Symbol
 from codegen.sdk.enums import EdgeType, ImportType, NodeType, SymbolType
 from codegen.sdk.extensions.sort import sort_editables
+from codegen.sdk.extensions.utils import uncache_attributes
 from codegen.sdk.topological_sort import pseudo_topological_sort
-from codegen.sdk.tree_sitter_parser import get_parser_by_filepath_or_extension, parse_file
+from codegen.sdk.tree_sitter_parser import edit_tree, get_parser_by_filepath_or_extension, parse_tree
 from codegen.sdk.typescript.function import TSFunction
 from codegen.sdk.utils import is_minified_js
 from codegen.shared.decorators.docs import apidoc, noapidoc
@@ -67,6 +69,9 @@ class File(Editable[None]):
     _pending_imports: set[str]
     _binary: bool = False
     _range_index: RangeIndex
+    # Edits made through transactions since the file was last parsed, None if the content was changed in any other way
+    _tree_edits: list[tuple[int, int, bytes]] | None
+    _tree_edits_base: bytes | None = None
 
     def __init__(self, filepath: PathLike, ctx: CodebaseContext, ts_node: TSNode | None = None, binary: bool = False) -> None:
         if ts_node is None:
@@ -74,6 +79,7 @@ class File(Editable[None]):
             parser = get_parser_by_filepath_or_extension(".py")
             ts_node = parser.parse(bytes("", "utf-8")).root_node
         self._range_index = RangeIndex()
+        self._tree_edits = []
         super().__init__(ts_node, getattr(self, "node_id", None), ctx, None)
         self.path = self.ctx.to_absolute(filepath)
         self.file_path = str(self.ctx.to_relative(self.path))
@@ -126,6 +132,11 @@ class File(Editable[None]):
 
         TODO: move rest of graph sitter to operate in bytes to prevent multi byte character issues?
         """
+        if self.ctx.read_only:
+            # Nothing can change the content until the codebase is writable again
+            if (content := self.ctx.read_only_contents.get(self.path)) is None:
+                content = self.ctx.read_only_contents[self.path] = self.ctx.io.read_bytes(self.path)
+            return content
         return self.ctx.io.read_bytes(self.path)
 
     @property
@@ -153,6 +164,8 @@ class File(Editable[None]):
     @noapidoc
     def write(self, content: str | bytes, to_disk: bool = False) -> None:
         """Writes contents to the file."""
+        self.ctx.transaction_manager.check_writable()
+        self._tree_edits = None
         self.ctx.io.write_file(self.path, content)
         if to_disk:
             self.ctx.io.save_files({self.path})
@@ -160,6 +173,29 @@ class File(Editable[None]):
                 # TS didn't parse anything, register a write to make sure the transaction manager can restore the file later.
                 self.edit("")
 
+    @noapidoc
+    def write_edits(self, edits: list[tuple[int, int, bytes]]) -> None:
+        """Replaces the bytes between each (start_byte, end_byte) with the new bytes, in a single write.
+
+        The edits must be sorted back to front and must not overlap, so every edit can be expressed in terms of the
+        current content. Unlike `write`, the edits are remembered so the next sync can reparse the file incrementally.
+        """
+        content_bytes = self.content_bytes
+        tree_edits = self._tree_edits
+        chunks = []
+        end = len(content_bytes)
+        for start_byte, end_byte, new_bytes in edits:
+            chunks.append(content_bytes[end_byte:end])
+            chunks.append(new_bytes)
+            end = start_byte
+        chunks.append(content_bytes[:end])
+        self.write(b"".join(reversed(chunks)))
+        if tree_edits is not None:
+            if not tree_edits:
+                self._tree_edits_base = content_bytes
+            tree_edits.extend(edits)
+            self._tree_edits = tree_edits
+
     @noapidoc
     @deprecated("Use write instead")
     def write_bytes(self, content_bytes: bytes, to_disk: bool = False) -> None:
@@ -208,10 +244,8 @@ class File(Editable[None]):
         Returns:
             set[str]: A set of Github usernames or team names that own this file. Empty if no CODEOWNERS file exists.
         """
-        if self.ctx.codeowners_parser:
-            # return get_filepath_owners(codeowners=self.ctx.codeowners_parser, filepath=self.file_path)
-            filename_owners = self.ctx.codeowners_parser.of(self.file_path)
-            return {owner[1] for owner in filename_owners}
+        if self.ctx.codeowners_index is not None:
+            return self.ctx.codeowners_index.owners_of(self.file_path)
         return set()
 
     @cached_property
@@ -427,13 +461,15 @@ class SourceFile(
 
     code_block: TCodeBlock
     _nodes: list[Importable]
+    _ts_tree: TSTree | None = None
 
-    def __init__(self, ts_node: TSNode, filepath: PathLike, ctx: CodebaseContext) -> None:
+    def __init__(self, ts_node: TSNode, filepath: PathLike, ctx: CodebaseContext, ts_tree: TSTree | None = None) -> None:
         self.node_id = ctx.add_node(self)
         self._nodes = []
+        self._ts_tree = ts_tree
         super().__init__(filepath, ctx, ts_node=ts_node)
         self._nodes.clear()
-        self.ctx.filepath_idx[self.file_path] = self.node_id
+        self.ctx.index_filepath(self.file_path, self.node_id)
         self._pending_imports = set()
         try:
             self.parse(ctx)
@@ -454,7 +490,7 @@ class SourceFile(
     @noapidoc
     @commiter
     def parse(self, ctx: CodebaseContext) -> None:
-        self.__dict__.pop("_source", None)
+        uncache_attributes(self, "_source")
         # Add self to the graph
         self.code_block = self._parse_code_block(self.ts_node)
 
@@ -510,18 +546,29 @@ class SourceFile(
             if self.ctx.has_node(node_id):
                 self.ctx.remove_node(node_id)
         if not reparse:
-            self.ctx.filepath_idx.pop(self.file_path, None)
+            self.ctx.unindex_filepath(self.file_path)
         self._nodes.clear()
         return list(filter(lambda node: self.ctx.has_node(node.node_id) and node is not None, external_edges_to_resolve))
 
     @noapidoc
     @commiter
     def sync_with_file_content(self) -> None:
-        """Re-parses parent file and re-sets current TSNode."""
+        """Re-parses parent file and re-sets current TSNode.
+
+        If all changes since the last parse were made through transactions, the old tree is edited and handed to
+        tree-sitter so only the changed regions are re-parsed.
+        """
         self._pending_imports.clear()
-        self.ts_node = parse_file(self.filepath, self.content)
+        content_bytes = self.content_bytes
+        old_tree = None
+        if self._ts_tree is not None and self._tree_edits:
+            old_tree = edit_tree(self._ts_tree, self._tree_edits_base, content_bytes, self._tree_edits)
+        self._ts_tree = parse_tree(self.filepath, content_bytes, old_tree=old_tree)
+        self._tree_edits = []
+        self._tree_edits_base = None
+        self.ts_node = self._ts_tree.root_node
         if self.node_id is None:
-            self.ctx.filepath_idx[self.file_path] = self.node_id
+            self.ctx.index_filepath(self.file_path, self.node_id)
             self.file_node_id = self.node_id
         else:
             assert self.ctx.has_node(self.node_id)
@@ -556,15 +603,17 @@ class SourceFile(
 
     @noapidoc
     def invalidate(self):
-        self.__dict__.pop("valid_symbol_names", None)
-        self.__dict__.pop("valid_import_names", None)
+        uncache_attributes(self, "valid_symbol_names", "valid_import_names")
         for imp in self.imports:
-            imp.__dict__.pop("_wildcards", None)
+            uncache_attributes(imp, "_wildcards")
 
     @classmethod
     @noapidoc
-    def from_content(cls, filepath: str | PathLike | Path, content: str, ctx: CodebaseContext, sync: bool = True, verify_syntax: bool = True) -> Self | None:
-        """Creates a new file from content and adds it to the graph."""
+    def from_content(cls, filepath: str | PathLike | Path, content: str, ctx: CodebaseContext, sync: bool = True, verify_syntax: bool = True, ts_tree: TSTree | None = None) -> Self | None:
+        """Creates a new file from content and adds it to the graph.
+
+        If `ts_tree` is provided it must be the tree of `content`, parsed ahead of time by a parse worker.
+        """
         path = ctx.to_absolute(filepath)
 
         # Sanity check to ensure file is not a minified file
@@ -572,7 +621,9 @@ class SourceFile(
             logger.info(f"File {filepath} is a minified file. Skipping...", extra={"filepath": filepath})
             return None
 
-        ts_node = parse_file(path, content)
+        if ts_tree is None:
+            ts_tree = parse_tree(path, content)
+        ts_node = ts_tree.root_node
         if ts_node.has_error and verify_syntax:
             logger.info("Failed to parse file %s", filepath)
             return None
@@ -588,7 +639,7 @@ class SourceFile(
             ctx.add_single_file(path)
             return ctx.get_file(filepath)
         else:
-            return cls(ts_node, Path(filepath), ctx)
+            return cls(ts_node, Path(filepath), ctx, ts_tree=ts_tree)
 
     @classmethod
     @noapidoc
@@ -601,12 +652,12 @@ class SourceFile(
             msg = f"File already exists in graph: {filepath}"
             raise ValueError(msg)
 
-        ts_node = parse_file(filepath, "")
-        if ts_node.has_error:
+        ts_tree = parse_tree(filepath, "")
+        if ts_tree.root_node.has_error:
             logger.info("Failed to parse file %s", filepath)
             raise SyntaxError
 
-        file = cls(ts_node, filepath, ctx)
+        file = cls(ts_tree.root_node, filepath, ctx, ts_tree=ts_tree)
         file.write("", to_disk=True)
         return file
 
@@ -4,7 +4,7 @@ from typing import TYPE_CHECKING, Generic, Self, TypeVar
 
 from codegen.sdk.codebase.resolution_stack import ResolutionStack
 from codegen.sdk.core.interfaces.editable import Editable
-from codegen.sdk.extensions.utils import cached_property
+from codegen.sdk.extensions.utils import cached_property, uncache_attributes
 from codegen.shared.decorators.docs import noapidoc
 
 if TYPE_CHECKING:
@@ -31,7 +31,7 @@ class Chainable(Editable[Parent], Generic[Parent]):
         self._resolving = True
         try:
             ret = list(self._resolved_types())
-            self.__dict__.pop("resolved_type_frames", None)
+            uncache_attributes(self, "resolved_type_frames")
             return ret
         finally:
             self._resolving = False
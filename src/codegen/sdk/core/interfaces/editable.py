@@ -111,6 +111,9 @@ class Editable(JSONable, Generic[Parent]):
         node_type: The type of node this Editable instance represents.
     """
 
+    # Set on every instance, so they are kept in slots rather than in the attributes of each instance. Subclasses (and
+    # mixins) don't declare slots, so instances still have a __dict__ for everything else
+    __slots__ = ("ts_node", "file_node_id", "ctx", "parent")
     ts_node: TSNode
     file_node_id: NodeId
     ctx: CodebaseContext
@@ -1,3 +1,4 @@
+from collections.abc import Callable
 from typing import TYPE_CHECKING, Generic, Self, TypeVar, Union
 
 from tree_sitter import Node as TSNode
@@ -58,24 +59,62 @@ class Importable(Expression[Parent], HasName, Generic[Parent]):
         Note:
             This method can be called as both a property or a method. If used as a property, it is equivalent to invoking it without arguments.
         """
+        if max_depth is not None and max_depth > 1:
+            return sort_editables((dep for dep, _ in self.dependency_closure(usage_types=usage_types, max_depth=max_depth)), by_file=True)
+
         # Get direct dependencies for this symbol and its descendants
         avoid = set(self.descendant_symbols)
         deps = []
         for symbol in self.descendant_symbols:
             deps.extend(filter(lambda x: x not in avoid, symbol._get_dependencies(usage_types)))
+        return sort_editables(deps, by_file=True)
 
-        if max_depth is not None and max_depth > 1:
-            # For max_depth > 1, recursively collect dependencies
-            seen = set(deps)
-            for dep in list(deps):  # Create a copy of deps to iterate over
-                if isinstance(dep, Importable):
-                    next_deps = dep.dependencies(usage_types=usage_types, max_depth=max_depth - 1)
-                    for next_dep in next_deps:
-                        if next_dep not in seen:
-                            seen.add(next_dep)
-                            deps.append(next_dep)
+    @reader(cache=False)
+    def dependency_closure(self, usage_types: UsageType | None = UsageType.DIRECT, max_depth: int | None = None) -> list[tuple[Union["Symbol", "Import"], int]]:
+        """Returns every symbol this symbol transitively depends on, along with its distance from this symbol.
 
-        return sort_editables(deps, by_file=True)
+        The traversal is breadth first, so each dependency is reported once at the shortest depth it can be reached at.
+        Results (and the direct dependencies of every visited symbol) are memoized until the graph changes.
+
+        Args:
+            usage_types (UsageType | None): The types of dependencies to follow. Defaults to UsageType.DIRECT.
+            max_depth (int | None): Maximum depth to traverse. Defaults to None (the full closure).
+
+        Returns:
+            list[tuple[Union[Symbol, Import], int]]: (dependency, depth) pairs ordered by depth, where direct dependencies
+                have a depth of 1.
+        """
+        return self._closure("dependencies", usage_types, max_depth, lambda node: node.dependencies(usage_types=usage_types) if isinstance(node, Importable) else [])
+
+    @noapidoc
+    def _closure(self, kind: str, usage_types: UsageType | None, max_depth: int | None, get_neighbours: Callable[["Importable"], list["Importable"]]) -> list[tuple["Importable", int]]:
+        """Breadth first traversal over memoized neighbour lists, cached in the context for the current graph generation"""
+        cache = self.ctx.get_closure_cache()
+        key = (kind, self.node_id, usage_types, max_depth)
+        if (closure := cache.get(key)) is None:
+
+            def neighbours(node_id: NodeId) -> list[tuple[NodeId, int]]:
+                neighbours_key = (kind, node_id, usage_types, 1)
+                if (ret := cache.get(neighbours_key)) is None:
+                    ret = cache[neighbours_key] = [(neighbour.node_id, 1) for neighbour in get_neighbours(self.ctx.get_node(node_id))]
+                return ret
+
+            closure = []
+            seen = set()
+            frontier = [self.node_id]
+            depth = 0
+            while frontier and (max_depth is None or depth < max_depth):
+                depth += 1
+                next_frontier = []
+                for node_id in frontier:
+                    for neighbour_id, _ in neighbours(node_id):
+                        if neighbour_id not in seen:
+                            seen.add(neighbour_id)
+                            closure.append((neighbour_id, depth))
+                            next_frontier.append(neighbour_id)
+                frontier = next_frontier
+            cache[key] = closure
+        return [(self.ctx.get_node(node_id), depth) for node_id, depth in closure]
 
     @reader(cache=False)
     @noapidoc
@@ -41,6 +41,23 @@ class Usable(Importable[Parent], Generic[Parent]):
             symbol_usages.append(usage.usage_symbol.parent_symbol)
         return list(dict.fromkeys(symbol_usages))
 
+    @reader(cache=False)
+    def usage_closure(self, usage_types: UsageType | None = None, max_depth: int | None = None) -> list[tuple[Import | Symbol | Export, int]]:
+        """Returns every symbol that transitively uses this symbol, along with its distance from this symbol.
+
+        The traversal is breadth first over `symbol_usages`, so each symbol is reported once at the shortest depth it can be
+        reached at. Results are memoized until the graph changes.
+
+        Args:
+            usage_types (UsageType | None): The types of usages to follow. Defaults to any.
+            max_depth (int | None): Maximum depth to traverse. Defaults to None (the full closure).
+
+        Returns:
+            list[tuple[Import | Symbol | Export, int]]: (symbol, depth) pairs ordered by depth, where direct usages have a
+                depth of 1.
+        """
+        return self._closure("usages", usage_types, max_depth, lambda node: node.symbol_usages(usage_types=usage_types) if isinstance(node, Usable) else [])
+
     @proxy_property
     @reader(cache=False)
     def usages(self, usage_types: UsageType | None = None) -> list[Usage]:
@@ -65,6 +82,8 @@ class Usable(Importable[Parent], Generic[Parent]):
             raise ValueError(msg)
 
         assert self.node_id is not None
+        # With exp_lazy_graph, only the files that mention this name can use it, so only those are parsed
+        self.ctx.load_lazy_files_referencing(getattr(self, "name", None))
         usages_to_return = []
         in_edges = self.ctx.in_edges(self.node_id)
         for edge in in_edges:
@@ -69,6 +69,8 @@ class Symbol(Usable[Statement["CodeBlock[Parent, ...]"]], Generic[Parent, TCodeB
         self.parse(ctx)
         if isinstance(self, HasBlock):
             self.code_block.parse()
+        if self.is_top_level:
+            ctx.index_symbol(self)
 
     def __rich_repr__(self) -> rich.repr.Result:
         yield escape(self.filepath) + "::" + (self.full_name if self.full_name else "<no name>")
@@ -7,6 +7,7 @@ from codegen.sdk.core.dataclasses.usage import UsageKind
 from codegen.sdk.core.interfaces.has_name import HasName
 from codegen.sdk.core.symbol_groups.collection import Collection
 from codegen.sdk.enums import EdgeType
+from codegen.sdk.extensions.utils import uncache_attributes
 
 if TYPE_CHECKING:
     from collections.abc import Iterator
@@ -46,8 +47,7 @@ class Parents(Collection["TType", Parent], Generic[TType, Parent]):
                 self.ctx.add_edge(dest.node_id, resolution[0].node_id, type=EdgeType.SUBCLASS)
             else:
                 self._log_parse("%r is ambiguous with possibilities: %r.", superclass, resolution)
-        self.parent.__dict__.pop("superclasses", None)
-        self.parent.__dict__.pop("constructor", None)
+        uncache_attributes(self.parent, "superclasses", "constructor")
 
     def _compute_dependencies(self, usage_type: UsageKind = UsageKind.SUBCLASS, dest: HasName | None = None) -> None:
         if dest is None:
@@ -64,6 +64,9 @@ def reader(wrapped: Callable[P, T] | None = None, *, cache: bool | None = None)
 
         if autocommit.state in (AutoCommitState.Special, AutoCommitState.Committing):
             return run_func()
+        if instance.ctx.read_only:
+            # Nothing can be pending, skip the locking and update checks
+            return wrapped(*args, **kwargs)
         if num_args > 0:
             if cache:
                 raise NotImplementedError("Cache doesn't support functions with arguments")
@@ -171,6 +174,8 @@ def update_dict(seen: set["Editable"], obj: "Editable", new_obj: "Editable"):
     #         update_child(v, new_value)
     assert new_obj.__class__ == obj.__class__
     obj.__dict__ = new_obj.__dict__
+    for name in Editable.__slots__:
+        setattr(obj, name, getattr(new_obj, name))
     assert new_obj.ts_node == obj.ts_node
     assert new_obj.is_same_version(obj)
     assert not obj.is_outdated
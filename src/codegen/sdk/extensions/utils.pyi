@@ -1,4 +1,4 @@
-from collections.abc import Generator, Iterable
+from collections.abc import Callable, Generator, Iterable
 from functools import cached_property as functools_cached_property
 from functools import lru_cache as functools_lru_cache
 
@@ -24,4 +24,9 @@ cached_property = functools_cached_property
 lru_cache = functools_lru_cache
 
 def uncache_all(): ...
+def uncache_files(file_node_ids: Iterable[int]) -> None: ...
+def uncache_attributes(instance: object, *names: str) -> None: ...
+def evict_files(file_node_ids: Iterable[int]) -> int: ...
+def set_cache_listener(listener: Callable[[int], None] | None) -> None: ...
+def verify_uncache() -> list[tuple[object, str]]: ...
 def is_descendant_of(node: TSNode, possible_parent: TSNode) -> bool: ...
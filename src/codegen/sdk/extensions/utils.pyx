@@ -1,4 +1,4 @@
-from collections import Counter
+from collections import Counter, defaultdict
 from collections.abc import Generator, Iterable
 from functools import cached_property as functools_cached_property
 from functools import lru_cache as functools_lru_cache
@@ -109,20 +109,53 @@ def find_first_descendant(node: TSNode, type_names: list[str], max_depth: int |
     return find(node)
 
 
-to_uncache = []
+# Cached properties by the node id of the file their instance belongs to (None for instances outside of any file).
+# Each list is flat (instance, name, instance, name, ...), which avoids allocating a tuple for every cached value
+to_uncache = defaultdict(list)
 lru_caches = []
 counter = Counter()
+# Called with the file node id whenever a cached property of an instance in that file is computed, see set_cache_listener
+cache_listener = None
 
 
 class cached_property(functools_cached_property):
+    """functools.cached_property that stores the value as a plain attribute, without going through `instance.__dict__`.
+
+    CPython (3.11+) keeps the attributes of an instance inline, in a layout whose keys are shared by every instance of the
+    class, until its `__dict__` is requested. functools.cached_property requests it on every first access, which gives
+    each instance with a cached value a dict of its own.
+    """
+
     def __get__(self, instance, owner=None):
-        ret = super().__get__(instance)
-        if instance is not None:
-            to_uncache.append((instance, self.attrname))
-            counter[self.attrname] += 1
+        if instance is None:
+            return self
+        # Only called while the value is not cached, since cached values shadow this (non-data) descriptor
+        ret = self.func(instance)
+        object.__setattr__(instance, self.attrname, ret)
+        file_node_id = getattr(instance, "file_node_id", None)
+        entries = to_uncache[file_node_id]
+        entries.append(instance)
+        entries.append(self.attrname)
+        counter[self.attrname] += 1
+        if cache_listener is not None and file_node_id is not None:
+            cache_listener(file_node_id)
         return ret
 
 
+def uncache_attributes(instance, *names):
+    """Clears the given cached properties of a single instance, if they are cached"""
+    for name in names:
+        try:
+            object.__delattr__(instance, name)
+        except AttributeError:
+            pass
+
+
+def set_cache_listener(listener):
+    global cache_listener
+    cache_listener = listener
+
+
 def lru_cache(func=None, *, maxsize=128, typed=False):
     """A wrapper around functools.lru_cache that tracks the cached function so that its cache
     can be cleared later via uncache_all().
@@ -137,17 +170,76 @@ def lru_cache(func=None, *, maxsize=128, typed=False):
     return cached_func
 
 
-def uncache_all():
-    for instance, name in to_uncache:
+def _uncache(entries):
+    for i in range(0, len(entries), 2):
         try:
-            del instance.__dict__[name]
-        except KeyError:
+            object.__delattr__(entries[i], entries[i + 1])
+        except AttributeError:
             pass
 
+
+def uncache_all():
+    for entries in to_uncache.values():
+        _uncache(entries)
+    to_uncache.clear()
+
     for cached_func in lru_caches:
         cached_func.cache_clear()
 
 
+def uncache_files(file_node_ids):
+    """Like uncache_all, but only clears the cached properties of instances in the given files.
+
+    Cached properties of instances that don't belong to any file, and all lru caches, are always cleared.
+    """
+    for file_node_id in (*file_node_ids, None):
+        if (entries := to_uncache.pop(file_node_id, None)) is not None:
+            _uncache(entries)
+
+    for cached_func in lru_caches:
+        cached_func.cache_clear()
+
+
+def evict_files(file_node_ids):
+    """Clears the cached properties of instances in the given files only, returning how many values were dropped.
+
+    Unlike uncache_files this is not an invalidation: nothing outside of the files is cleared.
+    """
+    released = 0
+    for file_node_id in file_node_ids:
+        if (entries := to_uncache.pop(file_node_id, None)) is not None:
+            released += len(entries) // 2
+            _uncache(entries)
+    return released
+
+
+def verify_uncache():
+    """Returns every (instance, name) whose cached value differs from the value computed after a full uncache_all().
+
+    Used to check that a scoped uncache_files() did not leave stale values behind.
+    """
+    cached = []
+    for entries in to_uncache.values():
+        for i in range(0, len(entries), 2):
+            instance, name = entries[i], entries[i + 1]
+            if name in instance.__dict__:
+                cached.append((instance, name, instance.__dict__[name]))
+    uncache_all()
+
+    stale = []
+    for instance, name, value in cached:
+        # Proxied properties are recomputed on every call, so they can't go stale
+        if type(value).__name__ == "ProxyProperty":
+            continue
+        try:
+            if getattr(instance, name) != value:
+                stale.append((instance, name))
+        except Exception:
+            # The instance may no longer be valid (e.g. it was removed from the graph)
+            continue
+    return stale
+
+
 def report():
     print(tabulate(counter.most_common(10)))
 
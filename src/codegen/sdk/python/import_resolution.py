@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 import sys
+from functools import lru_cache
 from typing import TYPE_CHECKING
 
 from codegen.sdk.core.autocommit import reader
@@ -26,6 +27,19 @@ if TYPE_CHECKING:
 logger = get_logger(__name__)
 
 
+@lru_cache(maxsize=32)
+def _repo_relative_resolve_paths(repo_path: str, resolve_paths: tuple[str, ...]) -> tuple[str, ...]:
+    """Repo-relative forms of the given import resolution paths (in order), dropping the ones outside the repo"""
+    relative_paths = []
+    for resolve_path in resolve_paths:
+        path = os.path.realpath(os.path.join(repo_path, resolve_path))
+        if path == repo_path:
+            relative_paths.append("")
+        elif path.startswith(repo_path + os.sep):
+            relative_paths.append(os.path.relpath(path, repo_path))
+    return tuple(relative_paths)
+
+
 @py_apidoc
 class PyImport(Import["PyFile"]):
     """Extends Import for Python codebases."""
@@ -116,11 +130,11 @@ class PyImport(Import["PyFile"]):
                     return ImportResolution(from_file=file, symbol=None, imports_file=True)
 
             # =====[ Default path ]=====
-            if file := self.ctx.get_file(filepath):
+            if file := self._get_file(filepath):
                 return ImportResolution(from_file=file, symbol=None, imports_file=True)
 
             filepath = filepath.replace(".py", "/__init__.py")
-            if file := self.ctx.get_file(filepath):
+            if file := self._get_file(filepath):
                 # TODO - I think this is another edge case, due to `dao/__init__.py` etc.
                 # You can't do `from a.b.c import foo` => `foo.utils.x` right now since `foo` is just a file...
                 return ImportResolution(from_file=file, symbol=None, imports_file=True)
@@ -136,7 +150,7 @@ class PyImport(Import["PyFile"]):
 
             # =====[ Check if `module.py` file exists in the graph ]=====
             filepath = os.path.join(base_path, filepath)
-            if file := self.ctx.get_file(filepath):
+            if file := self._get_file(filepath):
                 symbol = file.get_node_by_name(symbol_name)
                 if symbol is None:
                     if file.get_node_from_wildcard_chain(symbol_name):
@@ -165,7 +179,7 @@ class PyImport(Import["PyFile"]):
                         return ImportResolution(from_file=from_file, symbol=symbol)
 
             # =====[ Check if `module/__init__.py` file exists in the graph ]=====
-            if from_file := self.ctx.get_file(filepath):
+            if from_file := self._get_file(filepath):
                 symbol = from_file.get_node_by_name(symbol_name)
                 if symbol is None:
                     if from_file.get_node_from_wildcard_chain(symbol_name):
@@ -209,10 +223,11 @@ class PyImport(Import["PyFile"]):
 
         Returns either None or the SourceFile.
         """
-        for resolve_path in resolve_paths:
+        # Paths outside the repo can't contain files in the graph, so they are skipped up front
+        for resolve_path in _repo_relative_resolve_paths(self.ctx.repo_path, tuple(resolve_paths)):
             filepath_new: str = os.path.join(resolve_path, filepath)
             try:
-                file = self.ctx.get_file(filepath_new)
+                file = self._get_file(filepath_new)
             except AssertionError as e:
                 file = None
             if file:
@@ -220,6 +235,20 @@ class PyImport(Import["PyFile"]):
 
         return None
 
+    @noapidoc
+    def _get_file(self, filepath: str) -> SourceFile | None:
+        """Looks up a file probed by `resolve_import`.
+
+        Probes are plain repo-relative paths built from the module name, which are looked up directly in `filepath_idx`
+        instead of going through the `Path.resolve()` in `ctx.get_file`. Anything else (including files that have not
+        been parsed yet with `exp_lazy_graph`) falls back to `ctx.get_file`.
+        """
+        normalized = os.path.normpath(filepath)
+        if os.path.isabs(normalized) or normalized.startswith("..") or normalized in self.ctx.lazy_files:
+            return self.ctx.get_file(filepath)
+        node_id = self.ctx.filepath_idx.get(normalized)
+        return None if node_id is None else self.ctx.get_node(node_id)
+
     @noapidoc
     @reader
     def _relative_to_absolute_import(self, relative_import: str) -> str:
@@ -1,4 +1,6 @@
 import os
+import threading
+from itertools import pairwise
 from os import PathLike
 from pathlib import Path
 from typing import Union
@@ -6,7 +8,7 @@ from typing import Union
 import tree_sitter_javascript as ts_javascript
 import tree_sitter_python as ts_python
 import tree_sitter_typescript as ts_typescript
-from tree_sitter import Language, Parser
+from tree_sitter import Language, Parser, Tree
 from tree_sitter import Node as TSNode
 
 from codegen.sdk.output.utils import stylize_error
@@ -69,10 +71,85 @@ def get_lang_by_filepath_or_extension(filepath_or_extension: str = ".py") -> Lan
     return _ts_parser_factory.extension_to_lang[extension]
 
 
-def parse_file(filepath: PathLike, content: str) -> TSNode:
-    parser = get_parser_by_filepath_or_extension(filepath)
-    ts_node = parser.parse(bytes(content, "utf-8")).root_node
-    return ts_node
+_thread_local = threading.local()
+
+
+def get_thread_local_parser(filepath_or_extension: str | PathLike = ".py") -> Parser:
+    """Returns a parser owned by the calling thread.
+
+    tree-sitter parsers are not safe to share between threads, so worker threads must not use the global parsers.
+    """
+    parsers: dict[str, Parser] | None = getattr(_thread_local, "parsers", None)
+    if parsers is None:
+        parsers = _thread_local.parsers = {}
+    extension = to_extension(filepath_or_extension)
+    if extension not in _ts_parser_factory.extension_to_lang:
+        extension = ".py"
+    if extension not in parsers:
+        parsers[extension] = Parser(_ts_parser_factory.extension_to_lang[extension])
+    return parsers[extension]
+
+
+def parse_tree(filepath: PathLike, content: str | bytes, old_tree: Tree | None = None, thread_local: bool = False) -> Tree:
+    """Parses content into a tree. If old_tree is provided (and has been edited to match content), unchanged parts of it are reused."""
+    parser = get_thread_local_parser(filepath) if thread_local else get_parser_by_filepath_or_extension(filepath)
+    if isinstance(content, str):
+        content = bytes(content, "utf-8")
+    if old_tree is not None:
+        return parser.parse(content, old_tree)
+    return parser.parse(content)
+
+
+def edit_tree(tree: Tree, old_content: bytes, new_content: bytes, edits: list[tuple[int, int, bytes]]) -> Tree | None:
+    """Applies the given edits to tree (parsed from old_content) in place, so it can be passed to parse_tree as the old tree.
+
+    Edits are (start_byte, old_end_byte, new_bytes) in the order they were made, and must be non-overlapping and back to front
+    (as the transaction manager applies them) so they can all be expressed in old_content coordinates.
+    Returns None if the edits are not in that form or do not turn old_content into new_content, in which case a full parse is needed.
+    """
+    for (prev_start, _, _), (_, end, _) in pairwise(edits):
+        if end > prev_start:
+            return None
+    pieces = []
+    pos = 0
+    for start, end, new_bytes in reversed(edits):
+        pieces.append(old_content[pos:start])
+        pieces.append(new_bytes)
+        pos = end
+    pieces.append(old_content[pos:])
+    if b"".join(pieces) != new_content:
+        return None
+
+    # Compute (row, column) points for every offset in a single pass over old_content
+    points: dict[int, tuple[int, int]] = {}
+    row, line_start, pos = 0, 0, 0
+    for offset in sorted({offset for start, end, _ in edits for offset in (start, end)}):
+        newlines = old_content.count(b"\n", pos, offset)
+        if newlines:
+            row += newlines
+            line_start = old_content.rfind(b"\n", pos, offset) + 1
+        points[offset] = (row, offset - line_start)
+        pos = offset
+
+    for start, end, new_bytes in edits:
+        start_point = points[start]
+        if (newlines := new_bytes.count(b"\n")) > 0:
+            new_end_point = (start_point[0] + newlines, len(new_bytes) - new_bytes.rfind(b"\n") - 1)
+        else:
+            new_end_point = (start_point[0], start_point[1] + len(new_bytes))
+        tree.edit(
+            start_byte=start,
+            old_end_byte=end,
+            new_end_byte=start + len(new_bytes),
+            start_point=start_point,
+            old_end_point=points[end],
+            new_end_point=new_end_point,
+        )
+    return tree
+
+
+def parse_file(filepath: PathLike, content: str, thread_local: bool = False) -> TSNode:
+    return parse_tree(filepath, content, thread_local=thread_local).root_node
 
 
 def print_errors(filepath: PathLike, content: str) -> None:
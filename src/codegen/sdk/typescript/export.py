@@ -13,7 +13,7 @@ from codegen.sdk.core.interfaces.chainable import Chainable
 from codegen.sdk.core.interfaces.has_value import HasValue
 from codegen.sdk.core.interfaces.importable import Importable
 from codegen.sdk.enums import EdgeType, ImportType, NodeType
-from codegen.sdk.extensions.utils import cached_property
+from codegen.sdk.extensions.utils import cached_property, uncache_attributes
 from codegen.sdk.typescript.assignment import TSAssignment
 from codegen.sdk.typescript.class_definition import TSClass
 from codegen.sdk.typescript.enum_definition import TSEnum
@@ -230,8 +230,7 @@ class TSExport(Export["Collection[TSExport, ExportStatement[TSExport]]"], HasVal
             self.ctx.add_edge(self.node_id, self.file_node_id, type=EdgeType.EXPORT)
         if self.is_wildcard_export():
             for file in self.file.importers:
-                file.__dict__.pop("valid_symbol_names", None)
-                file.__dict__.pop("valid_import_names", None)
+                uncache_attributes(file, "valid_symbol_names", "valid_import_names")
 
     @reader
     def is_named_export(self) -> bool:
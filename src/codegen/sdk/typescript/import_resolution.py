@@ -28,6 +28,12 @@ if TYPE_CHECKING:
     from codegen.sdk.typescript.statements.import_statement import TSImportStatement
 
 
+# Files a directory import resolves to, in order of precedence
+_INDEX_FILES = ("index.ts", "index.js", "index.tsx", "index.jsx")
+# Extensions tried (in order) on both the module path as written and the module path without its extension
+_MODULE_EXTENSIONS = ("", ".ts", ".d.ts", ".tsx", ".d.tsx", ".js", ".jsx")
+
+
 @ts_apidoc
 class TSImport(Import["TSFile"], Exportable):
     """Extends Import for TypeScript codebases."""
@@ -222,55 +228,20 @@ class TSImport(Import["TSFile"], Exportable):
 
             # Get the import source path
             import_source = self.module.source.strip('"').strip("'") if self.module else ""
-
-            # Try to resolve the import using the tsconfig paths
-            if self.file.ts_config:
-                import_source = self.file.ts_config.translate_import_path(import_source)
-
-            # Check if need to resolve relative import path to absolute path
-            relative_import = False
-            if import_source.startswith("."):
-                relative_import = True
-
-            # Insert base path
-            # This has the happen before the relative path resolution
-            if not import_source.startswith(base_path):
-                import_source = os.path.join(base_path, import_source)
-
-            # If the import is relative, convert it to an absolute path
-            if relative_import:
-                import_source = self._relative_to_absolute_import(import_source)
-            else:
-                import_source = os.path.normpath(import_source)
-
-            # covers the case where the import is from a directory ex: "import { postExtract } from './post'"
-            import_name = import_source.split("/")[-1]
-            if "." not in import_name:
-                possible_paths = ["index.ts", "index.js", "index.tsx", "index.jsx"]
-                for p_path in possible_paths:
-                    if self.ctx.to_absolute(os.path.join(import_source, p_path)).exists():
-                        import_source = os.path.join(import_source, p_path)
-                        break
-
-            # Loop through all extensions and try to find the file
-            extensions = ["", ".ts", ".d.ts", ".tsx", ".d.tsx", ".js", ".jsx"]
-            # Try both filename with and without extension
-            for import_source_base in (import_source, os.path.splitext(import_source)[0]):
-                for extension in extensions:
-                    import_source_ext = import_source_base + extension
-                    if file := self.ctx.get_file(import_source_ext):
-                        if self.is_module_import():
-                            return ImportResolution(from_file=file, symbol=None, imports_file=True)
-                        else:
-                            # If the import is a named import, resolve to the named export in the file
-                            if self.symbol_name is None:
-                                return ImportResolution(from_file=file, symbol=None, imports_file=True)
-                            export_symbol = file.get_export(export_name=self.symbol_name.source)
-                            if export_symbol is None:
-                                # If the named export is not found, it is importing a module re-export.
-                                # In this case, resolve to the file itself and dynamically resolve the symbol later.
-                                return ImportResolution(from_file=file, symbol=None, imports_file=True)
-                            return ImportResolution(from_file=file, symbol=export_symbol)
+            filepath = self._resolve_module_filepath(import_source, base_path)
+            if filepath is not None and (file := self._get_file(filepath)):
+                if self.is_module_import():
+                    return ImportResolution(from_file=file, symbol=None, imports_file=True)
+                else:
+                    # If the import is a named import, resolve to the named export in the file
+                    if self.symbol_name is None:
+                        return ImportResolution(from_file=file, symbol=None, imports_file=True)
+                    export_symbol = file.get_export(export_name=self.symbol_name.source)
+                    if export_symbol is None:
+                        # If the named export is not found, it is importing a module re-export.
+                        # In this case, resolve to the file itself and dynamically resolve the symbol later.
+                        return ImportResolution(from_file=file, symbol=None, imports_file=True)
+                    return ImportResolution(from_file=file, symbol=export_symbol)
 
             # If the imported file is not found, treat it as an external module
             return None
@@ -278,6 +249,68 @@ class TSImport(Import["TSFile"], Exportable):
             # Codebase is probably trying to import file from outside repo
             return None
 
+    @noapidoc
+    def _resolve_module_filepath(self, import_source: str, base_path: str) -> str | None:
+        """Resolves a module specifier to the relative path of the file it points at, if that file is in the codebase.
+
+        Candidates are looked up in `filepath_idx` (and the not yet parsed files of a lazy graph) instead of on disk.
+        Results are cached per tsconfig, specifier and base path (plus the importing directory for relative specifiers),
+        until a file is added to or removed from the codebase.
+        """
+        ts_config = self.file.ts_config
+        cache_key = (ts_config.config_file.filepath if ts_config else None, import_source, base_path, os.path.dirname(self.to_file.file_path) if import_source.startswith(".") else None)
+        cache = self.ctx.module_resolution_cache
+        if cache_key in cache:
+            return cache[cache_key]
+
+        # Try to resolve the import using the tsconfig paths
+        translated = ts_config.translate_import_path(import_source) if ts_config else import_source
+
+        # Check if need to resolve relative import path to absolute path
+        relative_import = False
+        if translated.startswith("."):
+            relative_import = True
+
+        # Insert base path
+        # This has the happen before the relative path resolution
+        module_path = translated
+        if not module_path.startswith(base_path):
+            module_path = os.path.join(base_path, module_path)
+
+        # If the import is relative, convert it to an absolute path
+        if relative_import:
+            module_path = self._relative_to_absolute_import(module_path)
+        else:
+            module_path = os.path.normpath(module_path)
+
+        filepath = None
+        # covers the case where the import is from a directory ex: "import { postExtract } from './post'"
+        if "." not in module_path.split("/")[-1]:
+            for index_file in _INDEX_FILES:
+                if self.ctx.has_filepath(candidate := os.path.join(module_path, index_file)):
+                    module_path = candidate
+                    break
+        # Try both filename with and without extension
+        for module_path_base in (module_path, os.path.splitext(module_path)[0]):
+            for extension in _MODULE_EXTENSIONS:
+                if self.ctx.has_filepath(candidate := module_path_base + extension):
+                    filepath = candidate
+                    break
+            if filepath is not None:
+                break
+
+        # An alias translated to a relative path depends on the importing directory, which is not part of the key
+        if relative_import == import_source.startswith("."):
+            cache[cache_key] = filepath
+        return filepath
+
+    @noapidoc
+    def _get_file(self, filepath: str) -> TSFile | None:
+        """Looks up a file resolved by `_resolve_module_filepath` (parsing it first if the graph is lazy)"""
+        if (node_id := self.ctx.filepath_idx.get(filepath)) is not None:
+            return self.ctx.get_node(node_id)
+        return self.ctx.get_file(filepath)
+
     @noapidoc
     @reader
     def _relative_to_absolute_import(self, relative_import: str) -> str:
@@ -0,0 +1,89 @@
+"""JSON baselines for the pytest-benchmark suite.
+
+Run the benchmarks with `--benchmark-json`, then record the results as the baseline, or check them against it:
+
+    uv run pytest tests/unit/codegen/sdk/benchmark --benchmark-only --benchmark-json=build/benchmark.json
+    uv run python -m tests.shared.benchmark.baseline update build/benchmark.json tests/unit/codegen/sdk/benchmark/baselines/<runner>.json
+    uv run python -m tests.shared.benchmark.baseline check build/benchmark.json tests/unit/codegen/sdk/benchmark/baselines/<runner>.json
+
+Baselines only hold the statistics that are compared, keyed by the full name of each benchmark, so they stay small and
+diff well. Timings are only comparable on the same kind of machine, so keep one baseline per runner.
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+# Statistic compared against the baseline. The median is less sensitive to outliers from a noisy runner than the mean
+DEFAULT_STAT = "median"
+# Allowed slowdown relative to the baseline before a benchmark counts as a regression
+DEFAULT_TOLERANCE = 0.2
+BASELINE_STATS = ("min", "median", "mean", "stddev", "rounds")
+
+
+@dataclass(frozen=True)
+class Regression:
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float("inf")
+
+    def __str__(self) -> str:
+        return f"{self.name}: {self.baseline:.6f}s -> {self.current:.6f}s ({self.ratio:.2f}x)"
+
+
+def load_results(path: Path) -> dict[str, dict[str, float]]:
+    """Statistics of every benchmark in a `--benchmark-json` output file, keyed by full name"""
+    data = json.loads(path.read_text())
+    return {bench["fullname"]: {stat: bench["stats"][stat] for stat in BASELINE_STATS} for bench in data["benchmarks"]}
+
+
+def load_baseline(path: Path) -> dict[str, dict[str, float]]:
+    return json.loads(path.read_text())["benchmarks"]
+
+
+def save_baseline(path: Path, results: dict[str, dict[str, float]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"benchmarks": dict(sorted(results.items()))}, indent=2) + "\n")
+
+
+def compare(results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]], stat: str = DEFAULT_STAT, tolerance: float = DEFAULT_TOLERANCE) -> list[Regression]:
+    """Benchmarks that got more than `tolerance` slower than the baseline. Benchmarks missing from either side are ignored"""
+    regressions = []
+    for name, stats in results.items():
+        if (base := baseline.get(name)) is not None and stats[stat] > base[stat] * (1 + tolerance):
+            regressions.append(Regression(name, base[stat], stats[stat]))
+    return sorted(regressions, key=lambda regression: regression.ratio, reverse=True)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=["check", "update"])
+    parser.add_argument("results", type=Path, help="Output of pytest --benchmark-json")
+    parser.add_argument("baseline", type=Path, help="Baseline JSON file")
+    parser.add_argument("--stat", default=DEFAULT_STAT, choices=BASELINE_STATS[:3])
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    results = load_results(args.results)
+    if args.command == "update":
+        # Keep baselines of benchmarks that weren't part of this run (e.g. large sizes)
+        baseline = load_baseline(args.baseline) if args.baseline.exists() else {}
+        save_baseline(args.baseline, baseline | results)
+        print(f"Recorded {len(results)} benchmarks in {args.baseline}")
+        return 0
+
+    regressions = compare(results, load_baseline(args.baseline), stat=args.stat, tolerance=args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    print(f"{len(regressions)} of {len(results)} benchmarks regressed by more than {args.tolerance:.0%} ({args.stat})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""Deterministic synthetic repos for performance benchmarks.
+
+Module `i` imports from a few earlier modules. Targets are skewed towards the first modules, so (like in real repos) a
+handful of core modules are imported almost everywhere while most modules have few importers. Every module defines
+functions that call the imported functions, and a class that may subclass an imported class, so import resolution,
+usages and superclass dependencies all have work to do.
+"""
+
+import random
+
+from codegen.shared.enums.programming_language import ProgrammingLanguage
+
+FUNCTIONS_PER_MODULE = 3
+DEFAULT_FAN_OUT = 4
+
+
+def _get_imports(rng: random.Random, index: int, fan_out: int) -> list[int]:
+    if index == 0:
+        return []
+    # Squaring a uniform sample skews it towards 0, i.e. towards the core modules
+    return sorted({int(index * rng.random() ** 2) for _ in range(fan_out)})
+
+
+def _python_module(rng: random.Random, index: int, fan_out: int) -> str:
+    imports = _get_imports(rng, index, fan_out)
+    funcs = {target: f"func_{target}_{rng.randrange(FUNCTIONS_PER_MODULE)}" for target in imports}
+    lines = [f"from pkg.mod_{target} import Class{target}, {funcs[target]}" for target in imports]
+    lines.append("")
+    calls = " + ".join(f"{func}(x)" for func in funcs.values()) or "x"
+    for func in range(FUNCTIONS_PER_MODULE):
+        lines += ["", f"def func_{index}_{func}(x):", f"    return {calls} + {func}", ""]
+    base = f"(Class{imports[-1]})" if imports and rng.random() < 0.5 else ""
+    lines += ["", f"class Class{index}{base}:", "    def method(self, x):", f"        return func_{index}_0(x)", ""]
+    return "\n".join(lines)
+
+
+def _typescript_module(rng: random.Random, index: int, fan_out: int) -> str:
+    imports = _get_imports(rng, index, fan_out)
+    funcs = {target: f"func_{target}_{rng.randrange(FUNCTIONS_PER_MODULE)}" for target in imports}
+    lines = [f'import {{ Class{target}, {funcs[target]} }} from "./mod_{target}";' for target in imports]
+    lines.append("")
+    calls = " + ".join(f"{func}(x)" for func in funcs.values()) or "x"
+    for func in range(FUNCTIONS_PER_MODULE):
+        lines += [f"export function func_{index}_{func}(x: number): number {{", f"  return {calls} + {func};", "}", ""]
+    base = f" extends Class{imports[-1]}" if imports and rng.random() < 0.5 else ""
+    lines += [f"export class Class{index}{base} {{", "  method(x: number): number {", f"    return func_{index}_0(x);", "  }", "}", ""]
+    return "\n".join(lines)
+
+
+def module_path(index: int, programming_language: ProgrammingLanguage) -> str:
+    if programming_language == ProgrammingLanguage.TYPESCRIPT:
+        return f"src/mod_{index}.ts"
+    return f"pkg/mod_{index}.py"
+
+
+def generate_repo(num_files: int, programming_language: ProgrammingLanguage = ProgrammingLanguage.PYTHON, fan_out: int = DEFAULT_FAN_OUT, seed: int = 0) -> dict[str, str]:
+    """Generates the files of a synthetic repo, keyed by path. The same arguments always produce the same repo"""
+    rng = random.Random(seed)
+    generate = _typescript_module if programming_language == ProgrammingLanguage.TYPESCRIPT else _python_module
+    files = {module_path(i, programming_language): generate(rng, i, fan_out) for i in range(num_files)}
+    if programming_language == ProgrammingLanguage.PYTHON:
+        files["pkg/__init__.py"] = ""
+    return files
+
+
+def edit_module(content: str, round: int) -> str:
+    """A body-only edit of a generated module, which is different for every round"""
+    return content.replace(" + 0", f" + {round + 100}", 1)
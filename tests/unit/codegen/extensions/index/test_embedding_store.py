@@ -0,0 +1,73 @@
+from pathlib import Path
+
+import numpy as np
+
+from codegen.extensions.index.embedding_store import EmbeddingStore, load_embeddings, normalize_embeddings, save_embeddings, top_k
+
+
+def test_normalize_embeddings() -> None:
+    E = normalize_embeddings([[3.0, 4.0], [0.0, 0.0]])
+    assert E.dtype == np.float32
+    assert np.allclose(E, [[0.6, 0.8], [0.0, 0.0]])
+    assert normalize_embeddings([]).shape[0] == 0
+
+
+def test_top_k_matches_full_sort() -> None:
+    rng = np.random.default_rng(0)
+    E = normalize_embeddings(rng.normal(size=(200, 16)))
+    queries = normalize_embeddings(rng.normal(size=(3, 16)))
+    results = top_k(E, queries, 5)
+    assert len(results) == 3
+    for query, result in zip(queries, results):
+        similarities = E @ query
+        expected = np.argsort(-similarities)[:5]
+        assert [idx for idx, _ in result] == expected.tolist()
+        assert np.allclose([score for _, score in result], similarities[expected])
+
+
+def test_top_k_more_than_available() -> None:
+    E = normalize_embeddings([[1.0, 0.0], [0.0, 1.0]])
+    assert [idx for idx, _ in top_k(E, normalize_embeddings([[1.0, 0.1]]), 10)[0]] == [0, 1]
+    assert top_k(normalize_embeddings([]), normalize_embeddings([[1.0, 0.0]]), 3) == [[]]
+
+
+def test_save_and_load_embeddings(tmpdir) -> None:
+    path = Path(tmpdir) / "index.npy"
+    E = normalize_embeddings([[1.0, 2.0], [3.0, 4.0]])
+    save_embeddings(path, E)
+    loaded = load_embeddings(path)
+    assert isinstance(loaded, np.memmap)
+    assert np.array_equal(loaded, E)
+    # Updates to the mapping never reach the file
+    loaded[0] = 0
+    assert np.array_equal(load_embeddings(path), E)
+
+
+def test_embedding_store_add_remove_compact() -> None:
+    store = EmbeddingStore(normalize_embeddings([[1.0, 0.0], [0.0, 1.0]]), ["a", "b"])
+    store.CHUNK_SIZE = 2
+    store.add(["c", "d", "e"], normalize_embeddings([[1.0, 1.0], [-1.0, 0.0], [0.0, -1.0]]))
+    # The base matrix plus two append chunks
+    assert store.num_segments == 3
+
+    # Replacing an item tombstones its old row
+    store.add(["a"], normalize_embeddings([[-1.0, 0.1]]))
+    store.remove(["b", "missing"])
+    assert len(store) == 4
+    results = store.search(normalize_embeddings([[0.0, 1.0], [-1.0, 0.0]]), 10)
+    assert [item for item, _ in results[0]] == ["c", "a", "d", "e"]
+    assert [item for item, _ in results[1]][:2] == ["d", "a"]
+
+    store.compact()
+    assert store.num_segments == 1
+    assert store.items.tolist() == ["c", "d", "e", "a"]
+    assert np.allclose(store.E[0], normalize_embeddings([[1.0, 1.0]])[0])
+    assert [item for item, _ in store.search(normalize_embeddings([[0.0, 1.0]]), 1)[0]] == ["c"]
+
+
+def test_embedding_store_starts_empty() -> None:
+    store = EmbeddingStore(normalize_embeddings([]), [])
+    assert store.search(normalize_embeddings([[1.0, 0.0]]), 3) == [[]]
+    store.add(["a"], normalize_embeddings([[1.0, 0.0]]))
+    assert [item for item, _ in store.search(normalize_embeddings([[1.0, 0.0]]), 3)[0]] == ["a"]
+    assert store.E.shape == (1, 2)
@@ -0,0 +1,42 @@
+from pathlib import Path
+
+from codegen.extensions.mcp.codebase_pool import CodebasePool
+from codegen.sdk.codebase.factory.get_session import get_codebase_session
+from codegen.shared.enums.programming_language import ProgrammingLanguage
+
+
+def test_codebase_pool_reuses_and_refreshes(tmpdir) -> None:
+    # language=python
+    content = """
+def foo():
+    pass
+"""
+    with get_codebase_session(tmpdir=tmpdir, files={"a.py": content}):
+        pool = CodebasePool()
+        codebase = pool.get(str(tmpdir), ProgrammingLanguage.PYTHON)
+        assert codebase.get_function("foo", optional=True) is not None
+        assert pool.get(str(tmpdir), "python") is codebase
+
+        # Changes on disk are applied to the pooled graph before it is served again
+        Path(tmpdir, "a.py").write_text("def bar():\n    pass\n")
+        Path(tmpdir, "b.py").write_text("def baz():\n    pass\n")
+        assert pool.get(str(tmpdir), ProgrammingLanguage.PYTHON) is codebase
+        assert codebase.get_function("foo", optional=True) is None
+        assert codebase.get_function("bar", optional=True) is not None
+        assert codebase.get_function("baz", optional=True) is not None
+
+        Path(tmpdir, "b.py").unlink()
+        pool.get(str(tmpdir), ProgrammingLanguage.PYTHON)
+        assert codebase.get_file("b.py", optional=True) is None
+
+
+def test_codebase_pool_evicts_over_budget(tmpdir) -> None:
+    with get_codebase_session(tmpdir=tmpdir, files={"a.py": "x = 1"}):
+        pool = CodebasePool(max_memory_bytes=0)
+        first = pool.get(str(tmpdir), ProgrammingLanguage.PYTHON)
+        assert len(pool) == 1
+        # The most recently used entry is always kept, even over budget
+        pool._entries[next(iter(pool._entries))].size_bytes = 1
+        pool.get(str(tmpdir), ProgrammingLanguage.TYPESCRIPT)
+        assert len(pool) == 1
+        assert pool.get(str(tmpdir), ProgrammingLanguage.PYTHON) is not first
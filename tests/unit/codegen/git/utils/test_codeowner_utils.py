@@ -0,0 +1,57 @@
+import itertools
+
+from codeowners import CodeOwners
+
+from codegen.git.utils.codeowner_utils import CodeOwnersIndex
+
+CODEOWNERS = """
+* @org/everyone
+*.py @py-owner
+/docs/ @docs-owner
+docs/*.md @md-owner
+/src/** @src-owner
+/src/generated/* @gen-owner
+build/ @build-owner
+**/tests/ @tests-owner
+/with\\ space/ @space-owner
+/src/x?.ts @x-owner
+"""
+
+
+def test_codeowners_index_matches_parser() -> None:
+    parser = CodeOwners(CODEOWNERS)
+    index = CodeOwnersIndex(parser)
+    segments = ["src", "docs", "build", "tests", "generated", "with space"]
+    filenames = ["x1.ts", "a.py", "readme.md", "build", "x.txt"]
+    for depth in range(4):
+        for dirs in itertools.product(segments, repeat=depth):
+            for filename in filenames:
+                filepath = "/".join([*dirs, filename])
+                assert index.of(filepath) == parser.of(filepath), filepath
+
+
+def test_codeowners_index_files_of() -> None:
+    index = CodeOwnersIndex(CodeOwners(CODEOWNERS))
+    index.add_path("src/main.py")
+    index.add_path("docs/index.md")
+    index.add_path("README")
+    assert index.files_of("@src-owner") == {"src/main.py"}
+    assert index.files_of("@md-owner") == {"docs/index.md"}
+    assert index.files_of("@org/everyone") == {"README"}
+    assert index.owners_of("src/generated/api.py") == {"@gen-owner"}
+
+    index.remove_path("src/main.py")
+    assert index.files_of("@src-owner") == set()
+    assert not index.has_path("src/main.py")
+
+
+def test_codeowners_index_other_parser() -> None:
+    class Parser:
+        paths = []
+
+        def of(self, filepath: str):
+            return [("TEAM", "@team")] if filepath == "file.py" else []
+
+    index = CodeOwnersIndex(Parser())
+    assert index.owners_of("file.py") == {"@team"}
+    assert index.owners_of("other.py") == set()
@@ -0,0 +1,64 @@
+import fnmatch
+
+import pytest
+
+from codegen.git.utils.path_matcher import compile_ignore_list, could_contain_subdirs
+from codegen.sdk.codebase.codebase_context import GLOBAL_FILE_IGNORE_LIST
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "src/main.py",
+        "node_modules/react/index.js",
+        "packages/app/node_modules/react/index.js",
+        ".git/HEAD",
+        "lib/semver.js",
+        "semver.js",
+        "dist/app.min.js",
+        "pkg@1.0.js",
+        "foo@bar/baz.py",
+        "build/compiled/out.js",
+        "src/vs/platform/contextview/browser/contextMenuService.ts",
+        ".yarn/releases/yarn.cjs",
+        "src/你好.py",
+    ],
+)
+def test_ignore_matcher_matches_fnmatch(path):
+    expected = any(fnmatch.fnmatch(path, pattern) or path.startswith(pattern) for pattern in GLOBAL_FILE_IGNORE_LIST)
+    assert compile_ignore_list(tuple(GLOBAL_FILE_IGNORE_LIST)).ignores_file(path) == expected
+
+
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        ("node_modules", True),
+        ("packages/app/node_modules", True),
+        ("build/compiled", True),
+        ("src", False),
+        # Only some of the files in here are ignored
+        ("foo@bar", False),
+    ],
+)
+def test_ignore_matcher_prunes_directories(path, expected):
+    assert compile_ignore_list(tuple(GLOBAL_FILE_IGNORE_LIST)).ignores_dir(path) == expected
+
+
+def test_ignore_matcher_empty():
+    matcher = compile_ignore_list(())
+    assert not matcher.ignores_file("a.py")
+    assert not matcher.ignores_dir("a")
+
+
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        ("src", True),
+        ("src/app", True),
+        ("src/lib", False),
+        ("tests", False),
+        ("s", False),
+    ],
+)
+def test_could_contain_subdirs(path, expected):
+    assert could_contain_subdirs(path, ("src/app", "src/main.py")) == expected
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 
 from codegen.git.models.codemod_context import CodemodContext
-from codegen.runner.models.codemod import GroupingConfig
+from codegen.runner.models.codemod import BranchConfig, GroupingConfig
+from codegen.runner.sandbox.repo import SandboxRepo
 from codegen.sdk.codebase.config import SessionOptions
 from codegen.sdk.codebase.flagging.code_flag import CodeFlag
 from codegen.sdk.codebase.flagging.groupers.enums import GroupBy
@@ -228,3 +229,25 @@ async def test_find_flag_groups_with_max_prs(executor: SandboxExecutor):
         grouping_config=GroupingConfig(group_by=GroupBy.FILE, max_prs=0),
     )
     assert len(groups) == 0
+
+
+@pytest.mark.asyncio
+async def test_execute_flag_groups_in_worktrees(executor: SandboxExecutor):
+    mock_source = """
+codebase.get_file("test.py").edit("a = 2")
+"""
+    code_to_exec = create_execute_function_from_codeblock(codeblock=mock_source)
+    op = executor.codebase.op
+    branch_config = BranchConfig(custom_base_branch=op.get_active_branch_or_commit())
+
+    with patch.object(SandboxRepo, "push_branch", return_value=True) as mock_push:
+        results, branches = await executor.execute_flag_groups("commit", code_to_exec, [None, None, None], branch_config, max_parallel_groups=2)
+
+    assert len(results) == 3
+    assert all(result.is_complete and not result.error for result in results)
+    assert [call.args[0] for call in mock_push.call_args_list] == [branch.head_ref for branch in branches]
+    for branch in branches:
+        assert op.git_cli.git.show(f"{branch.head_ref}:test.py") == "a = 2"
+    # The main worktree is left untouched
+    assert executor.codebase.get_file("test.py").content == "a = 1"
+    assert op.git_cli.git.worktree("list").count("\n") == 0
@@ -0,0 +1,29 @@
+from itertools import count
+from pathlib import Path
+
+import pytest
+
+from codegen.sdk.codebase.diff_lite import ChangeType, DiffLite
+from codegen.shared.enums.programming_language import ProgrammingLanguage
+from tests.shared.benchmark.repo_generator import edit_module, module_path
+
+
+@pytest.mark.benchmark(group="codebase-apply-diffs", disable_gc=True)
+@pytest.mark.parametrize("num_edited", [1, 100])
+@pytest.mark.parametrize("programming_language", [ProgrammingLanguage.PYTHON, ProgrammingLanguage.TYPESCRIPT], ids=["python", "typescript"])
+def test_codebase_apply_diffs(programming_language: ProgrammingLanguage, num_files: int, num_edited: int, make_codebase, benchmark):
+    if num_edited > num_files:
+        pytest.skip("Repo is smaller than the edit")
+    codebase, files = make_codebase(num_files, programming_language)
+    # Spread the edits over the repo, so both core modules (many importers) and leaf modules are edited
+    paths = [module_path(i, programming_language) for i in range(0, num_files, num_files // num_edited)][:num_edited]
+    rounds = count()
+
+    def setup():
+        round = next(rounds)
+        for path in paths:
+            Path(codebase.repo_path, path).write_text(edit_module(files[path], round))
+        return ([DiffLite(ChangeType.Modified, codebase.ctx.to_absolute(path)) for path in paths],), {}
+
+    benchmark.pedantic(codebase.ctx.apply_diffs, setup=setup, rounds=5)
+    assert codebase.get_file(paths[0]).content == Path(codebase.repo_path, paths[0]).read_text()
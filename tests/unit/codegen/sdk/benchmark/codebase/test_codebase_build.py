@@ -0,0 +1,21 @@
+import pytest
+
+from codegen.git.repo_operator.repo_operator import RepoOperator
+from codegen.sdk.codebase.config import ParseTestFlags, ProjectConfig
+from codegen.sdk.core.codebase import Codebase
+from codegen.sdk.extensions.utils import uncache_all
+from codegen.shared.enums.programming_language import ProgrammingLanguage
+from tests.shared.benchmark.repo_generator import generate_repo, module_path
+
+
+@pytest.mark.benchmark(group="codebase-build", disable_gc=True)
+@pytest.mark.parametrize("programming_language", [ProgrammingLanguage.PYTHON, ProgrammingLanguage.TYPESCRIPT], ids=["python", "typescript"])
+def test_codebase_build(programming_language: ProgrammingLanguage, num_files: int, tmp_path, benchmark):
+    op = RepoOperator.create_from_files(repo_path=str(tmp_path), files=generate_repo(num_files, programming_language))
+
+    def build() -> Codebase:
+        return Codebase(projects=[ProjectConfig(repo_operator=op, programming_language=programming_language)], config=ParseTestFlags)
+
+    # Caches left behind by the previous round would make the build warm
+    codebase = benchmark.pedantic(build, setup=uncache_all, rounds=3)
+    assert codebase.get_file(module_path(num_files - 1, programming_language)).get_class(f"Class{num_files - 1}") is not None
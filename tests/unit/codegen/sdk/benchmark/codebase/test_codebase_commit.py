@@ -0,0 +1,26 @@
+import pytest
+
+from tests.shared.benchmark.repo_generator import module_path
+
+NUM_EDITED_FILES = 20
+
+
+@pytest.mark.benchmark(group="codebase-commit", disable_gc=True)
+def test_codebase_commit_transactions(num_files: int, make_codebase, benchmark):
+    codebase, _ = make_codebase(num_files)
+    files = [codebase.get_file(module_path(i, codebase.language)) for i in range(min(num_files, NUM_EDITED_FILES))]
+
+    def setup():
+        # Sync and revert the previous round, so every round edits the original files
+        codebase.commit()
+        codebase.reset()
+        for file in files:
+            for function in file.functions:
+                function.insert_before(f"# Before {function.name}")
+                function.code_block.statements[0].edit("return x")
+                function.insert_after(f"# After {function.name}")
+            for cls in file.classes:
+                cls.rename(f"{cls.name}Renamed")
+
+    benchmark.pedantic(codebase.ctx.commit_transactions, kwargs={"sync_graph": False}, setup=setup, rounds=5)
+    assert "# Before func_0_0" in files[0].path.read_text()
@@ -0,0 +1,36 @@
+import gc
+import tracemalloc
+
+import pytest
+
+from codegen.git.repo_operator.repo_operator import RepoOperator
+from codegen.sdk.codebase.config import ParseTestFlags, ProjectConfig
+from codegen.sdk.core.codebase import Codebase
+from codegen.sdk.extensions.utils import uncache_all
+from codegen.shared.enums.programming_language import ProgrammingLanguage
+from tests.shared.benchmark.repo_generator import generate_repo
+
+
+@pytest.mark.benchmark(group="codebase-memory")
+@pytest.mark.parametrize("programming_language", [ProgrammingLanguage.PYTHON, ProgrammingLanguage.TYPESCRIPT], ids=["python", "typescript"])
+def test_codebase_memory(programming_language: ProgrammingLanguage, num_files: int, tmp_path, benchmark):
+    op = RepoOperator.create_from_files(repo_path=str(tmp_path), files=generate_repo(num_files, programming_language))
+
+    def build() -> tuple[Codebase, int]:
+        uncache_all()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            codebase = Codebase(projects=[ProjectConfig(repo_operator=op, programming_language=programming_language)], config=ParseTestFlags)
+            # Populate the cached properties most analyses touch
+            for symbol in codebase.symbols:
+                symbol.usages
+            allocated, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return codebase, allocated
+
+    codebase, allocated = benchmark.pedantic(build, rounds=1)
+    benchmark.extra_info["allocated_bytes"] = allocated
+    benchmark.extra_info["bytes_per_node"] = allocated / len(codebase.ctx.nodes)
+    assert allocated > 0
@@ -0,0 +1,23 @@
+import pytest
+
+NUM_QUERIED_MODULES = 20
+
+
+@pytest.mark.benchmark(group="codebase-queries")
+def test_codebase_symbol_lookup(num_files: int, make_codebase, benchmark):
+    codebase, _ = make_codebase(num_files)
+    names = [f"func_{i}_0" for i in range(num_files)] + [f"Class{i}" for i in range(num_files)]
+
+    symbols = benchmark(lambda: [codebase.get_symbol(name) for name in names])
+    assert len(symbols) == 2 * num_files
+
+
+@pytest.mark.benchmark(group="codebase-queries")
+def test_codebase_usages(num_files: int, make_codebase, benchmark):
+    codebase, _ = make_codebase(num_files)
+    # The first modules are imported by most of the repo, so their symbols have the most usages
+    symbols = [codebase.get_symbol(f"func_{i}_{j}") for i in range(min(num_files, NUM_QUERIED_MODULES)) for j in range(3)]
+    symbols += [codebase.get_symbol(f"Class{i}") for i in range(min(num_files, NUM_QUERIED_MODULES))]
+
+    usages = benchmark(lambda: [symbol.usages for symbol in symbols])
+    assert any(usages)
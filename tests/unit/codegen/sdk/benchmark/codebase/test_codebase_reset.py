@@ -5,6 +5,7 @@ import pytest
 from codegen.sdk.codebase.factory.get_session import get_codebase_session
 from codegen.sdk.core.codebase import Codebase
 from codegen.shared.enums.programming_language import ProgrammingLanguage
+from tests.shared.benchmark.repo_generator import module_path
 
 
 def generate_files(num_files: int, extension: str = "py") -> dict[str, str]:
@@ -12,6 +13,7 @@ def generate_files(num_files: int, extension: str = "py") -> dict[str, str]:
 
 
 NUM_FILES = 1000
+NUM_EDITED_FILES = 100
 
 
 def setup_codebase(num_files: int, extension: str, tmp_path: Path):
@@ -36,6 +38,20 @@ def test_codebase_reset_stress_test(extension: str, tmp_path, benchmark):
     benchmark.pedantic(reset_codebase, setup=setup)
 
 
+@pytest.mark.benchmark(group="codebase-reset", disable_gc=True)
+def test_codebase_reset_after_sync(num_files: int, make_codebase, benchmark):
+    codebase, _ = make_codebase(num_files)
+    edited = range(min(num_files, NUM_EDITED_FILES))
+
+    def setup():
+        for i in edited:
+            codebase.get_file(module_path(i, codebase.language)).get_function(f"func_{i}_0").rename(f"renamed_{i}")
+        codebase.commit()
+
+    benchmark.pedantic(codebase.reset, setup=setup, rounds=3)
+    assert codebase.get_function("func_0_0") is not None
+
+
 @pytest.mark.skip("Skipping this test for now")
 @pytest.mark.timeout(5, func_only=True)
 @pytest.mark.skip(reason="Test is timing out and needs investigation")  # Skip this test for now
@@ -0,0 +1,36 @@
+from collections.abc import Callable
+
+import pytest
+
+from codegen.git.repo_operator.repo_operator import RepoOperator
+from codegen.sdk.codebase.config import ParseTestFlags, ProjectConfig
+from codegen.sdk.core.codebase import Codebase
+from codegen.shared.enums.programming_language import ProgrammingLanguage
+from tests.shared.benchmark.repo_generator import generate_repo
+from tests.shared.codemod.models import Size
+
+# Number of files in the generated repos benchmarked at each --size
+REPO_SIZES = {
+    Size.Small: [50, 250],
+    Size.Large: [1000, 5000],
+}
+
+
+def pytest_generate_tests(metafunc) -> None:
+    if "num_files" in metafunc.fixturenames:
+        sizes = set(map(Size, metafunc.config.getoption("--size")))
+        metafunc.parametrize("num_files", [num_files for size in Size if size in sizes for num_files in REPO_SIZES[size]])
+
+
+@pytest.fixture
+def make_codebase(tmp_path) -> Callable[..., tuple[Codebase, dict[str, str]]]:
+    """Builds a codebase from a generated repo, returning it along with the generated files"""
+
+    def make_codebase(num_files: int, programming_language: ProgrammingLanguage = ProgrammingLanguage.PYTHON) -> tuple[Codebase, dict[str, str]]:
+        files = generate_repo(num_files, programming_language)
+        op = RepoOperator.create_from_files(repo_path=str(tmp_path), files=files)
+        # ParseTestFlags skips graph verification, which would otherwise dominate the timings
+        codebase = Codebase(projects=[ProjectConfig(repo_operator=op, programming_language=programming_language)], config=ParseTestFlags)
+        return codebase, files
+
+    return make_codebase
@@ -2,9 +2,13 @@
 
 import itertools
 
+import pytest
+
+from codegen.git.repo_operator.repo_operator import RepoOperator
 from codegen.sdk.codebase.codebase_context import CodebaseContext
+from codegen.sdk.codebase.config import TestFlags
 from codegen.sdk.codebase.factory.get_session import get_codebase_session
-from codegen.sdk.enums import EdgeType
+from codegen.sdk.enums import EdgeType, NodeType
 
 
 def test_codebase_with_wrapper(tmpdir) -> None:
@@ -95,3 +99,110 @@ class MySubClass(MyClass):
         assert len(import_resolution_edges) == 4
         assert len(file_contains_node_edges) == 14
         assert len(symbol_usage_edges) == 6
+
+
+def test_codebase_parallel_parse_matches_serial(tmpdir) -> None:
+    files = {f"file{i}.py": f"from file{i - 1} import foo{i - 1}\n\n\ndef foo{i}():\n    return foo{i - 1}()\n" for i in range(1, 50)}
+    files["broken.py"] = bytes("你好", "big5hkscs")
+
+    def snapshot(codebase):
+        nodes = [(node.node_id, type(node).__name__, node.filepath, getattr(node, "name", None)) for node in codebase.ctx.nodes]
+        edges = sorted((u, v, edge.type) for u, v, edge in codebase.ctx.edges)
+        return nodes, edges
+
+    with get_codebase_session(tmpdir=tmpdir.mkdir("serial"), files=files) as codebase:
+        serial = snapshot(codebase)
+    with get_codebase_session(tmpdir=tmpdir.mkdir("parallel"), files=files, config=TestFlags.model_copy(update=dict(parse_workers=4))) as codebase:
+        parallel = snapshot(codebase)
+    assert serial == parallel
+
+
+def test_codebase_get_nodes_by_type(tmpdir) -> None:
+    def filter_nodes(ctx: CodebaseContext, node_type: NodeType) -> list:
+        return [ctx.get_node(node_id) for node_id in ctx._graph.filter_nodes(lambda node: node.node_type == node_type)]
+
+    files = {"a.py": "import os\n\ndef foo():\n    pass\n", "b.py": "from a import foo\n\nclass Bar:\n    pass\n"}
+    with get_codebase_session(tmpdir=tmpdir, files=files) as codebase:
+        ctx = codebase.ctx
+        codebase.get_file("a.py").remove()
+        codebase.create_file("c.py", "from b import Bar\n\nx = Bar()\n")
+        codebase.get_file("b.py").get_class("Bar").rename("Baz")
+        codebase.commit()
+        for node_type in NodeType:
+            assert ctx.get_nodes(node_type) == filter_nodes(ctx, node_type)
+        assert ctx.get_nodes(exclude_type=NodeType.FILE) == [node for node in ctx.nodes if node.node_type != NodeType.FILE]
+
+
+def test_codebase_build_lists_files_once(tmpdir, monkeypatch) -> None:
+    def fail(*args, **kwargs):
+        pytest.fail("File content should only be read once, when the file is parsed")
+
+    monkeypatch.setattr(RepoOperator, "get_file", fail)
+    files = {"a.py": "def foo():\n    pass\n", "dir/b.py": "from a import foo\n", "dir/README.md": "# Readme\n"}
+    with get_codebase_session(tmpdir=tmpdir, files=files) as codebase:
+        assert {file.filepath for file in codebase.files} == {"a.py", "dir/b.py"}
+        assert sorted(codebase.get_directory("dir").file_names) == ["README.md", "b.py"]
+
+
+def test_codebase_sync_uncaches_only_affected_files(tmpdir) -> None:
+    files = {"a.py": "def foo():\n    pass\n", "b.py": "from a import foo\n\nfoo()\n", "c.py": "def bar():\n    pass\n"}
+    with get_codebase_session(tmpdir=tmpdir, files=files, config=TestFlags.model_copy(update=dict(verify_cache_invalidation=True))) as codebase:
+        c_file = codebase.get_file("c.py")
+        c_names = c_file.valid_symbol_names
+        codebase.get_file("a.py").edit("def foo():\n    return 1\n\ndef qux():\n    pass\n")
+        codebase.commit()
+
+        # c.py neither changed nor imports from a.py, so its cached values survive the sync
+        assert c_file.__dict__["valid_symbol_names"] is c_names
+        b_file = codebase.get_file("b.py")
+        assert b_file.imports[0].resolved_symbol == codebase.get_file("a.py").get_function("foo")
+        assert "foo" in b_file.valid_symbol_names
+
+
+def test_codebase_lazy_graph_parses_on_demand(tmpdir) -> None:
+    files = {
+        "a.py": "def foo():\n    pass\n",
+        "b.py": "from a import foo\n\ndef bar():\n    return foo()\n",
+        "c.py": "from b import bar\n\nbar()\n",
+        "d.py": "def unrelated():\n    pass\n",
+    }
+    with get_codebase_session(tmpdir=tmpdir, files=files, config=TestFlags.model_copy(update=dict(exp_lazy_graph=True))) as codebase:
+        ctx = codebase.ctx
+        assert set(ctx.lazy_files) == {"a.py", "b.py", "c.py", "d.py"}
+
+        # Parsing b.py also parses the files it imports from, but not the files importing it
+        b_file = codebase.get_file("b.py")
+        assert set(ctx.lazy_files) == {"c.py", "d.py"}
+        assert b_file.imports[0].resolved_symbol == codebase.get_file("a.py").get_function("foo")
+
+        # Usages only parse the files mentioning the symbol
+        assert {usage.usage_symbol.file.filepath for usage in b_file.get_function("bar").usages} == {"c.py"}
+        assert set(ctx.lazy_files) == {"d.py"}
+
+        # Queries over the whole graph parse everything
+        assert {file.filepath for file in codebase.files} == set(files)
+        assert not ctx.lazy_files
+
+
+def test_codebase_max_resident_files_evicts_cold_files(tmpdir) -> None:
+    files = {
+        "a.py": "def foo():\n    pass\n",
+        "b.py": "from a import foo\n\ndef bar():\n    return foo()\n",
+        "c.py": "from b import bar\n\nbar()\n",
+    }
+    with get_codebase_session(tmpdir=tmpdir, files=files, config=TestFlags.model_copy(update=dict(max_resident_files=1))) as codebase:
+        residency = codebase.ctx.residency
+        a_file = codebase.get_file("a.py")
+        foo = a_file.get_function("foo")
+        codebase.get_file("b.py")
+        codebase.get_file("c.py")
+        assert len(residency) == 1
+        assert a_file.node_id not in residency
+        assert residency.stats.evictions >= 2
+
+        # Evicted files keep their nodes and edges, and recompute their caches on the next use
+        assert codebase.get_file("a.py") is a_file
+        assert a_file.node_id in residency
+        assert residency.stats.reloads >= 1
+        assert a_file.get_function("foo") == foo
+        assert {usage.usage_symbol.name for usage in foo.usages} == {"bar"}
@@ -0,0 +1,43 @@
+from codegen.sdk.codebase.config import ProjectConfig, TestFlags
+from codegen.sdk.codebase.factory.get_session import get_codebase_session
+from codegen.sdk.core.codebase import Codebase
+from codegen.shared.enums.programming_language import ProgrammingLanguage
+
+FILES = {
+    "a.py": "from b import foo\nimport numpy as np\n\n\ndef bar():\n    return foo() + np.sum([])\n",
+    "b.py": "def foo():\n    return 1\n",
+}
+
+
+def _snapshot(codebase: Codebase):
+    nodes = sorted((type(node).__name__, node.filepath, node.start_byte, node.end_byte) for node in codebase.ctx.nodes)
+    edges = sorted((repr(codebase.ctx.get_node(u)), repr(codebase.ctx.get_node(v)), edge.type, edge.usage.match.source if edge.usage else None) for u, v, edge in codebase.ctx.edges)
+    return nodes, edges
+
+
+def _reopen(codebase: Codebase, config) -> Codebase:
+    projects = [ProjectConfig(repo_operator=codebase.ctx.projects[0].repo_operator, programming_language=ProgrammingLanguage.PYTHON)]
+    return Codebase(projects=projects, config=config)
+
+
+def test_graph_snapshot_restore(tmpdir) -> None:
+    config = TestFlags.model_copy(update=dict(graph_snapshot_dir=str(tmpdir.mkdir("snapshots"))))
+    with get_codebase_session(tmpdir=tmpdir.mkdir("repo"), files=FILES, config=config) as codebase:
+        expected = _snapshot(codebase)
+        expected_usages = [usage.match.source for usage in codebase.get_function("foo").usages]
+    assert len(tmpdir.join("snapshots").listdir()) == 1
+
+    restored = _reopen(codebase, config)
+    assert _snapshot(restored) == expected
+    assert [usage.match.source for usage in restored.get_function("foo").usages] == expected_usages
+
+
+def test_graph_snapshot_applies_changes_since_snapshot(tmpdir) -> None:
+    config = TestFlags.model_copy(update=dict(graph_snapshot_dir=str(tmpdir.mkdir("snapshots"))))
+    with get_codebase_session(tmpdir=tmpdir.mkdir("repo"), files=FILES, config=config) as codebase:
+        pass
+    tmpdir.join("repo", "b.py").write("def foo():\n    return 1\n\n\ndef baz():\n    return foo()\n")
+
+    restored = _reopen(codebase, config)
+    assert restored.get_function("baz") is not None
+    assert [dep.name for dep in restored.get_function("baz").dependencies] == ["foo"]
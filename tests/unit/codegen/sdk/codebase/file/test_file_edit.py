@@ -2,6 +2,7 @@ import pytest
 
 from codegen.sdk.codebase.factory.get_session import get_codebase_session
 from codegen.sdk.core.file import SourceFile
+from codegen.sdk.tree_sitter_parser import parse_tree
 
 
 def test_codebase_edit_mdx(tmpdir) -> None:
@@ -117,3 +118,17 @@ def test_transaction_ordering_non_source_files(tmpdir) -> None:
 
         # Verify final content
         assert file.content == "# New Header\nNew Content\nNew Footer"
+
+
+def test_incremental_reparse_after_transactions(tmpdir) -> None:
+    content = "def foo():\n    return 1\n\n\ndef bar():\n    return foo()\n"
+    with get_codebase_session(tmpdir=tmpdir, files={"test.py": content}) as codebase:
+        file = codebase.get_file("test.py")
+        file.get_function("foo").rename("baz")
+        file.get_function("bar").insert_before("x = 1\n", newline=False)
+        codebase.commit()
+        file = codebase.get_file("test.py")
+        assert "x = 1" in file.content
+        assert "return baz()" in file.content
+        assert str(file.ts_node) == str(parse_tree("test.py", file.content).root_node)
+        assert file.get_function("bar").dependencies == [file.get_function("baz")]
@@ -0,0 +1,50 @@
+import time
+from pathlib import Path
+
+from watchfiles import Change
+
+from codegen.sdk.codebase.factory.get_session import get_codebase_session
+
+
+def test_file_watcher_applies_batched_changes(tmpdir) -> None:
+    # language=python
+    content = """
+def foo():
+    pass
+"""
+    with get_codebase_session(tmpdir=tmpdir, files={"a.py": content, "b.py": "x = 1"}) as codebase:
+        watcher = codebase.ctx.start_file_watcher()
+        watcher.stop()
+        a_path = str(Path(tmpdir) / "a.py")
+        b_path = str(Path(tmpdir) / "b.py")
+        c_path = str(Path(tmpdir) / "c.py")
+
+        Path(a_path).write_text("def bar():\n    pass\n")
+        Path(b_path).unlink()
+        Path(c_path).write_text("def baz():\n    pass\n")
+        # An editor that deletes and re-creates a file on save reports both events for it
+        watcher.add_changes({(Change.deleted, a_path), (Change.added, a_path), (Change.deleted, b_path), (Change.added, c_path)})
+        watcher.flush()
+
+        assert codebase.get_function("foo", optional=True) is None
+        assert codebase.get_function("bar", optional=True) is not None
+        assert codebase.get_function("baz", optional=True) is not None
+        assert codebase.get_file("b.py", optional=True) is None
+        codebase.ctx.stop_file_watcher()
+
+
+def test_file_watcher_syncs_in_background(tmpdir) -> None:
+    with get_codebase_session(tmpdir=tmpdir, files={"a.py": "x = 1"}) as codebase:
+        watcher = codebase.ctx.start_file_watcher(debounce_ms=50)
+        try:
+            Path(tmpdir, "b.py").write_text("def baz():\n    pass\n")
+            deadline = time.monotonic() + 10
+            while time.monotonic() < deadline:
+                with watcher.lock:
+                    if codebase.get_function("baz", optional=True) is not None:
+                        break
+                time.sleep(0.05)
+            with watcher.lock:
+                assert codebase.get_function("baz", optional=True) is not None
+        finally:
+            codebase.ctx.stop_file_watcher()
@@ -0,0 +1,66 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from codegen.sdk.codebase.config import TestFlags
+from codegen.sdk.codebase.factory.get_session import get_codebase_session
+from codegen.sdk.codebase.metrics import MetricsCollector
+
+
+def test_metrics_collector_records_nested_phases() -> None:
+    size = [0, 0]
+    metrics = MetricsCollector(graph_size=lambda: tuple(size))
+    with metrics.phase("sync"):
+        with metrics.phase("parse"):
+            size[0] = 3
+        with pytest.raises(ValueError):
+            with metrics.phase("parse"):
+                size[1] = 2
+                raise ValueError
+
+    assert [record.name for record in metrics.records] == ["parse", "parse", "sync"]
+    assert [record.parent for record in metrics.get("parse")] == ["sync", "sync"]
+    assert metrics.last("parse").edges_delta == 2
+    assert metrics.last("sync").nodes_delta == 3
+    summary = metrics.summary()
+    assert summary["parse"].count == 2
+    assert summary["parse"].nodes == 3
+    assert summary["sync"].wall_seconds >= summary["parse"].wall_seconds
+
+
+def test_metrics_collector_output(tmpdir) -> None:
+    metrics = MetricsCollector(graph_size=lambda: (1, 2))
+    with metrics.phase("parse"):
+        pass
+
+    json_path = Path(tmpdir) / "metrics.json"
+    metrics.write(json_path)
+    data = json.loads(json_path.read_text())
+    assert data["summary"][0]["name"] == "parse"
+    assert data["records"][0]["nodes"] == 1
+
+    prom_path = Path(tmpdir) / "metrics.prom"
+    metrics.write(prom_path)
+    text = prom_path.read_text()
+    assert 'codegen_codebase_phase_runs_total{phase="parse"} 1' in text
+    assert 'codegen_codebase_phase_graph_edges{phase="parse"} 2' in text
+    assert text.endswith("# EOF\n")
+
+
+def test_codebase_metrics_cover_build_sync_and_commit(tmpdir) -> None:
+    files = {"a.py": "def foo():\n    pass\n", "b.py": "from a import foo\n\nfoo()\n"}
+    metrics_path = Path(tmpdir) / "metrics" / "codebase.json"
+    with get_codebase_session(tmpdir=tmpdir, files=files, config=TestFlags.model_copy(update=dict(metrics_path=str(metrics_path)))) as codebase:
+        metrics = codebase.ctx.metrics
+        build = metrics.last("build_graph")
+        assert build is not None
+        assert build.nodes == len(codebase.ctx.nodes)
+        for phase in ("parse", "directory_tree", "config_parse", "import_resolution", "compute_dependencies"):
+            assert metrics.get(phase, parent="build_graph")
+
+        codebase.get_file("a.py").edit("def foo():\n    return 1\n")
+        codebase.commit()
+        assert metrics.last("commit") is not None
+        assert metrics.get("parse", parent="apply_diffs")
+        assert json.loads(metrics_path.read_text())["summary"]
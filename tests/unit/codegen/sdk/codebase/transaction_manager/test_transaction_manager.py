@@ -534,6 +534,29 @@ def test_remove_multi_conflict(tmpdir) -> None:
     assert len(transaction_manager.queued_transactions[FILENAME]) == 2
     assert transaction_manager.queued_transactions[FILENAME][0] is t7
     assert transaction_manager.queued_transactions[FILENAME][1] is t6
+    assert transaction_manager.get_num_transactions() == 2
+
+
+def test_num_transactions(tmpdir) -> None:
+    FILENAME = Path("filename")
+    OTHER_FILENAME = Path("other_filename")
+
+    # Create TransactionManager
+    transaction_manager = TransactionManager()
+
+    # Add many non-overlapping transactions, plus one duplicate that gets deduped
+    for i in range(0, 100, 4):
+        transaction_manager.add_transaction(EditTransaction(start_byte=i, end_byte=i + 2, file=MockFile(FILENAME), new_content="a"))
+    transaction_manager.add_transaction(EditTransaction(start_byte=0, end_byte=2, file=MockFile(FILENAME), new_content="a"))
+    transaction_manager.add_transaction(InsertTransaction(insert_byte=0, file=MockFile(OTHER_FILENAME), new_content="b"))
+    assert transaction_manager.get_num_transactions() == 26
+
+    # A remove covering half the file replaces every transaction it overlaps with
+    transaction_manager.add_transaction(RemoveTransaction(start_byte=0, end_byte=50, file=MockFile(FILENAME)))
+    assert transaction_manager.get_num_transactions() == len(transaction_manager.queued_transactions[FILENAME]) + 1 == 14
+
+    transaction_manager.clear_transactions()
+    assert transaction_manager.get_num_transactions() == 0
 
 
 def test_priority(tmpdir) -> None:
@@ -665,3 +688,30 @@ def content():
         assert queue[2].new_content == "Ok"
         assert isinstance(queue[3], RemoveTransaction)
         assert isinstance(queue[4], InsertTransaction)
+
+
+def test_commit_writes_file_once(tmpdir) -> None:
+    FILENAME = "test.py"
+    # language=python
+    CONTENT = """
+a = 1
+b = 2
+c = 3
+"""
+    with get_codebase_session(tmpdir=tmpdir, files={FILENAME: CONTENT}) as codebase:
+        file = codebase.get_file("test.py")
+        writes = []
+        write = file.write
+        file.write = lambda content, to_disk=False: writes.append(content) or write(content, to_disk=to_disk)
+        file.get_global_var("a").set_value("10")
+        file.get_global_var("b").remove()
+        file.get_global_var("c").insert_after("d = 4", fix_indentation=True)
+        file.insert_before("import os", fix_indentation=True)
+        diffs = file.transaction_manager.commit({tmpdir / FILENAME})
+        assert len(writes) == 1
+        assert len(diffs) == 1
+        assert diffs[0].old_content == CONTENT.encode("utf-8")
+        assert "import os" in file.content
+        assert "a = 10" in file.content
+        assert "b = 2" not in file.content
+        assert "d = 4" in file.content
@@ -2,6 +2,7 @@ import pytest
 
 from codegen.sdk.codebase.config import SessionOptions
 from codegen.sdk.codebase.factory.get_session import get_codebase_session
+from codegen.sdk.core.autocommit.constants import IllegalWriteError
 from codegen.shared.enums.programming_language import ProgrammingLanguage
 from codegen.shared.exceptions.control_flow import MaxPreviewTimeExceeded, MaxTransactionsExceeded
 
@@ -60,3 +61,25 @@ def test_check_max_transactions_exceeded_set_session_options(tmpdir):
 
     assert str(exc_info.value) == "Max transactions reached: 0"
     assert exc_info.value.threshold == 0
+
+
+def test_read_only_rejects_changes(tmpdir):
+    with get_codebase_session(tmpdir=tmpdir, files={"file_a.py": "def foo():\n    pass\n"}, programming_language=ProgrammingLanguage.PYTHON) as codebase:
+        file = codebase.get_file("file_a.py")
+        foo = file.get_function("foo")
+        with codebase.read_only():
+            assert codebase.ctx.read_only
+            assert file.content == "def foo():\n    pass\n"
+            with pytest.raises(IllegalWriteError):
+                foo.rename("bar")
+            with pytest.raises(IllegalWriteError):
+                codebase.create_file("file_b.py")
+            with pytest.raises(IllegalWriteError):
+                file.write("")
+        assert not codebase.ctx.read_only
+        assert not codebase.ctx.read_only_contents
+        assert not codebase.ctx.transaction_manager.queued_transactions
+
+        foo.rename("bar")
+        codebase.commit()
+        assert file.get_function("bar") is not None
@@ -167,3 +167,46 @@ def use_both():
         assert len(deps_with_types) == 2
         assert a_class in deps_with_types
         assert b_class in deps_with_types
+
+
+def test_dependency_and_usage_closure(tmpdir) -> None:
+    """Test the memoized transitive closures, and that they are recomputed after the graph changes."""
+    # language=python
+    content = """
+class A:
+    def method_a(self):
+        pass
+
+class B(A):
+    def method_b(self):
+        self.method_a()
+
+class C(B):
+    def method_c(self):
+        self.method_b()
+
+def use_c():
+    c = C()
+    c.method_c()
+"""
+    with get_codebase_session(tmpdir=tmpdir, files={"test.py": content}) as codebase:
+        file = codebase.get_file("test.py")
+        use_c = file.get_function("use_c")
+        a_class = file.get_class("A")
+        b_class = file.get_class("B")
+        c_class = file.get_class("C")
+
+        assert use_c.dependency_closure() == [(c_class, 1), (b_class, 2), (a_class, 3)]
+        assert use_c.dependency_closure(max_depth=2) == [(c_class, 1), (b_class, 2)]
+        assert {symbol.name: depth for symbol, depth in a_class.usage_closure()} == {"B": 1, "C": 2, "use_c": 3}
+        assert a_class.usage_closure(max_depth=1) == [(b_class, 1)]
+        # Deeper queries agree with dependencies()
+        assert use_c.dependencies(max_depth=3) == sorted([a_class, b_class, c_class], key=lambda symbol: symbol.ts_node.start_byte)
+
+        use_c.edit("def use_c():\n    return B()")
+        codebase.commit()
+        use_c = file.get_function("use_c")
+        b_class = file.get_class("B")
+        a_class = file.get_class("A")
+        assert use_c.dependency_closure() == [(b_class, 1), (a_class, 2)]
+        assert {symbol.name: depth for symbol, depth in a_class.usage_closure()} == {"B": 1, "C": 2, "use_c": 2}
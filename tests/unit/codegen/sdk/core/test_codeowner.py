@@ -88,3 +88,19 @@ def test_from_parser_method(fake_files):
     assert "alice" in owner_values
     assert "devs" in owner_values
     assert "bob@example.com" in owner_values
+
+
+def test_files_generator_with_index(fake_files):
+    def file_source(*args, **kwargs):
+        return fake_files
+
+    index = MagicMock()
+    index.files_of.return_value = {"file1.py"}
+    index.has_path = lambda filepath: filepath != "file3.py"
+    for idx, file in enumerate(fake_files, start=1):
+        file.file_path = f"file{idx}.py"
+
+    codeowner = CodeOwner(file_source, "USERNAME", "alice", index=index)
+    # file1 is owned according to the index, file3 is not tracked by it and falls back to its owners
+    assert list(codeowner.files_generator()) == [fake_files[0], fake_files[2]]
+    index.files_of.assert_called_once_with("alice")
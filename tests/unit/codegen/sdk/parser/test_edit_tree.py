@@ -0,0 +1,29 @@
+from codegen.sdk.tree_sitter_parser import edit_tree, parse_tree
+
+CONTENT = b"def foo():\n    return 1\n\n\ndef bar():\n    return foo()\n"
+
+
+def _to_tuple(node):
+    return node.type, node.start_byte, node.end_byte, node.start_point, node.end_point, tuple(_to_tuple(child) for child in node.children)
+
+
+def test_edit_tree_matches_full_parse() -> None:
+    # Edits are applied back to front, like the transaction manager does
+    edits = [(48, 51, b"renamed"), (26, 26, b"x = 2\n"), (4, 7, b"renamed")]
+    new_content = CONTENT
+    for start, end, new_bytes in edits:
+        new_content = new_content[:start] + new_bytes + new_content[end:]
+
+    old_tree = edit_tree(parse_tree("test.py", CONTENT), CONTENT, new_content, edits)
+    assert old_tree is not None
+    assert _to_tuple(parse_tree("test.py", new_content, old_tree=old_tree).root_node) == _to_tuple(parse_tree("test.py", new_content).root_node)
+
+
+def test_edit_tree_rejects_untracked_changes() -> None:
+    tree = parse_tree("test.py", CONTENT)
+    assert edit_tree(tree, CONTENT, CONTENT + b"x = 1\n", [(0, 0, b"# comment\n")]) is None
+
+
+def test_edit_tree_rejects_out_of_order_edits() -> None:
+    tree = parse_tree("test.py", CONTENT)
+    assert edit_tree(tree, CONTENT, b"dxf" + CONTENT[3:], [(0, 1, b"d"), (2, 3, b"f")]) is None
@@ -16,3 +16,27 @@ class MyClass1:
         assert [f.name for f in codebase.functions] == ["top_level_func"]
         assert len(list(codebase.symbols)) == 2
         assert set([s.name for s in codebase.symbols]) == {"top_level_func", "MyClass1"}
+
+
+def test_codebase_symbol_lookup_after_changes(tmpdir) -> None:
+    # language=python
+    content = """
+def foo():
+    return 1
+
+class Bar:
+    def foo(self):
+        pass
+"""
+    with get_codebase_session(tmpdir=tmpdir, files={"file1.py": content, "file2.py": "foo = 2\n"}) as codebase:
+        assert codebase.get_function("foo").file.filepath == "file1.py"
+        assert codebase.get_class("Bar").name == "Bar"
+        assert len(codebase.get_symbols("foo")) == 2
+        assert codebase.get_class("foo", optional=True) is None
+
+        codebase.get_function("foo").rename("baz")
+        codebase.get_file("file2.py").remove()
+        codebase.commit()
+        assert not codebase.has_symbol("foo")
+        assert codebase.get_symbol("baz") == codebase.get_function("baz")
+        assert codebase.get_symbols("baz") == [s for s in codebase.symbols if s.name == "baz"]
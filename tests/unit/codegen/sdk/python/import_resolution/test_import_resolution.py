@@ -297,6 +297,35 @@ def func():
         assert src_import_resolution.imports_file is True
 
 
+def test_import_resolution_file_syspath_absolute(tmpdir: str, monkeypatch) -> None:
+    """Tests resolving imports through absolute sys.path entries inside and outside the repo"""
+    # language=python
+    with get_codebase_session(
+        tmpdir,
+        files={
+            "a/b/c/src.py": """
+def update():
+    pass
+""",
+            "consumer.py": """
+from b.c import src as operations
+""",
+        },
+    ) as codebase:
+        src_file: SourceFile = codebase.get_file("a/b/c/src.py")
+        src_import: Import = codebase.get_file("consumer.py").imports[0]
+        codebase.ctx.config.py_resolve_syspath = True
+
+        monkeypatch.syspath_prepend(str(tmpdir / "x"))
+        assert src_import.resolve_import() is None
+
+        monkeypatch.syspath_prepend(str(tmpdir / "a"))
+        src_import_resolution = src_import.resolve_import()
+        assert src_import_resolution
+        assert src_import_resolution.from_file is src_file
+        assert src_import_resolution.imports_file is True
+
+
 def test_import_resolution_file_custom_resolve_path(tmpdir: str) -> None:
     """Tests function.usages returns usages from file imports"""
     # language=python
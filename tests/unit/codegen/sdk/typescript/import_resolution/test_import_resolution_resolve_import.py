@@ -863,3 +863,30 @@ export namespace CONSTS {
 
         assert file.imports[0].resolved_symbol == consts
         assert file.get_symbol("use_a").resolved_value == consts.get_symbol("a").resolved_value
+
+
+def test_resolve_import_module_resolution_cache(tmpdir) -> None:
+    files = {
+        "a/file.ts": "import { util } from './util';",
+        "a/util.ts": "export const util = 1;",
+        "b/file.ts": "import { util } from './util';\nimport { helper } from '../lib';",
+        "b/util.ts": "export const util = 2;",
+        "lib/index.ts": "export const helper = 3;",
+        "d/file.ts": "import { later } from './later';",
+    }
+    with get_codebase_session(tmpdir=tmpdir, files=files, programming_language=ProgrammingLanguage.TYPESCRIPT) as codebase:
+        # Same specifier from different directories resolves to different files
+        assert codebase.get_file("a/file.ts").imports[0].resolved_symbol == codebase.get_file("a/util.ts").get_global_var("util")
+        assert codebase.get_file("b/file.ts").imports[0].resolved_symbol == codebase.get_file("b/util.ts").get_global_var("util")
+        # Directory imports resolve to the index file
+        assert codebase.get_file("b/file.ts").imports[1].resolved_symbol == codebase.get_file("lib/index.ts").get_global_var("helper")
+        assert codebase.ctx.module_resolution_cache
+
+        assert codebase.get_file("d/file.ts").imports[0].resolved_symbol is None
+        assert None in codebase.ctx.module_resolution_cache.values()
+
+        # Adding a file invalidates cached misses
+        codebase.create_file("d/later.ts", "export const later = 4;")
+        codebase.commit()
+        assert codebase.ctx.has_filepath("d/later.ts")
+        assert codebase.get_file("d/file.ts").imports[0].resolve_import().from_file == codebase.get_file("d/later.ts")